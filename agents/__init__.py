@@ -1,12 +1,29 @@
 from .base_agent import BaseAgent
-from .debate_agents import ProgressiveAgent, ConservativeAgent
-from .moderator_agent import ModeratorAgent
-from .summary_agent import SummaryAgent
+from .llm_backend import ModelRouter, ModelProfile
+
+# 토론 에이전트들은 sklearn 등 무거운 의존성을 끌어오므로 처음 접근할 때 불러옴
+# (agents.llm_backend, agents.autotune만 쓰는 tune 명령은 가볍게 시작)
+_LAZY_AGENTS = {
+    'ProgressiveAgent': '.debate_agents',
+    'ConservativeAgent': '.debate_agents',
+    'ModeratorAgent': '.moderator_agent',
+    'SummaryAgent': '.summary_agent',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_AGENTS:
+        from importlib import import_module
+        return getattr(import_module(_LAZY_AGENTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'BaseAgent',
+    'ModelRouter',
+    'ModelProfile',
     'ProgressiveAgent', 
     'ConservativeAgent',
     'ModeratorAgent',
     'SummaryAgent'
-] 
\ No newline at end of file
+] 
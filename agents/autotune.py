@@ -0,0 +1,176 @@
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import glob
+import json
+import os
+import statistics
+
+from .llm_backend import LlamaCliBackend, ModelProfile
+from .hardware_profile import HardwareProfile, host_signature
+from utils.results_store import DebateResultsStore, DEFAULT_RESULTS_DB, extract_statements
+
+# 과거 토론 결과가 없을 때 쓰는 대표 발언 (토론자 프롬프트의 상대 발언 자리)
+_SAMPLE_STATEMENT = (
+    "정부가 재정을 확대해 소비쿠폰을 지급하면 단기적으로 내수가 살아나는 것처럼 보일 수 있습니다. "
+    "그러나 국가채무비율이 이미 50%를 넘어선 상황에서 빚으로 만든 소비는 결국 미래 세대의 부담으로 돌아옵니다. "
+    "지난 재난지원금의 소비 진작 효과가 지급액의 30% 수준에 그쳤다는 연구 결과도 있습니다. "
+    "지금 필요한 것은 일회성 현금 지원이 아니라 규제 완화와 투자 환경 개선을 통한 일자리 창출입니다. "
+)
+
+
+def _recent_statements(results_db: Optional[str], results_dir: str, limit: int = 5) -> List[str]:
+    """최근 토론 발언을 결과 저장소에서 먼저 찾고, 없으면 debate_results/*.json 파일에서 찾습니다."""
+    if results_db and os.path.exists(results_db):
+        store = DebateResultsStore(results_db)
+        try:
+            for debate in store.list_debates(limit=limit):
+                saved = store.get_results(debate['id'])
+                statements = [s.get('statement', '') for s in extract_statements(saved['results'])] if saved else []
+                statements = [s for s in statements if s]
+                if statements:
+                    return statements
+        except Exception as e:
+            print(f"⚠️ 결과 저장소에서 발언을 읽지 못했습니다: {e}")
+        finally:
+            store.close()
+
+    files = sorted(glob.glob(os.path.join(results_dir, "*.json")), key=os.path.getmtime, reverse=True)
+    for path in files[:limit]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                results = json.load(f)
+        except Exception:
+            continue
+        if not isinstance(results, dict):
+            continue
+        statements = [s.get('statement', '') for s in extract_statements(results)]
+        statements = [s for s in statements if s]
+        if statements:
+            return statements
+    return []
+
+
+def build_tuning_prompt(results_dir: str = "debate_results", max_chars: int = 2000,
+                        results_db: Optional[str] = DEFAULT_RESULTS_DB) -> str:
+    """가장 최근 토론 결과의 실제 발언으로 토론자 프롬프트와 비슷한 크기의 입력을 만듭니다.
+
+    결과 저장소 → debate_results/*.json → 대표 발언 순으로 발언을 찾습니다.
+    """
+    statements = _recent_statements(results_db, results_dir)
+    body = " ".join(statements) if statements else _SAMPLE_STATEMENT * 4
+    body = body[:max_chars - 400]
+    return f"""User: 너는 더불어민주당 소속 진보 정치인이다.
+
+토론 주제: 민생경제 회복을 위한 정부 역할과 정책 방향
+
+상대(보수)의 최근 주장: "{body}"
+
+상대의 최근 주장을 정확히 요지 파악한 뒤, 존댓말로 구체적 데이터와 사례로 반증하고, 서민·중산층 관점에서 일관된 대안을 제시하며 공격적으로 마무리하라.
+Assistant:"""
+
+
+def default_thread_candidates(cpu_count: Optional[int] = None) -> List[int]:
+    """코어 수의 1/4, 1/2, 3/4, 전체와 기존 기본값 4"""
+    n = cpu_count or os.cpu_count() or 4
+    return sorted({c for c in (4, n // 4, n // 2, (n * 3) // 4, n) if 1 <= c <= n})
+
+
+class BackendTuner:
+    """스레드·배치·메모리 설정을 바꿔 가며 prefill/decode 처리량을 측정하는 튜너
+
+    전체 조합 대신 단계별로 최적값을 고정해 나간다:
+    decode 스레드(-t) → prefill 스레드(-tb) → 배치/마이크로배치(-b/-ub) → mmap/mlock
+    """
+
+    BATCH_CANDIDATES = [(512, 128), (512, 256), (512, 512), (1024, 512), (2048, 512), (2048, 1024)]
+    MEMORY_MODES = [
+        {"mmap": True, "mlock": False},
+        {"mmap": True, "mlock": True},
+        {"mmap": False, "mlock": False},
+    ]
+
+    def __init__(self, base_profile: ModelProfile, backend: Optional[LlamaCliBackend] = None,
+                 prompt: Optional[str] = None, max_tokens: int = 64, repeats: int = 1,
+                 thread_candidates: Optional[List[int]] = None, results_db: Optional[str] = DEFAULT_RESULTS_DB):
+        self.base_profile = base_profile
+        self.backend = backend or LlamaCliBackend()
+        self.prompt = prompt or build_tuning_prompt(results_db=results_db)
+        self.max_tokens = max_tokens
+        self.repeats = max(1, repeats)
+        self.thread_candidates = thread_candidates or default_thread_candidates()
+        self.trials: List[Dict] = []
+
+    def measure(self, **settings) -> Optional[Dict]:
+        """설정 하나로 repeats번 생성해 중앙값 처리량을 반환합니다 (실패 시 None)."""
+        profile = replace(self.base_profile, **settings)
+        runs = []
+        for _ in range(self.repeats):
+            result = self.backend.generate(profile, self.prompt, self.max_tokens)
+            if not result.ok or "tokens_per_second" not in result.timings:
+                print(f"⚠️ 측정 실패: {settings} ({result.error or '성능 통계 없음'})")
+                return None
+            runs.append((result.timings, result.elapsed))
+
+        trial = {
+            "settings": settings,
+            "prefill_tps": statistics.median(t.get("prompt_tokens_per_second", 0.0) for t, _ in runs),
+            "decode_tps": statistics.median(t["tokens_per_second"] for t, _ in runs),
+            "elapsed": statistics.median(e for _, e in runs),
+        }
+        self.trials.append(trial)
+        print(f"  📈 {settings}: prefill {trial['prefill_tps']:.1f} t/s, "
+              f"decode {trial['decode_tps']:.2f} t/s, {trial['elapsed']:.1f}초")
+        return trial
+
+    def _best(self, label: str, candidates: List[Dict], current: Dict, metric: str,
+              maximize: bool = True) -> Tuple[Dict, Optional[Dict]]:
+        """후보 설정들을 current 위에 덮어 측정하고 metric이 가장 좋은 설정을 반환합니다."""
+        print(f"\n🔬 {label}")
+        best_settings, best_trial = current, None
+        for candidate in candidates:
+            trial = self.measure(**{**current, **candidate})
+            if trial is None:
+                continue
+            if best_trial is None:
+                better = True
+            elif maximize:
+                better = trial[metric] > best_trial[metric]
+            else:
+                better = trial[metric] < best_trial[metric]
+            if better:
+                best_settings, best_trial = {**current, **candidate}, trial
+        return best_settings, best_trial
+
+    def tune(self) -> HardwareProfile:
+        settings: Dict = {"threads": self.base_profile.threads}
+
+        settings, _ = self._best("decode 스레드 수 (-t)",
+                                 [{"threads": t} for t in self.thread_candidates],
+                                 settings, "decode_tps")
+        settings, _ = self._best("prefill 스레드 수 (-tb)",
+                                 [{"threads_batch": t} for t in self.thread_candidates if t >= settings["threads"]],
+                                 settings, "prefill_tps")
+        settings, _ = self._best("배치 / 마이크로배치 (-b / -ub)",
+                                 [{"batch_size": b, "ubatch_size": ub} for b, ub in self.BATCH_CANDIDATES],
+                                 settings, "prefill_tps")
+        settings, final = self._best("메모리 매핑 (mmap / mlock)", self.MEMORY_MODES,
+                                     settings, "elapsed", maximize=False)
+
+        measurements = {
+            "prompt_chars": len(self.prompt),
+            "max_tokens": self.max_tokens,
+            "repeats": self.repeats,
+            "trials": self.trials,
+        }
+        if final:
+            measurements.update(prefill_tps=final["prefill_tps"], decode_tps=final["decode_tps"])
+            print(f"\n✅ 튜닝 완료: {settings} (decode {final['decode_tps']:.2f} t/s)")
+
+        return HardwareProfile(
+            settings=settings,
+            host=host_signature(),
+            model=os.path.basename(self.base_profile.model_path),
+            measurements=measurements,
+            created_at=datetime.now().isoformat(),
+        )
@@ -1,22 +1,39 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional
 import os
-import subprocess
-import tempfile
+from .llm_backend import ModelRouter, DEFAULT_MODEL_PATH, TIER_MAIN
+from .grammars import OutputConstraint
+from .degeneration import DegenerationMonitor
+from .prompt_budget import PromptBudget, PromptBudgetBuilder, PromptSection
+from utils.tracing import tracer
 
-# transformers는 선택적으로 사용
-try:
-    from transformers import AutoTokenizer
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
-    print("⚠️ transformers 없음 - 기본 템플릿 사용")
+# transformers는 선택적으로 사용 - import에 수 초가 걸려 첫 에이전트가 토크나이저를 만들 때 불러옴
+_auto_tokenizer = None
+TRANSFORMERS_AVAILABLE: Optional[bool] = None  # None: 아직 확인 전
+
+
+def _load_auto_tokenizer():
+    """transformers.AutoTokenizer를 처음 필요할 때 한 번만 import합니다 (없으면 None)."""
+    global _auto_tokenizer, TRANSFORMERS_AVAILABLE
+    if TRANSFORMERS_AVAILABLE is None:
+        try:
+            from transformers import AutoTokenizer
+            _auto_tokenizer = AutoTokenizer
+            TRANSFORMERS_AVAILABLE = True
+        except ImportError:
+            TRANSFORMERS_AVAILABLE = False
+            print("⚠️ transformers 없음 - 기본 템플릿 사용")
+    return _auto_tokenizer
 
 class BaseAgent(ABC):
-    def __init__(self, model_path: str = 'C:/Users/User/Documents/EXAONE-4.0-32B-Q4_K_M.gguf'):
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, router: Optional[ModelRouter] = None):
         self.model_path = model_path
         self.tokenizer = None
-        self.llama_cli_path = "C:/Users/User/LLM-Debate/llama.cpp/build/bin/Release/llama-cli.exe"
+        # 작업 유형별 모델 라우터 (여러 에이전트가 공유하면 티어별 통계가 합산됨)
+        self.router = router or ModelRouter.from_paths(model_path)
+        self.llama_cli_path = self.router.profiles[TIER_MAIN].llama_cli_path
+        # 마지막 generate_response()가 모델 응답을 받았는지 (실패 시 반환값은 오류 문구)
+        self.last_generation_ok = False
         print(f"🔧 BaseAgent 초기화 - 32B 모델 최적화 버전")
         print(f"⏰ 응답 생성 시간: 무제한 (완료될 때까지 대기)")
         self._load_model()
@@ -25,11 +42,14 @@ class BaseAgent(ABC):
         """토크나이저를 로드하고 모델 경로를 확인합니다."""
         print(f"EXAONE 모델 설정 중: {self.model_path}")
         
-        if not os.path.exists(self.model_path):
+        # 녹화 재생 백엔드처럼 모델 파일 없이 동작하는 백엔드는 경로 확인을 생략
+        requires_model = getattr(self.router.backend, "requires_model_files", True)
+        if requires_model and not os.path.exists(self.model_path):
             raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {self.model_path}")
         
         # 토크나이저 로드 (선택적)
-        if TRANSFORMERS_AVAILABLE:
+        AutoTokenizer = _load_auto_tokenizer()
+        if AutoTokenizer is not None:
             try:
                 self.tokenizer = AutoTokenizer.from_pretrained("LGAI-EXAONE/EXAONE-4.0-32B")
                 print("✅ EXAONE 토크나이저 로드 성공")
@@ -39,9 +59,17 @@ class BaseAgent(ABC):
         
         print("EXAONE 모델 설정 완료")
     
-    def generate_response(self, prompt: str, max_length: int = 1000, target_length: str = "간결하게") -> str:
-        """프롬프트에 대한 응답을 생성합니다."""
-        print(f"🔄 32B 모델 응답 생성 시작... (완료될 때까지 대기)")
+    def generate_response(self, prompt: str, max_length: Optional[int] = None, target_length: Optional[str] = None,
+                          task: str = "debate_speech", constraint: Optional[OutputConstraint] = None) -> str:
+        """프롬프트에 대한 응답을 생성합니다.
+
+        task는 호출 지점의 작업 유형으로, 라우터가 이를 보고 사용할 모델 티어를 고릅니다.
+        max_length를 생략하면 task와 target_length(출력 형식)로 정한 토큰 예산을 씁니다.
+        constraint가 주어지면 디코딩 단계에서 출력 형식이 보장되므로 사후 정리를 생략합니다.
+        """
+        if max_length is None:
+            max_length = self.max_new_tokens(task, target_length)
+        print(f"🔄 응답 생성 시작... (최대 {max_length}토큰)")
         
         try:
             # 토크나이저가 있으면 사용, 없으면 간단한 템플릿
@@ -60,77 +88,84 @@ class BaseAgent(ABC):
                 # 기본 템플릿 사용
                 input_text = f"User: {prompt}\nAssistant:"
             
-            # 임시 파일에 입력 저장 (UTF-8 인코딩 명시)
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
-                f.write(input_text)
-                input_file = f.name
+            # 자유 서술형 출력은 디코딩 중 반복·루프·과도한 길이를 감시해 조기 중단
+            monitor = None
+            if constraint is None or constraint.prose:
+                # 한국어 약 1.5자/토큰 기준, -n 한도에 걸려 문장이 잘리기 전에 문장 경계에서 멈춤
+                monitor = DegenerationMonitor(max_chars=int(max_length * 1.4))
             
-            try:
-                # 32B 모델용 최적화된 llama-cli 실행 (타임아웃 없음)
-                result = subprocess.run(
-                    [
-                        self.llama_cli_path,
-                        "-m", self.model_path,
-                        "-f", input_file,
-                        "-n", str(max_length),  # 토큰 수 적당히 제한
-                        "-c", "2048",                     # 컨텍스트 크기 설정
-                        "--temp", "0.7",
-                        "--top-p", "0.9",
-                        "--repeat-penalty", "1.1",
-                        "-no-cnv",
-                        "--seed", "42",
-                        "-t", "4"                         # CPU 스레드 수 지정
-                    ],
-                    capture_output=True,
-                    text=True,
-                    # timeout 제거 - 무제한 대기
-                    encoding='utf-8',     # UTF-8 인코딩 명시
-                    errors='ignore',      # 인코딩 오류 무시
-                    # Windows에서 창 숨기기 및 인코딩 문제 방지
-                    creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-                )
-                
-                if result.returncode != 0:
-                    error_msg = "실행 오류"
-                    if result.stderr:
-                        try:
-                            error_msg = result.stderr[:100]  # 오류 메시지 길이 제한
-                        except:
-                            error_msg = "인코딩 오류로 읽을 수 없음"
-                    
-                    print(f"llama-cli 실행 오류: {error_msg}")
-                    return "응답을 생성할 수 없습니다."
-                
-                # 응답 추출 (안전하게)
-                output = ""
-                if result.stdout:
-                    try:
-                        output = result.stdout.strip()
-                        print(f"✅ 응답 생성 완료: {len(output)}자")
-                    except Exception as e:
-                        print(f"⚠️ 출력 읽기 오류: {e}")
-                        return "출력 읽기 실패"
-                
-                if output:
-                    return self._extract_after_think(output)
-                else:
-                    return "빈 응답이 반환되었습니다."
-                
-            except Exception as e:
-                print(f"subprocess 오류: {e}")
-                return "실행 중 오류가 발생했습니다."
-            finally:
-                # 임시 파일 삭제
-                try:
-                    if os.path.exists(input_file):
-                        os.unlink(input_file)
-                except:
-                    pass  # 삭제 실패해도 계속
+            with tracer.span(f"llm.{task}", "llm", role=self.__class__.__name__, max_tokens=max_length):
+                result = self.router.generate(task, input_text, max_length, constraint, monitor)
+                self._trace_llm_phases(result)
+            self.last_generation_ok = result.ok
+            output_tokens = self.count_tokens(result.text) if result.ok else 0
+            if self.router.telemetry is not None:
+                self.router.telemetry.record(
+                    role=self.__class__.__name__, task=task, prompt=input_text,
+                    prompt_tokens=self.count_tokens(input_text), completion_tokens=output_tokens,
+                    result=result, constraint=constraint.name if constraint else "", max_tokens=max_length)
+            if not result.ok:
+                return result.text
+            
+            # 실제 출력 길이를 기록해 다음 호출의 예산을 조정
+            truncated = result.stop_reason == "max_length" or output_tokens >= max_length * 0.95
+            self.router.output_budget.record(task, target_length, output_tokens, truncated)
+            
+            if constraint is not None:
+                return result.text.replace("[end of text]", "").strip()
+            return self._extract_after_think(result.text)
             
         except Exception as e:
             print(f"텍스트 생성 중 오류 발생: {e}")
+            self.last_generation_ok = False
             return "오류가 발생했습니다."
     
+    def _trace_llm_phases(self, result):
+        """llama.cpp가 보고한 로드·프리필·디코드 시간을 LLM 구간의 자식 구간으로 추가합니다."""
+        if not tracer.enabled:
+            return
+        timings = result.timings or {}
+        tracer.set_attribute("ok", result.ok)
+        if result.stop_reason:
+            tracer.set_attribute("stop_reason", result.stop_reason)
+        # 생성이 끝난 시점에서 거꾸로 디코드 → 프리필 → 로드 순으로 배치
+        end_ns = tracer.now_ns()
+        for name, key in (("decode", "eval_ms"), ("prefill", "prompt_ms"), ("load", "load_ms")):
+            duration_ns = int((timings.get(key) or 0) * 1_000_000)
+            if duration_ns:
+                tracer.add_span(f"llama.{name}", end_ns - duration_ns, end_ns, "llm")
+                end_ns -= duration_ns
+    
+    def count_tokens(self, text: str) -> int:
+        """EXAONE 토크나이저 기준 토큰 수 (토크나이저가 없으면 글자 수로 추정)"""
+        if not text:
+            return 0
+        if self.tokenizer:
+            try:
+                return len(self.tokenizer.encode(text, add_special_tokens=False))
+            except Exception:
+                pass
+        # 한국어 기준 대략 1.5자당 1토큰 (보수적으로 올림)
+        return -(-len(text) * 2 // 3)
+    
+    def max_new_tokens(self, task: str, target_length: Optional[str] = None) -> int:
+        """task와 출력 형식에 맞는 최대 생성 토큰 수 (관측된 출력 길이로 조정됨)"""
+        return self.router.output_budget.max_tokens(task, target_length)
+    
+    def fit_prompt(self, sections: List[PromptSection], task: str = "debate_speech",
+                   max_new_tokens: Optional[int] = None) -> PromptBudget:
+        """task의 모델 컨텍스트 크기에 맞춰 프롬프트 구역별 예산을 배분합니다."""
+        if max_new_tokens is None:
+            max_new_tokens = self.max_new_tokens(task)
+        _, profile = self.router.resolve(task)
+        builder = PromptBudgetBuilder(self.count_tokens, profile.ctx_size, max_new_tokens)
+        budget = builder.fit(sections)
+        print(f"📐 프롬프트 예산({task}): {budget.describe()}")
+        if budget.overflow > 0:
+            print(f"⚠️ 프롬프트가 모든 구역을 줄인 뒤에도 컨텍스트({budget.context_size})를 "
+                  f"{budget.overflow}토큰 넘습니다 ({task}) - 모델이 앞부분을 잘라낼 수 있습니다")
+        return budget
+    
     def _extract_after_think(self, output: str) -> str:
         """'</think>' 이후의 문자열만 반환합니다. 태그가 없으면 원문을 반환합니다."""
         if not output:
@@ -0,0 +1,143 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+import json
+import os
+import threading
+
+from .llm_backend import LlamaCliBackend, ModelProfile, GenerationResult
+from .grammars import OutputConstraint
+from .degeneration import DegenerationMonitor
+from .replay_backend import request_key
+
+DEFAULT_CHECKPOINT_DIR = "debate_results/checkpoints"
+
+
+class DebateCheckpoint:
+    """토론 진행 단계를 JSONL로 먼저 기록해 두는 선행 기록(write-ahead) 체크포인트
+
+    레코드 종류:
+      - header: 토론 ID, 주제, 최대 라운드
+      - intro: 사회자 소개 결과
+      - statement: 완료된 발언 하나 (라운드, 입장, 발언)와 발언 직후 토론자의 메모리 상태·주제·근거 장부,
+                   출력 길이 통계 (재개 후에도 같은 토큰 예산으로 요청해야 기록된 응답을 재사용할 수 있음)
+      - round_summary: 라운드가 끝난 뒤의 부분 요약 캐시와 출력 길이 통계 (최종 요약에서 재사용)
+      - llm: 성공한 모델 응답 (요청 키와 텍스트) - 재개 시 같은 요청은 다시 생성하지 않음
+      - summary: 토론 요약 결과
+
+    레코드마다 flush + fsync하므로 비정상 종료 후에도 마지막 완료 단계까지 남는다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records: List[Dict] = []
+        self._lock = threading.Lock()
+
+    @property
+    def debate_id(self) -> str:
+        return os.path.splitext(os.path.basename(self.path))[0]
+
+    @classmethod
+    def create(cls, directory: str, debate_id: str) -> "DebateCheckpoint":
+        os.makedirs(directory, exist_ok=True)
+        # 같은 초에 시작한 토론이 있으면 접미사로 구분 (기존 체크포인트에 이어 쓰지 않도록)
+        path = os.path.join(directory, f"{debate_id}.jsonl")
+        suffix = 1
+        while os.path.exists(path):
+            suffix += 1
+            path = os.path.join(directory, f"{debate_id}_{suffix}.jsonl")
+        return cls(path)
+
+    @classmethod
+    def open(cls, directory: str, debate_id: str) -> "DebateCheckpoint":
+        """토론 ID(또는 체크포인트 파일 경로)로 기존 체크포인트를 읽습니다."""
+        path = debate_id if debate_id.endswith(".jsonl") else os.path.join(directory, f"{debate_id}.jsonl")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"체크포인트를 찾을 수 없습니다: {path}")
+        checkpoint = cls(path)
+        checkpoint.load()
+        return checkpoint
+
+    def load(self):
+        self.records = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    self.records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 기록 도중 종료돼 잘린 마지막 줄은 완료되지 않은 단계로 보고 버림
+                    print(f"⚠️ 체크포인트의 손상된 줄을 건너뜁니다: {line[:60]}")
+
+    def append(self, record_type: str, **data):
+        entry = {"type": record_type, "timestamp": datetime.now().isoformat(), **data}
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            # 이후 원본 객체가 바뀌어도 기록 시점의 값이 남도록 직렬화된 내용으로 보관
+            self.records.append(json.loads(line))
+
+    def find(self, record_type: str) -> List[Dict]:
+        return [r for r in self.records if r.get("type") == record_type]
+
+    def first(self, record_type: str) -> Optional[Dict]:
+        found = self.find(record_type)
+        return found[0] if found else None
+
+    def llm_responses(self) -> Dict[str, List[Dict]]:
+        """요청 키별로 기록된 응답 (기록 순서 유지)"""
+        responses: Dict[str, List[Dict]] = {}
+        for record in self.find("llm"):
+            responses.setdefault(record["key"], []).append(record)
+        return responses
+
+
+class CheckpointBackend:
+    """성공한 모델 응답을 체크포인트에 먼저 기록하고, 재개 시 기록된 응답을 돌려주는 백엔드
+
+    checkpoint가 None이면(토론 시작 전) 감싼 백엔드를 그대로 호출한다.
+    같은 요청이 여러 번 기록됐으면 기록 순서대로 한 번씩만 재사용한다.
+    """
+
+    def __init__(self, inner: Optional[LlamaCliBackend] = None):
+        self.inner = inner or LlamaCliBackend()
+        self.checkpoint: Optional[DebateCheckpoint] = None
+        self.reused = 0
+        self._pending: Dict[str, List[Dict]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def requires_model_files(self) -> bool:
+        return getattr(self.inner, "requires_model_files", True)
+
+    def attach(self, checkpoint: Optional[DebateCheckpoint], resume: bool = False):
+        """기록할 체크포인트를 지정합니다 (resume=True면 기록된 응답을 재사용 대기열에 올림)."""
+        with self._lock:
+            self.checkpoint = checkpoint
+            self._pending = checkpoint.llm_responses() if (checkpoint and resume) else {}
+            self.reused = 0
+
+    def generate(self, profile: ModelProfile, input_text: str, max_tokens: int,
+                 constraint: Optional[OutputConstraint] = None,
+                 monitor: Optional[DegenerationMonitor] = None) -> GenerationResult:
+        if self.checkpoint is None:
+            return self.inner.generate(profile, input_text, max_tokens, constraint, monitor)
+
+        key = request_key(profile, input_text, max_tokens, constraint)
+        with self._lock:
+            pending = self._pending.get(key)
+            record = pending.pop(0) if pending else None
+            if record:
+                self.reused += 1
+        if record:
+            return GenerationResult(record["text"], True, 0.0, stop_reason=record.get("stop_reason", ""),
+                                    cached=True)
+
+        result = self.inner.generate(profile, input_text, max_tokens, constraint, monitor)
+        if result.ok:
+            self.checkpoint.append("llm", key=key, constraint=constraint.name if constraint else "",
+                                   text=result.text, stop_reason=result.stop_reason)
+        return result
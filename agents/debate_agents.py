@@ -1,32 +1,79 @@
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Dict, List, Tuple, Optional, Set, TYPE_CHECKING
 from .base_agent import BaseAgent
-from utils.rag_system import RAGSystem
+from .llm_backend import ModelRouter, DEFAULT_MODEL_PATH
+from .grammars import YES_NO, SHORT_SUMMARY, SINGLE_PARAGRAPH, SINGLE_SENTENCE
+from .prompt_budget import PromptSection, trim_tagged_lines
+from utils.text_utils import split_sentence_spans, split_sentences
+from utils.topic_engine import TopicEngine
+from utils.evidence_ledger import EvidenceLedger, statement_hash
+from utils.tracing import traced
 import re
 import numpy as np
 from dataclasses import dataclass
 from datetime import datetime
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+if TYPE_CHECKING:
+    from utils.rag_system import RAGSystem
+
+
+# sklearn은 import가 무거워 근거 유사도를 처음 계산할 때 불러옴
+def cosine_similarity(X, Y):
+    from sklearn.metrics.pairwise import cosine_similarity as _cosine_similarity
+    return _cosine_similarity(X, Y)
+
+# 근거 벡터: 글자 n-gram 해싱(고정 폭, 학습 없음)을 float16으로 보관
+EVIDENCE_VECTOR_DIM = 256
 
 @dataclass
 class EvidenceItem:
-    """개별 근거 항목"""
+    """개별 근거 항목 (벡터는 EvidenceMatrix에 입장·카테고리별로 모아 둠)"""
+    __slots__ = ("text", "category", "normalized", "confidence", "timestamp", "stance")
     text: str
     category: str
     normalized: str
     confidence: float
     timestamp: datetime
     stance: str
-    vector: np.ndarray
+
+class EvidenceMatrix:
+    """한 입장·카테고리의 근거 벡터를 행으로 담는 연속 배열 (용량이 차면 두 배로 늘림)"""
+    __slots__ = ("keys", "vectors")
+
+    def __init__(self, dim: int = EVIDENCE_VECTOR_DIM):
+        self.keys: List[str] = []
+        self.vectors = np.zeros((8, dim), dtype=np.float16)
+
+    def add(self, key: str, vector: np.ndarray):
+        if len(self.keys) == len(self.vectors):
+            self.vectors = np.concatenate([self.vectors, np.zeros_like(self.vectors)])
+        self.vectors[len(self.keys)] = vector
+        self.keys.append(key)
+
+    def similarities(self, vector: np.ndarray) -> np.ndarray:
+        """저장된 모든 근거와의 코사인 유사도 (행이 L2 정규화돼 있어 행렬-벡터 곱 한 번)"""
+        return self.similarity_matrix(vector[np.newaxis])[0]
+
+    def similarity_matrix(self, vectors: np.ndarray) -> np.ndarray:
+        """질의 근거 × 저장된 근거 코사인 유사도 행렬"""
+        return vectors.astype(np.float32) @ self.vectors[:len(self.keys)].astype(np.float32).T
 
 class EnhancedEvidenceTracker:
     """실제 토론 데이터 기반 강화된 근거 추적 시스템"""
     
-    def __init__(self):
+    def __init__(self, ledger: Optional[EvidenceLedger] = None):
         self.used_evidence = {
             "진보": {}, 
             "보수": {}
         }
+        # 입장 → 카테고리 → 근거 벡터 배열 (유사 근거 찾기·충돌 검사에 사용)
+        self.evidence_vectors: Dict[str, Dict[str, EvidenceMatrix]] = {stance: {} for stance in self.used_evidence}
+        self._hasher = None
+        
+        # 토론 간 근거 장부 (attach_ledger로 주제를 정하면 이전 토론의 근거를 불러오고 사용 기록을 더함)
+        self.ledger = ledger
+        self.ledger_topic: Optional[str] = None
+        self.ledger_debate_id: Optional[str] = None
+        self._ledger_recorded: Set[Tuple[str, str]] = set()
         
         # 실제 토론에서 발견된 패턴을 반영한 강화된 정규식
         self.evidence_patterns = {
@@ -145,11 +192,7 @@ class EnhancedEvidenceTracker:
                 "재정학회 연구", "한국조세재정연구원 분석"
             ]
         }
-        self.vectorizer = TfidfVectorizer(
-            analyzer="char_wb",
-            ngram_range=(3, 5),  # 3~5자 n-gram
-            min_df=1
-        )
+        self._vectorizer = None
     
     def extract_evidence(self, statement: str) -> Dict[str, List[str]]:
         """강화된 근거 추출"""
@@ -165,6 +208,16 @@ class EnhancedEvidenceTracker:
         
         return evidence
     
+    def extract_evidence_spans(self, statement: str) -> List[Tuple[str, str, int, int]]:
+        """근거를 (카테고리, 텍스트, 시작, 끝) 위치와 함께 추출"""
+        spans = []
+        for category, patterns in self.evidence_patterns.items():
+            for pattern in patterns:
+                for match in re.finditer(pattern, statement, re.IGNORECASE):
+                    if match.group(1).strip():
+                        spans.append((category, match.group(1).strip(), match.start(1), match.end(1)))
+        return spans
+    
     def normalize_evidence(self, evidence_text: str, category: str = "") -> str:
         """향상된 근거 정규화"""
         normalized = evidence_text.lower().strip()
@@ -188,6 +241,41 @@ class EnhancedEvidenceTracker:
         
         return normalized
     
+    @property
+    def vectorizer(self):
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            self._vectorizer = TfidfVectorizer(
+                analyzer="char_wb",
+                ngram_range=(3, 5),  # 3~5자 n-gram
+                min_df=1
+            )
+        return self._vectorizer
+
+    @property
+    def hasher(self):
+        if self._hasher is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            self._hasher = HashingVectorizer(analyzer="char_wb", ngram_range=(3, 5),
+                                             n_features=EVIDENCE_VECTOR_DIM, alternate_sign=False, norm="l2")
+        return self._hasher
+
+    def embed_evidence(self, normalized: List[str]) -> np.ndarray:
+        """정규화된 근거들을 고정 폭 해싱 벡터(float16, L2 정규화)로 한 번에 변환"""
+        if not normalized:
+            return np.zeros((0, EVIDENCE_VECTOR_DIM), dtype=np.float16)
+        return self.hasher.transform(normalized).toarray().astype(np.float16)
+
+    def _evidence_similarities(self, normalized: str, candidates: List[str]) -> np.ndarray:
+        """근거 하나와 후보들의 해싱 벡터 코사인 유사도 (근거 장부 후보 채점용)"""
+        vectors = self.embed_evidence([normalized] + candidates).astype(np.float32)
+        return vectors[1:] @ vectors[0]
+
+    def _add_evidence(self, item: EvidenceItem, vector: np.ndarray):
+        self.used_evidence[item.stance][item.normalized] = item
+        matrix = self.evidence_vectors[item.stance].setdefault(item.category, EvidenceMatrix())
+        matrix.add(item.normalized, vector)
+
     def _to_vec(self, texts: List[str]) -> np.ndarray:
         # 벡터화: 비교 집합을 동시 변환
         return self.vectorizer.fit_transform(texts)
@@ -198,64 +286,184 @@ class EnhancedEvidenceTracker:
         sim = float(cosine_similarity(X[0], X[1])[0][0])
         return sim
     
+    def attach_ledger(self, ledger: Optional[EvidenceLedger], topic: str, debate_id: Optional[str] = None,
+                      preload_limit: int = 200):
+        """토론 간 근거 장부를 연결하고, 이 주제에서 많이 쓰인 근거를 입장별로 preload_limit개까지 불러옵니다."""
+        self.ledger = ledger
+        self.ledger_topic = topic
+        self.ledger_debate_id = debate_id
+        self._ledger_recorded = set()
+        if ledger is None:
+            return
+        loaded = 0
+        for stance in self.used_evidence:
+            entries = [entry for entry in ledger.load(topic, stance, preload_limit)
+                       if entry["normalized"] not in self.used_evidence[stance]]
+            vectors = self.embed_evidence([entry["normalized"] for entry in entries])
+            for entry, vector in zip(entries, vectors):
+                self._add_evidence(EvidenceItem(
+                    text=entry["text"],
+                    category=entry["category"],
+                    normalized=entry["normalized"],
+                    confidence=self._calculate_confidence(entry["text"], entry["category"]),
+                    timestamp=datetime.fromisoformat(entry["last_seen"]),
+                    stance=stance,
+                ), vector)
+            loaded += len(entries)
+        if loaded:
+            print(f"📒 근거 장부: 이전 토론 근거 {loaded}개를 불러왔습니다 ({topic})")
+
+    @traced(category="evidence")
     def record_used_evidence(self, statement: str, stance: str):
         evidence = self.extract_evidence(statement)
         timestamp = datetime.now()
+        ledger_items = []
 
         for category, items in evidence.items():
             for item in items:
                 normalized = self.normalize_evidence(item, category)
                 if normalized and len(normalized) > 2:
-                    existing_key = self._find_similar_evidence(normalized, stance, category)
-                    if existing_key:
-                        self.used_evidence[stance][existing_key].timestamp = timestamp
-                    else:
-                        # 새 항목 벡터를 만들기 위해 비교군과 함께 fit_transform
-                        all_texts = [normalized] + [k for k, v in self.used_evidence[stance].items() if v.category == category]
-                        X = self._to_vec(all_texts)
-                        vec = X[0].toarray()[0]
-                        evidence_item = EvidenceItem(
-                            text=item,
-                            category=category,
-                            normalized=normalized,
-                            confidence=self._calculate_confidence(item, category),
-                            timestamp=timestamp,
-                            stance=stance,
-                            vector=vec,
-                        )
-                        self.used_evidence[stance][normalized] = evidence_item
+                    ledger_items.append((category, normalized, item))
+
+        # 발언의 근거를 한 번에 벡터화하고, 앞에서 추가한 근거까지 포함해 차례로 비교
+        vectors = self.embed_evidence([normalized for _, normalized, _ in ledger_items])
+        for (category, normalized, item), vector in zip(ledger_items, vectors):
+            existing_key = self._find_similar_evidence(normalized, stance, category, vector=vector)
+            if existing_key:
+                self.used_evidence[stance][existing_key].timestamp = timestamp
+            else:
+                self._add_evidence(EvidenceItem(
+                    text=item,
+                    category=category,
+                    normalized=normalized,
+                    confidence=self._calculate_confidence(item, category),
+                    timestamp=timestamp,
+                    stance=stance,
+                ), vector)
+
+        # 같은 발언은 라운드마다 다시 기록되므로 장부에는 발언당 한 번만 씀
+        key = (stance, statement_hash(statement))
+        if self.ledger is not None and self.ledger_topic and ledger_items and key not in self._ledger_recorded:
+            self._ledger_recorded.add(key)
+            self.ledger.record(self.ledger_topic, stance, ledger_items, statement,
+                               debate_id=self.ledger_debate_id, timestamp=timestamp)
     
-    def _find_similar_evidence(self, normalized: str, stance: str, category: str, threshold: float = 0.80) -> str:
-        # 비교 대상들이 이미 저장되어 있다면, 같은 벡터 공간으로 변환
-        candidates = [(k, v) for k, v in self.used_evidence[stance].items() if v.category == category]
-        if not candidates:
+    # 해싱 벡터는 쌍마다 다시 맞춘 TF-IDF보다 공통 n-gram 가중치가 높아 기준도 그만큼 높임
+    # (TF-IDF 0.80/0.78과 코퍼스 근거 쌍에서 같은 판정)
+    def _find_similar_evidence(self, normalized: str, stance: str, category: str, threshold: float = 0.88,
+                               vector: Optional[np.ndarray] = None) -> Optional[str]:
+        matrix = self.evidence_vectors[stance].get(category)
+        if matrix is None or not matrix.keys:
             return None
-        corpus = [normalized] + [k for k, _ in candidates]
-        X = self._to_vec(corpus)
-        sims = cosine_similarity(X[0], X[1:])[0]
+        if vector is None:
+            vector = self.embed_evidence([normalized])[0]
+        sims = matrix.similarities(vector)
         best_idx = int(np.argmax(sims))
-        best_sim = float(sims[best_idx])
-        return candidates[best_idx][0] if best_sim >= threshold else None
-
-    def check_evidence_conflict(self, statement: str, stance: str) -> Tuple[bool, List[str]]:
-        opponent_stance = "보수" if stance == "진보" else "진보"
-        evidence = self.extract_evidence(statement)
-        conflicting_evidence = []
-        for category, items in evidence.items():
-            opp_candidates = [(k, v) for k, v in self.used_evidence[opponent_stance].items() if v.category == category]
-            for item in items:
-                normalized = self.normalize_evidence(item, category)
-                if normalized in self.used_evidence[opponent_stance]:
-                    conflicting_evidence.append(item)
+        return matrix.keys[best_idx] if float(sims[best_idx]) >= threshold else None
+
+    def _match_opponent(self, entries: List[Tuple[str, str]], opponent_stance: str,
+                        threshold: float = 0.86) -> List[Optional[Tuple[str, float, str]]]:
+        """(카테고리, 정규화 키) 목록을 상대가 쓴 근거와 한 번에 비교합니다.
+
+        항목마다 (일치한 상대 근거 키, 유사도, 출처 "memory"/"ledger") 또는 None을 반환한다.
+        같은 키는 한 번만 보고, 나머지는 한 번에 벡터화해 카테고리별 항목×상대 근거 유사도 행렬로 비교한다.
+        """
+        matches: Dict[Tuple[str, str], Optional[Tuple[str, float, str]]] = {}
+        pending = []
+        for category, normalized in dict.fromkeys(entries):
+            if normalized in self.used_evidence[opponent_stance]:
+                matches[(category, normalized)] = (normalized, 1.0, "memory")
+            else:
+                matches[(category, normalized)] = None
+                pending.append((category, normalized))
+
+        if pending:
+            vectors = self.embed_evidence([normalized for _, normalized in pending])
+            rows_by_category: Dict[str, List[int]] = {}
+            for row, (category, _) in enumerate(pending):
+                rows_by_category.setdefault(category, []).append(row)
+            for category, rows in rows_by_category.items():
+                matrix = self.evidence_vectors[opponent_stance].get(category)
+                if matrix is None or not matrix.keys:
                     continue
-                if opp_candidates:
-                    corpus = [normalized] + [k for k, _ in opp_candidates]
-                    X = self._to_vec(corpus)
-                    sims = cosine_similarity(X[0], X[1:])[0]
-                    if float(np.max(sims)) >= 0.78:  # TF-IDF
-                        conflicting_evidence.append(item)
+                sims = matrix.similarity_matrix(vectors[rows])
+                best = sims.argmax(axis=1)
+                for row, col, score in zip(rows, best, sims[np.arange(len(rows)), best]):
+                    if score >= threshold:
+                        matches[pending[row]] = (matrix.keys[col], float(score), "memory")
+
+            # 불러오지 않은 이전 토론 근거는 장부의 디스크 색인에서 조회
+            if self.ledger is not None and self.ledger_topic:
+                for category, normalized in pending:
+                    if matches[(category, normalized)] is None:
+                        # 장부 후보도 메모리 비교와 같은 유사도·기준으로 판정
+                        found = self.ledger.find(self.ledger_topic, opponent_stance, category, normalized,
+                                                 similarity=self._evidence_similarities, threshold=threshold)
+                        if found and found["similarity"] >= threshold:
+                            matches[(category, normalized)] = (found["normalized"], float(found["similarity"]), "ledger")
+        return [matches[entry] for entry in entries]
+
+    @traced(category="evidence")
+    def find_conflicts(self, statement: str, stance: str) -> List[Dict]:
+        """발언의 근거 중 상대가 이미 쓴 근거와 겹치는 것을 유사도와 일치한 상대 근거 키와 함께 반환합니다."""
+        opponent_stance = "보수" if stance == "진보" else "진보"
+        entries = [(category, item, self.normalize_evidence(item, category))
+                   for category, items in self.extract_evidence(statement).items() for item in items]
+        matches = self._match_opponent([(category, normalized) for category, _, normalized in entries],
+                                       opponent_stance)
+        return [{"item": item, "category": category, "normalized": normalized,
+                 "matched": match[0], "score": match[1], "source": match[2]}
+                for (category, item, normalized), match in zip(entries, matches) if match]
+
+    @traced(category="evidence")
+    def check_evidence_conflict(self, statement: str, stance: str) -> Tuple[bool, List[str]]:
+        conflicting_evidence = [conflict["item"] for conflict in self.find_conflicts(statement, stance)]
         return (len(conflicting_evidence) > 0, conflicting_evidence)
-    
+
+    @traced(category="evidence")
+    def find_conflicting_sentences(self, statement: str, stance: str) -> List[Tuple[int, int, List[str]]]:
+        """근거 스팬 위치로 중복 근거가 들어 있는 문장을 찾아 (시작, 끝, 중복 근거) 목록으로 반환"""
+        opponent_stance = "보수" if stance == "진보" else "진보"
+        sentence_spans = split_sentence_spans(statement)
+        conflicts = {}
+        spans = self.extract_evidence_spans(statement)
+        matches = self._match_opponent([(category, self.normalize_evidence(item, category))
+                                        for category, item, _, _ in spans], opponent_stance)
+        for (category, item, start, _), match in zip(spans, matches):
+            if not match:
+                continue
+            for sent_start, sent_end in sentence_spans:
+                if sent_start <= start < sent_end:
+                    items = conflicts.setdefault((sent_start, sent_end), [])
+                    if item not in items:
+                        items.append(item)
+                    break
+        return [(start, end, items) for (start, end), items in sorted(conflicts.items())]
+
+    @traced(category="evidence")
+    def get_avoid_list(self, stance: str, opponent_statements: List[str], limit: int = 8) -> List[str]:
+        """상대가 이미 사용한 근거 중 이번 발언에서 피해야 할 항목 (최근 발언의 근거 우선)"""
+        opponent_stance = "보수" if stance == "진보" else "진보"
+        avoid_items = []
+        seen = set()
+
+        # 상대 발언을 최신순으로 훑으며 추출된 근거 스팬을 모음
+        for statement in reversed(opponent_statements):
+            for category, items in self.extract_evidence(statement).items():
+                for item in items:
+                    normalized = self.normalize_evidence(item, category)
+                    if len(normalized) > 2 and normalized not in seen:
+                        seen.add(normalized)
+                        avoid_items.append(item)
+
+        # 이전 토론 기록 등으로 추적기에만 남아 있는 상대 근거도 보충
+        for normalized, item in self.used_evidence[opponent_stance].items():
+            if normalized not in seen:
+                seen.add(normalized)
+                avoid_items.append(item.text)
+
+        return avoid_items[:limit]
+
     def _calculate_confidence(self, text: str, category: str) -> float:
         """근거의 신뢰도 점수 계산"""
         confidence = 0.5  # 기본값
@@ -275,13 +483,13 @@ class EnhancedEvidenceTracker:
             
         return min(confidence, 1.0)
     
-    def get_alternative_evidence_prompt(self, conflicting_items: List[str], stance: str) -> str:
+    def get_alternative_evidence_prompt(self, conflicting_items: List[str], stance: str, max_items: int = 3) -> str:
         """맥락에 맞는 대안 근거 제안"""
         if not conflicting_items:
             return ""
         
         suggestions = self.alternative_suggestions.get(stance, [])[:4]
-        conflicting_text = ", ".join(conflicting_items[:3])  # 최대 3개만 표시
+        conflicting_text = ", ".join(conflicting_items[:max_items])  # 기본 최대 3개만 표시
         
         warning = f"""
 ⚠️ 근거 중복 경고: 다음 근거들은 상대방이 이미 사용했습니다
@@ -294,27 +502,106 @@ class EnhancedEvidenceTracker:
    • 같은 기관이라도 다른 시점의 자료를 사용하세요
    • 상대방과 다른 해석 관점을 제시하세요  
    • {stance} 성향 기관의 독립적 분석을 인용하세요
-   • 구체적인 데이터 제시하세요 
+   • 구체적인 데이터 제시하세요
 """
         return warning
 
+    def export_ledger(self) -> Dict[str, List[Dict]]:
+        """사용된 근거 장부를 JSON으로 저장할 수 있는 형태로 반환합니다 (체크포인트용)."""
+        return {
+            stance: [{
+                "text": item.text,
+                "category": item.category,
+                "normalized": item.normalized,
+                "confidence": item.confidence,
+                "timestamp": item.timestamp.isoformat(),
+            } for item in items.values()]
+            for stance, items in self.used_evidence.items()
+        }
+
+    def load_ledger(self, ledger: Dict[str, List[Dict]]):
+        """export_ledger()로 저장한 근거 장부를 복원합니다 (벡터는 정규화 키에서 다시 계산)."""
+        for stance, items in ledger.items():
+            self.used_evidence[stance] = {}
+            self.evidence_vectors[stance] = {}
+            vectors = self.embed_evidence([entry["normalized"] for entry in items])
+            for entry, vector in zip(items, vectors):
+                self._add_evidence(EvidenceItem(
+                    text=entry["text"],
+                    category=entry["category"],
+                    normalized=entry["normalized"],
+                    confidence=entry["confidence"],
+                    timestamp=datetime.fromisoformat(entry["timestamp"]),
+                    stance=stance,
+                ), vector)
+
+# 발언 요약 방식: LLM 생성 / 추출식(중심 문장 + 근거, 생성 없음)
+MEMORY_SUMMARY_MODES = ("llm", "extractive")
+
 class StatementMemoryManager:
     """발언 메모리 관리를 위한 헬퍼 클래스"""
     
-    def __init__(self, max_statements: int = 8):
+    def __init__(self, max_statements: int = 8, topic_engine: Optional[TopicEngine] = None,
+                 summary_mode: str = "llm"):
+        if summary_mode not in MEMORY_SUMMARY_MODES:
+            raise ValueError(f"지원하지 않는 발언 요약 방식입니다: {summary_mode}")
         self.max_statements = max_statements
+        self.summary_mode = summary_mode
+        # 추출식 요약 최대 길이 (LLM 요약 문법의 상한과 같게)
+        self.extractive_max_chars = 150
+        # 핵심 주제 추출·과거 발언 선별은 LLM 대신 문장 임베딩 기반 주제 엔진으로 (수 ms, 결정적)
+        self.topic_engine = topic_engine or TopicEngine()
+        # 이보다 핵심 주제와 멀면 과거 발언을 메모리에 넣지 않음
+        self.min_topic_similarity = 0.1
         
     def summarize_statement(self, statement: str, agent) -> str:
         """발언을 핵심 논점으로 요약"""
+        if self.summary_mode == "extractive":
+            return self.extractive_summary(statement, getattr(agent, "evidence_tracker", None))
+        
         prompt = f"""다음 발언의 핵심 논점을 100자 근처로 요약해주세요:
 
 발언: "{statement}"
 
 핵심 논점만 간단히 정리하세요 (예: "재정정책 확대 필요", "시장경제 원리 강조"):"""
         
-        summary = agent.generate_response(prompt)
+        summary = agent.generate_response(prompt, task="statement_summary", constraint=SHORT_SUMMARY)
         return summary.strip() if summary else statement[:50]
     
+    def extractive_summary(self, statement: str, evidence_tracker: Optional['EnhancedEvidenceTracker'] = None) -> str:
+        """임베딩 중심성이 가장 높은 문장을 고르고, 그 문장에 없는 근거(수치·기관·정책)를 꼬리표로 붙입니다."""
+        sentences = split_sentences(statement, 10)
+        if not sentences:
+            return statement[:self.extractive_max_chars]
+        
+        # 문장 벡터 평균(발언 전체의 중심)과 가장 가까운 문장
+        best = 0
+        if len(sentences) > 1:
+            vectors = self.topic_engine.embedder.embed(sentences)
+            centroid = vectors.mean(axis=0)
+            best = int(np.argmax(vectors @ centroid))
+        central = sentences[best]
+        
+        # 발언 전체에서 추적된 근거 중 중심 문장에 빠진 것 (처음 나온 순서로 최대 3개)
+        # (같은 근거의 다른 표기는 정규화해서 하나로, 문구 단위로 길게 잡힌 것은 제외)
+        missing = []
+        if evidence_tracker is not None:
+            seen = {evidence_tracker.normalize_evidence(text, category)
+                    for category, text, _, _ in evidence_tracker.extract_evidence_spans(central)}
+            spans = sorted(evidence_tracker.extract_evidence_spans(statement), key=lambda span: span[2])
+            for category, text, _, _ in spans:
+                normalized = evidence_tracker.normalize_evidence(text, category)
+                if normalized in seen or len(text) > 20 or any(text in kept or kept in text for kept in missing):
+                    continue
+                seen.add(normalized)
+                missing.append(text)
+        tag = f" (근거: {', '.join(missing[:3])})" if missing else ""
+        
+        room = self.extractive_max_chars - len(tag)
+        if len(central) > room:
+            central = central[:max(room - 1, 0)].rstrip() + "…"
+        return central + tag
+    
     def detect_contradiction(self, new_statement: str, past_statement: str, agent) -> bool:
         """새 발언이 과거 발언과 모순되는지 검증"""
         prompt = f"""다음 두 발언이 서로 모순되는지 판단해주세요:
@@ -324,35 +611,28 @@ class StatementMemoryManager:
 
 모순된다면 "YES", 모순되지 않는다면 "NO"로만 답해주세요:"""
         
-        result = agent.generate_response(prompt)
-        return "YES" in result.upper() if result else False
+        # 문법 제약으로 YES/NO 한 단어만 디코딩
+        result = agent.generate_response(prompt, task="contradiction_check", constraint=YES_NO)
+        return result.strip().upper() == "YES" if result else False
     
-    def extract_key_topics(self, statements: List[str], agent) -> List[str]:
+    def extract_key_topics(self, statements: List[str], agent=None) -> List[str]:
         """발언들에서 핵심 주제들을 추출"""
+        return [topic["label"] for topic in self._extract_topics(statements)]
+    
+    def _extract_topics(self, statements: List[str]) -> List[Dict]:
         if not statements:
             return []
-            
         combined_text = " ".join(statements[-3:])  # 최근 3개 발언만 사용
-        
-        prompt = f"""다음 발언들에서 핵심 주제 3개를 추출해주세요:
-
-발언들: "{combined_text}"
-
-핵심 주제만 간단히 나열하세요 (예: "재정정책", "일자리", "부동산"):"""
-        
-        result = agent.generate_response(prompt)
-        if result:
-            topics = [topic.strip() for topic in result.split(",")]
-            return topics[:3]
-        return []
+        return self.topic_engine.extract(combined_text, top_k=3)
     
+    @traced(category="memory")
     def manage_memory(self, statements: List[str], agent) -> List[Dict]:
         """메모리를 효율적으로 관리"""
         if len(statements) <= self.max_statements:
             return [{"statement": stmt, "summary": self.summarize_statement(stmt, agent)} 
                    for stmt in statements]
         
-        # 중요도 기반 선별 (최근 발언 우선, 핵심 주제 포함 발언 우선)
+        # 중요도 기반 선별 (최근 발언 우선, 핵심 주제와 가까운 발언 우선)
         managed_statements = []
         
         # 최근 6개는 무조건 포함
@@ -364,29 +644,87 @@ class StatementMemoryManager:
                 "priority": "recent"
             })
         
-        # 나머지 중에서 핵심 주제 포함 발언 선별
+        # 나머지 중에서 핵심 주제와 임베딩 유사도가 높은 발언 선별 (원래 순서 유지)
         older_statements = statements[:-6] if len(statements) > 6 else []
-        key_topics = self.extract_key_topics(statements, agent)
-        
-        for stmt in older_statements:
-            if any(topic.lower() in stmt.lower() for topic in key_topics):
-                managed_statements.append({
-                    "statement": stmt,
-                    "summary": self.summarize_statement(stmt, agent),
-                    "priority": "key_topic"
-                })
-                if len(managed_statements) >= self.max_statements:
-                    break
+        key_topics = self._extract_topics(statements)
+        ranked = self.topic_engine.rank(older_statements, [topic["id"] for topic in key_topics])
+        slots = self.max_statements - len(managed_statements)
+        for idx in sorted(idx for idx, score in ranked[:slots] if score >= self.min_topic_similarity):
+            managed_statements.append({
+                "statement": older_statements[idx],
+                "summary": self.summarize_statement(older_statements[idx], agent),
+                "priority": "key_topic"
+            })
         
         return managed_statements
 
+class EvidenceRepairManager:
+    """근거 중복이 발견된 문장만 부분 재생성하는 헬퍼 클래스"""
+    
+    def __init__(self, evidence_tracker: EnhancedEvidenceTracker, max_attempts: int = 2):
+        self.evidence_tracker = evidence_tracker
+        self.max_attempts = max_attempts
+    
+    @traced(category="evidence")
+    def repair(self, statement: str, stance: str, agent) -> Tuple[str, Dict]:
+        """중복 근거 문장을 앞뒤 문맥을 고정한 채 다시 쓰고, 재검증을 반복합니다."""
+        report = {"attempts": 0, "repaired_sentences": 0, "regenerated_tokens": 0, "resolved": False}
+        
+        for _ in range(self.max_attempts):
+            conflicts = self.evidence_tracker.find_conflicting_sentences(statement, stance)
+            if not conflicts:
+                break
+            report["attempts"] += 1
+            
+            # 뒤 문장부터 바꿔야 앞 문장의 위치가 유지됨
+            for start, end, items in reversed(conflicts):
+                new_sentence = self._rewrite_sentence(
+                    statement[:start].strip(), statement[start:end], statement[end:].strip(), items, stance, agent)
+                if not new_sentence:
+                    continue
+                statement = statement[:start] + new_sentence + statement[end:]
+                report["repaired_sentences"] += 1
+                report["regenerated_tokens"] += agent.count_tokens(new_sentence)
+        
+        report["resolved"] = not self.evidence_tracker.find_conflicting_sentences(statement, stance)
+        return statement, report
+    
+    def _rewrite_sentence(self, prefix: str, sentence: str, suffix: str, items: List[str], stance: str, agent) -> str:
+        suggestions = ", ".join(self.evidence_tracker.alternative_suggestions.get(stance, [])[:4])
+        prompt = f"""너는 {stance} 성향 정치인이다. 아래 발언에서 '수정할 문장' 하나만 다시 써라.
+
+앞 문맥: "{prefix}"
+수정할 문장: "{sentence}"
+뒤 문맥: "{suffix}"
+
+수정할 문장의 다음 근거는 상대방이 이미 사용했으므로 빼고, {stance} 관점의 다른 근거나 해석으로 바꿔라: {', '.join(items)}
+추천 근거: {suggestions}
+
+앞뒤 문맥과 자연스럽게 이어지는 존댓말 한 문장만 출력하라."""
+        
+        max_tokens = min(agent.max_new_tokens("sentence_repair"), agent.count_tokens(sentence) * 2 + 32)
+        result = agent.generate_response(prompt, max_length=max_tokens,
+                                         task="sentence_repair", constraint=SINGLE_SENTENCE)
+        # 생성 실패 메시지가 문장을 덮어쓰지 않도록 문장부호로 끝나는 결과만 채택
+        result = result.strip() if result else ""
+        return result if result[-1:] in ".?!" and len(result) > 5 else ""
+
 class ProgressiveAgent(BaseAgent):
-    def __init__(self, model_path: str = 'C:/Users/User/Documents/EXAONE-4.0-32B-Q4_K_M.gguf', rag_system: Optional[RAGSystem] = None, evidence_tracker: Optional[EnhancedEvidenceTracker] = None):
-        super().__init__(model_path)
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, rag_system: Optional['RAGSystem'] = None, evidence_tracker: Optional[EnhancedEvidenceTracker] = None, router: Optional[ModelRouter] = None,
+                 memory_summary_mode: str = "llm"):
+        super().__init__(model_path, router)
         self.stance = "진보"
         self.rag_system = rag_system
-        self.memory_manager = StatementMemoryManager()
+        # RAG가 있으면 이미 로드된 한국어 문장 임베딩(ko-sroberta)을 주제 엔진에 재사용
+        # memory_summary_mode="extractive"면 발언 요약도 생성 없이 중심 문장 + 근거로 만듦
+        self.memory_manager = StatementMemoryManager(
+            topic_engine=TopicEngine(getattr(rag_system, "embedding_cache", None)),
+            summary_mode=memory_summary_mode)
         self.evidence_tracker = evidence_tracker or EnhancedEvidenceTracker()
+        # RAG 근거를 압축해 프롬프트에 넣을 때의 토큰 예산
+        self.evidence_token_budget = 350
+        self.repair_manager = EvidenceRepairManager(self.evidence_tracker)
+        self.repair_reports = []
         
         # 과거 발언 추적을 위한 저장소 (원본 + 관리된 버전)
         self.my_previous_statements = []
@@ -440,6 +778,7 @@ class ProgressiveAgent(BaseAgent):
 
 """
 
+    @traced(category="agent")
     def update_statement_history(self, previous_statements: List[Dict]):
         """발언 기록을 업데이트하고 메모리 관리"""
         self.my_previous_statements = []
@@ -513,6 +852,7 @@ class ProgressiveAgent(BaseAgent):
         return [stmt["summary"] for stmt in self.opponent_managed_statements 
                 if stmt.get("priority") in ["recent", "key_topic"]]
 
+    @traced(category="agent")
     def generate_argument(self, topic: str, round_number: int, previous_statements: List[Dict]) -> str:
         # 발언 기록 업데이트
         self.update_statement_history(previous_statements)
@@ -520,31 +860,31 @@ class ProgressiveAgent(BaseAgent):
         context = self._build_context(previous_statements)
 
         ##### RAG #####
-        # 관련 기사 검색(진보 시각)
+        # 관련 기사 검색(진보 시각) 후 주제·상대 최근 발언과 관련된 문장만 압축
         evidence_text = ""
         if self.rag_system:
             retrieved_docs = self.rag_system.search(query=topic, stance_filter="진보")
             if retrieved_docs:
-                evidence_text = "\n".join(
-                    [f"- {doc['text']} (출처: {doc['source']})" for doc in retrieved_docs[:3]]
-                )
-
-        # 공통적으로 프롬프트에 삽입
-        evidence_section = f"\n\n📚 참고 기사:\n{evidence_text}\n" if evidence_text else ""
+                focus_texts = [topic, self._get_last_conservative_statement(previous_statements)]
+                evidence_text = self.rag_system.compress_evidence(
+                    retrieved_docs[:3], focus_texts, self.evidence_token_budget, self.count_tokens)
+
+        # 공통적으로 프롬프트에 삽입 (예산 초과 시 뒤쪽 기사부터 줄임)
+        evidence_section = PromptSection("evidence", evidence_text, priority=4, min_tokens=300,
+                                         prefix="\n\n📚 참고 기사:\n", suffix="\n",
+                                         trimmer=trim_tagged_lines)
         ##### RAG #####
 
         # 핵심 논점 기반 발언 기록 섹션 생성
         my_key_args = self.get_my_key_arguments()
-        my_arguments_section = ""
-        if my_key_args:
-            my_arguments_text = ", ".join(my_key_args[:5])  # 최대 5개
-            my_arguments_section = f"\n\n📝 내가 강조한 핵심 논점들: {my_arguments_text}\n"
+        my_arguments_text = ", ".join(my_key_args[:5]) if my_key_args else ""  # 최대 5개
+        my_arguments_section = PromptSection("my_arguments", my_arguments_text, priority=3,
+                                             prefix="\n\n📝 내가 강조한 핵심 논점들: ", suffix="\n")
 
         opponent_key_args = self.get_opponent_key_arguments()
-        opponent_arguments_section = ""
-        if opponent_key_args:
-            opponent_arguments_text = ", ".join(opponent_key_args[:5])  # 최대 5개
-            opponent_arguments_section = f"\n\n🔴 상대(보수)의 핵심 논점들: {opponent_arguments_text}\n"
+        opponent_arguments_text = ", ".join(opponent_key_args[:5]) if opponent_key_args else ""  # 최대 5개
+        opponent_arguments_section = PromptSection("opponent_arguments", opponent_arguments_text, priority=3,
+                                                   prefix="\n\n🔴 상대(보수)의 핵심 논점들: ", suffix="\n")
 
         # 일관성 위반 경고
         consistency_warning = ""
@@ -562,9 +902,13 @@ class ProgressiveAgent(BaseAgent):
 """
 
         if round_number == 1:
-            prompt = f"""너는 더불어민주당 소속 진보 정치인이다.
+            sections = [
+                PromptSection("header", f"""너는 더불어민주당 소속 진보 정치인이다.
 
-토론 주제: {topic}{evidence_section}{evidence_guidelines}
+토론 주제: {topic}"""),
+                evidence_section,
+                PromptSection("guidelines", evidence_guidelines, fallback_priority=2),
+                PromptSection("instructions", """
 
 먼저 다음 단계별로 논리적 사고를 진행하라:
 <thinking>
@@ -576,22 +920,30 @@ class ProgressiveAgent(BaseAgent):
 
 그 다음 정중한 호칭을 포함하되 과장 없이, 존댓말로 구체적 수치·사례로 현재 상황의 심각성을 제시하고, 정부나 보수 정책의 실패를 비판하며, 진보적 대안의 필요성을 분명히 밝힌 뒤 2~3문장으로 힘 있게 마무리하라.
 
-형식 제한: <thinking> 부분은 출력하지 말고, 줄바꿈 없이 단락 하나로만 작성하고, 목록·숫자·괄호 시작·하이픈·불릿·이모지·제목을 사용하지 마라. 발화자의 멘트만 출력하라."""
+형식 제한: <thinking> 부분은 출력하지 말고 발화자의 멘트만 출력하라.""", fallback_priority=1),
+            ]
         else:
             last_conservative = self._get_last_conservative_statement(previous_statements)
             
-            # 근거 중복 체크를 위한 임시 응답 생성
-            temp_prompt = f"""상대 주장 '{last_conservative}'에 대한 반박 논점 3가지를 간단히 나열하세요:"""
-            temp_response = self.generate_response(temp_prompt)
+            # 상대 발언에서 추출한 근거로 회피 목록을 만들어 본 프롬프트에 바로 반영 (추가 생성 없음)
+            avoid_items = self.evidence_tracker.get_avoid_list(self.stance, self.opponent_previous_statements)
+            evidence_instruction = evidence_guidelines
+            if avoid_items:
+                evidence_instruction = self.evidence_tracker.get_alternative_evidence_prompt(
+                    avoid_items, self.stance, max_items=len(avoid_items))
             
-            # 근거 중복 확인
-            evidence_ok, evidence_warning = self.check_evidence_before_response(temp_response)
-            evidence_instruction = evidence_warning if not evidence_ok else evidence_guidelines
-            
-            prompt = f"""너는 더불어민주당 소속 진보 정치인이다.
-
-토론 주제: {topic}
-상대(보수)의 최근 주장: "{last_conservative}"{evidence_section}{my_arguments_section}{opponent_arguments_section}{consistency_warning}{evidence_instruction}
+            sections = [
+                PromptSection("header", f"""너는 더불어민주당 소속 진보 정치인이다.
+
+토론 주제: {topic}"""),
+                PromptSection("opponent_statement", last_conservative, priority=2, min_tokens=200,
+                              prefix='\n상대(보수)의 최근 주장: "', suffix='"'),
+                evidence_section,
+                my_arguments_section,
+                opponent_arguments_section,
+                PromptSection("consistency_warning", consistency_warning, priority=1),
+                PromptSection("evidence_instruction", evidence_instruction, fallback_priority=2),
+                PromptSection("instructions", """
 
 먼저 다음 단계별로 논리적 사고를 진행하라:
 <thinking>
@@ -615,24 +967,28 @@ class ProgressiveAgent(BaseAgent):
 
 그 다음 보수 측의 최근 주장을 정확히 요지 파악한 뒤, 존댓말로 구체적 데이터와 사례로 반증하고, 서민·중산층 관점에서 일관된 대안을 제시하며 공격적으로 마무리하라.
 
-형식 제한: <thinking> 부분과 보수 측 주장은 출력하지 말고, 목록·숫자·괄호 시작·하이픈·불릿·이모지·제목을 사용하지 마라. 발화자의 멘트만 출력하라."""
+형식 제한: <thinking> 부분과 보수 측 주장은 출력하지 말고 발화자의 멘트만 출력하라.""", fallback_priority=1),
+            ]
+        
+        # 컨텍스트(2048) 안에 들어가도록 구역별 토큰 예산 배분 (출력 예산은 관측된 발언 길이 기준)
+        budget = self.fit_prompt(sections, task="debate_speech")
+        prompt = budget.prompt
         
         # 응답 생성
-        response = self.generate_response(prompt)
+        response = self.generate_response(prompt, max_length=budget.max_new_tokens,
+                                          task="debate_speech", constraint=SINGLE_PARAGRAPH)
         
         # 일관성 및 근거 중복 검증
         if response:
             is_consistent, consistency_warning = self.check_consistency_before_response(response)
-            has_evidence_conflict, evidence_conflict_warning = self.check_evidence_before_response(response)
+            evidence_ok, evidence_conflict_warning = self.check_evidence_before_response(response)
             
             if not is_consistent:
                 print(f"[DEBUG 일관성] {consistency_warning}")
             
-            if has_evidence_conflict:
+            if not evidence_ok:
                 print(f"[DEBUG 근거중복] {evidence_conflict_warning}")
-                # 근거 중복이 발견된 경우 재생성 시도
-                retry_prompt = prompt + f"\n\n{evidence_conflict_warning}\n위 경고를 반영하여 다시 작성하세요:"
-                response = self.generate_response(retry_prompt)
+                response = self._repair_evidence_conflicts(response)
             
             # 새로운 발언을 기록에 추가 및 근거 추적
             self.my_previous_statements.append(response)
@@ -640,6 +996,15 @@ class ProgressiveAgent(BaseAgent):
         
         return response
 
+    def _repair_evidence_conflicts(self, response: str) -> str:
+        """중복 근거가 들어간 문장만 부분 재생성합니다."""
+        repaired, report = self.repair_manager.repair(response, self.stance, self)
+        self.repair_reports.append(report)
+        status = "해결" if report["resolved"] else "미해결"
+        print(f"🩹 근거 중복 부분 수정: {report['repaired_sentences']}문장, "
+              f"재생성 {report['regenerated_tokens']}토큰, 시도 {report['attempts']}회 ({status})")
+        return repaired
+
     def _build_context(self, statements: List[Dict]) -> str:
         if not statements:
             return "첫 라운드입니다."
@@ -680,12 +1045,21 @@ class ProgressiveAgent(BaseAgent):
         }
 
 class ConservativeAgent(BaseAgent):
-    def __init__(self, model_path: str = 'C:/Users/User/Documents/EXAONE-4.0-32B-Q4_K_M.gguf', rag_system: Optional[RAGSystem] = None, evidence_tracker: Optional[EnhancedEvidenceTracker] = None):
-        super().__init__(model_path)
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, rag_system: Optional['RAGSystem'] = None, evidence_tracker: Optional[EnhancedEvidenceTracker] = None, router: Optional[ModelRouter] = None,
+                 memory_summary_mode: str = "llm"):
+        super().__init__(model_path, router)
         self.stance = "보수"
         self.rag_system = rag_system
-        self.memory_manager = StatementMemoryManager()
+        # RAG가 있으면 이미 로드된 한국어 문장 임베딩(ko-sroberta)을 주제 엔진에 재사용
+        # memory_summary_mode="extractive"면 발언 요약도 생성 없이 중심 문장 + 근거로 만듦
+        self.memory_manager = StatementMemoryManager(
+            topic_engine=TopicEngine(getattr(rag_system, "embedding_cache", None)),
+            summary_mode=memory_summary_mode)
         self.evidence_tracker = evidence_tracker or EnhancedEvidenceTracker()
+        # RAG 근거를 압축해 프롬프트에 넣을 때의 토큰 예산
+        self.evidence_token_budget = 350
+        self.repair_manager = EvidenceRepairManager(self.evidence_tracker)
+        self.repair_reports = []
         
         # 과거 발언 추적을 위한 저장소 (원본 + 관리된 버전)
         self.my_previous_statements = []
@@ -740,6 +1114,7 @@ class ConservativeAgent(BaseAgent):
 
 """
 
+    @traced(category="agent")
     def update_statement_history(self, previous_statements: List[Dict]):
         """발언 기록을 업데이트하고 메모리 관리"""
         self.my_previous_statements = []
@@ -813,6 +1188,7 @@ class ConservativeAgent(BaseAgent):
         return [stmt["summary"] for stmt in self.opponent_managed_statements 
                 if stmt.get("priority") in ["recent", "key_topic"]]
 
+    @traced(category="agent")
     def generate_argument(self, topic: str, round_number: int, previous_statements: List[Dict]) -> str:
         # 발언 기록 업데이트
         self.update_statement_history(previous_statements)
@@ -820,29 +1196,29 @@ class ConservativeAgent(BaseAgent):
         context = self._build_context(previous_statements)
 
         ##### RAG #####
-        # 기사 검색 (보수 시각)
+        # 기사 검색 (보수 시각) 후 주제·상대 최근 발언과 관련된 문장만 압축
         evidence_text = ""
         if self.rag_system:
             retrieved_docs = self.rag_system.search(query=topic, stance_filter="보수")
             if retrieved_docs:
-                evidence_text = "\n".join(
-                    [f"- {doc['text']} (출처: {doc['source']})" for doc in retrieved_docs[:3]]
-                )
-        evidence_section = f"\n\n📚 참고 기사:\n{evidence_text}\n" if evidence_text else ""
+                focus_texts = [topic, self._get_last_progressive_statement(previous_statements)]
+                evidence_text = self.rag_system.compress_evidence(
+                    retrieved_docs[:3], focus_texts, self.evidence_token_budget, self.count_tokens)
+        evidence_section = PromptSection("evidence", evidence_text, priority=4, min_tokens=300,
+                                         prefix="\n\n📚 참고 기사:\n", suffix="\n",
+                                         trimmer=trim_tagged_lines)
         ##### RAG #####
 
         # 핵심 논점 기반 발언 기록 섹션 생성
         my_key_args = self.get_my_key_arguments()
-        my_arguments_section = ""
-        if my_key_args:
-            my_arguments_text = ", ".join(my_key_args[:5])  # 최대 5개
-            my_arguments_section = f"\n\n📝 내가 강조한 핵심 논점들: {my_arguments_text}\n"
+        my_arguments_text = ", ".join(my_key_args[:5]) if my_key_args else ""  # 최대 5개
+        my_arguments_section = PromptSection("my_arguments", my_arguments_text, priority=3,
+                                             prefix="\n\n📝 내가 강조한 핵심 논점들: ", suffix="\n")
 
         opponent_key_args = self.get_opponent_key_arguments()
-        opponent_arguments_section = ""
-        if opponent_key_args:
-            opponent_arguments_text = ", ".join(opponent_key_args[:5])  # 최대 5개
-            opponent_arguments_section = f"\n\n🔵 상대(진보)의 핵심 논점들: {opponent_arguments_text}\n"
+        opponent_arguments_text = ", ".join(opponent_key_args[:5]) if opponent_key_args else ""  # 최대 5개
+        opponent_arguments_section = PromptSection("opponent_arguments", opponent_arguments_text, priority=3,
+                                                   prefix="\n\n🔵 상대(진보)의 핵심 논점들: ", suffix="\n")
 
         # 일관성 위반 경고
         consistency_warning = ""
@@ -860,9 +1236,13 @@ class ConservativeAgent(BaseAgent):
 """
 
         if round_number == 1:
-            prompt = f"""너는 국민의힘 소속 보수 정치인이다.
+            sections = [
+                PromptSection("header", f"""너는 국민의힘 소속 보수 정치인이다.
 
-토론 주제: {topic}{evidence_section}{evidence_guidelines}
+토론 주제: {topic}"""),
+                evidence_section,
+                PromptSection("guidelines", evidence_guidelines, fallback_priority=2),
+                PromptSection("instructions", """
 
 먼저 다음 단계별로 논리적 사고를 진행하라:
 <thinking>
@@ -875,22 +1255,30 @@ class ConservativeAgent(BaseAgent):
 
 그 다음 현 상황을 구체적 수치와 데이터로 냉정히 진단하고 존댓말로 우려를 밝힌 다음, 진보 정책의 문제점을 경험적 근거와 함께 지적하고, 시장경제·재정건전성의 중요성을 실증적 데이터로 강조하며 책임 있는 어조로 마무리하라.
 
-형식 제한: <thinking> 부분은 출력하지 말고, 줄바꿈 없이 단락 하나로만 작성하고, 목록·숫자·괄호 시작·하이픈·불릿·이모지·제목을 절대 사용하지 마라. 발화자의 멘트만 출력하라."""
+형식 제한: <thinking> 부분은 출력하지 말고 발화자의 멘트만 출력하라.""", fallback_priority=1),
+            ]
         else:
             last_progressive = self._get_last_progressive_statement(previous_statements)
             
-            # 근거 중복 체크를 위한 임시 응답 생성
-            temp_prompt = f"""상대 주장 '{last_progressive}'에 대한 반박 논점 3가지를 간단히 나열하세요:"""
-            temp_response = self.generate_response(temp_prompt)
-            
-            # 근거 중복 확인
-            evidence_ok, evidence_warning = self.check_evidence_before_response(temp_response)
-            evidence_instruction = evidence_warning if not evidence_ok else evidence_guidelines
+            # 상대 발언에서 추출한 근거로 회피 목록을 만들어 본 프롬프트에 바로 반영 (추가 생성 없음)
+            avoid_items = self.evidence_tracker.get_avoid_list(self.stance, self.opponent_previous_statements)
+            evidence_instruction = evidence_guidelines
+            if avoid_items:
+                evidence_instruction = self.evidence_tracker.get_alternative_evidence_prompt(
+                    avoid_items, self.stance, max_items=len(avoid_items))
             
-            prompt = f"""너는 국민의힘 소속 보수 정치인이다.
-
-토론 주제: {topic}
-상대(진보)의 최근 주장: "{last_progressive}"{evidence_section}{my_arguments_section}{opponent_arguments_section}{consistency_warning}{evidence_instruction}
+            sections = [
+                PromptSection("header", f"""너는 국민의힘 소속 보수 정치인이다.
+
+토론 주제: {topic}"""),
+                PromptSection("opponent_statement", last_progressive, priority=2, min_tokens=200,
+                              prefix='\n상대(진보)의 최근 주장: "', suffix='"'),
+                evidence_section,
+                my_arguments_section,
+                opponent_arguments_section,
+                PromptSection("consistency_warning", consistency_warning, priority=1),
+                PromptSection("evidence_instruction", evidence_instruction, fallback_priority=2),
+                PromptSection("instructions", """
 
 먼저 다음 단계별로 논리적 사고를 진행하라:
 <thinking>
@@ -910,22 +1298,42 @@ class ConservativeAgent(BaseAgent):
 
 그 다음 상대의 최근 주장을 존댓말로 논리적으로 반박하고, 구체적 수치와 경험적 데이터로 재정 부담·장기 부작용을 입증하며, 실증적 근거를 들어 일관된 보수적 해법을 제시하고 존댓말이지만 공격적으로 마무리하라.
 
-형식 제한: <thinking> 부분과 진보 측 주장은 출력하지 말고, 목록·숫자·괄호 시작·하이픈·불릿·이모지·제목을 절대 사용하지 마라. 발화자의 멘트만 출력하라."""
+형식 제한: <thinking> 부분과 진보 측 주장은 출력하지 말고 발화자의 멘트만 출력하라.""", fallback_priority=1),
+            ]
+        
+        # 컨텍스트(2048) 안에 들어가도록 구역별 토큰 예산 배분 (출력 예산은 관측된 발언 길이 기준)
+        budget = self.fit_prompt(sections, task="debate_speech")
+        prompt = budget.prompt
         
         # 응답 생성
-        response = self.generate_response(prompt)
+        response = self.generate_response(prompt, max_length=budget.max_new_tokens,
+                                          task="debate_speech", constraint=SINGLE_PARAGRAPH)
         
-        # 일관성 검증
+        # 일관성 및 근거 중복 검증
         if response:
             is_consistent, warning = self.check_consistency_before_response(response)
             if not is_consistent:
                 print(f"[DEBUG] {warning}")  # 개발용 로그
             
+            evidence_ok, evidence_conflict_warning = self.check_evidence_before_response(response)
+            if not evidence_ok:
+                print(f"[DEBUG 근거중복] {evidence_conflict_warning}")
+                response = self._repair_evidence_conflicts(response)
+            
             # 새로운 발언을 기록에 추가
             self.my_previous_statements.append(response)
         
         return response
 
+    def _repair_evidence_conflicts(self, response: str) -> str:
+        """중복 근거가 들어간 문장만 부분 재생성합니다."""
+        repaired, report = self.repair_manager.repair(response, self.stance, self)
+        self.repair_reports.append(report)
+        status = "해결" if report["resolved"] else "미해결"
+        print(f"🩹 근거 중복 부분 수정: {report['repaired_sentences']}문장, "
+              f"재생성 {report['regenerated_tokens']}토큰, 시도 {report['attempts']}회 ({status})")
+        return repaired
+
     def _build_context(self, statements: List[Dict]) -> str:
         if not statements:
             return "첫 라운드입니다."
@@ -0,0 +1,91 @@
+from typing import Dict, Optional
+import re
+
+# 완결된 문장의 끝: 문장부호(+닫는 따옴표) 뒤 공백 또는 텍스트 끝 (3.6% 같은 소수점 제외)
+_SENTENCE_END = re.compile(r'[.?!](?![0-9])["\'”’)]?(?=\s|$)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def cut_at_sentence_boundary(text: str) -> str:
+    """마지막으로 완결된 문장까지만 남깁니다. 완결된 문장이 없으면 원문을 반환합니다."""
+    last_end = None
+    for match in _SENTENCE_END.finditer(text):
+        last_end = match.end()
+    return text[:last_end].rstrip() if last_end else text.rstrip()
+
+
+class DegenerationMonitor:
+    """디코딩 중 출력 스트림을 감시해 반복·루프·과도한 길이를 감지하는 모니터
+
+    feed()가 중단 사유를 반환하면 백엔드는 생성을 멈추고, truncate()로
+    퇴행이 시작되기 전의 마지막 완결 문장까지만 남긴다.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None, ngram_chars: int = 32, max_ngram_repeats: int = 3,
+                 min_sentence_chars: int = 12):
+        self.max_chars = max_chars
+        self.ngram_chars = ngram_chars
+        self.max_ngram_repeats = max_ngram_repeats
+        self.min_sentence_chars = min_sentence_chars
+
+        self.text = ""
+        self.stop_reason = ""
+        self._cut_at = None           # 퇴행이 시작된 위치
+        self._ngram_pos = 0           # 다음에 확인할 n-gram 끝 위치
+        self._ngrams: Dict[str, int] = {}
+        self._sentence_start = 0
+        self._sentences = set()
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """새로 생성된 텍스트를 받아 퇴행이 감지되면 사유를 반환합니다."""
+        if self.stop_reason:
+            return self.stop_reason
+        self.text += chunk
+
+        reason = self._check_ngrams() or self._check_sentences() or self._check_length()
+        if reason:
+            self.stop_reason = reason
+            print(f"🛑 생성 조기 중단: {reason} ({len(self.text)}자 시점)")
+        return reason or None
+
+    def _check_ngrams(self) -> str:
+        # 같은 n글자 조각이 여러 번 나오면 반복 루프로 판단
+        n = self.ngram_chars
+        for end in range(max(self._ngram_pos, n), len(self.text) + 1):
+            gram = _WHITESPACE.sub(" ", self.text[end - n:end])
+            count = self._ngrams.get(gram, 0) + 1
+            self._ngrams[gram] = count
+            if count >= self.max_ngram_repeats:
+                self._ngram_pos = len(self.text) + 1
+                self._cut_at = end - n
+                return "ngram_repeat"
+        self._ngram_pos = len(self.text) + 1
+        return ""
+
+    def _check_sentences(self) -> str:
+        # 완결된 문장이 이전 문장과 똑같으면 문장 루프로 판단
+        for match in _SENTENCE_END.finditer(self.text, self._sentence_start):
+            if match.end() == len(self.text):
+                break  # 뒤에 공백이 와야 문장이 끝난 것으로 확정
+            sentence = _WHITESPACE.sub(" ", self.text[self._sentence_start:match.end()]).strip()
+            start = self._sentence_start
+            self._sentence_start = match.end()
+            if len(sentence) < self.min_sentence_chars:
+                continue
+            if sentence in self._sentences:
+                self._cut_at = start
+                return "sentence_loop"
+            self._sentences.add(sentence)
+        return ""
+
+    def _check_length(self) -> str:
+        if self.max_chars and len(self.text) >= self.max_chars:
+            return "max_length"
+        return ""
+
+    def truncate(self, text: Optional[str] = None) -> str:
+        """퇴행 시작 전까지 자르고 마지막 완결 문장 경계에서 끝냅니다."""
+        text = self.text if text is None else text
+        if self._cut_at is not None:
+            text = text[:self._cut_at]
+        return cut_at_sentence_boundary(text)
@@ -0,0 +1,69 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+import json
+
+
+@dataclass
+class OutputConstraint:
+    """llama.cpp 디코딩 제약 (GBNF 문법 또는 JSON 스키마 중 하나)"""
+    name: str
+    grammar: Optional[str] = None
+    json_schema: Optional[Dict] = None
+    prose: bool = False  # 자유 서술형 출력 (스트리밍 퇴행 감시 대상)
+
+    def __post_init__(self):
+        if (self.grammar is None) == (self.json_schema is None):
+            raise ValueError("grammar와 json_schema 중 정확히 하나만 지정해야 합니다.")
+
+    def to_cli_args(self, grammar_file: Optional[str] = None) -> list:
+        """llama-cli 인자로 변환합니다. GBNF 문법은 파일 경로로 전달합니다."""
+        if self.grammar is not None:
+            if not grammar_file:
+                raise ValueError("GBNF 문법에는 grammar_file 경로가 필요합니다.")
+            return ["--grammar-file", grammar_file]
+        return ["--json-schema", json.dumps(self.json_schema, ensure_ascii=False)]
+
+
+# 모순 판정: 정확히 YES 또는 NO 한 단어
+YES_NO = OutputConstraint(
+    name="yes_no",
+    grammar='root ::= "YES" | "NO"\n',
+)
+
+# 핵심 주제: 짧은 문자열 정확히 3개로 이루어진 JSON 배열
+KEY_TOPICS = OutputConstraint(
+    name="key_topics",
+    json_schema={
+        "type": "array",
+        "items": {"type": "string", "minLength": 1, "maxLength": 20},
+        "minItems": 3,
+        "maxItems": 3,
+    },
+)
+
+# 발언 요약: 줄바꿈 없는 한 줄 (100자 근처)
+SHORT_SUMMARY = OutputConstraint(
+    name="short_summary",
+    grammar='root ::= [^\\n\\r<]{10,150}\n',
+)
+
+# 토론 발언: 줄바꿈·불릿 없는 한 단락, 번호·괄호·제목·태그로 시작 불가
+SINGLE_PARAGRAPH = OutputConstraint(
+    name="single_paragraph",
+    prose=True,
+    grammar=(
+        'root ::= lead [^\\n\\r•]*\n'
+        'lead ::= [^\\n\\r \\t0-9#*<(\\[•·–—①-⑳"\'-]\n'
+    ),
+)
+
+# 부분 수정용 한 문장: 문장부호로 끝나며 소수점(3.6% 등)은 허용
+SINGLE_SENTENCE = OutputConstraint(
+    name="single_sentence",
+    prose=True,
+    grammar=(
+        'root ::= lead body [.?!]\n'
+        'lead ::= [^\\n\\r \\t.?!#*<(\\[•·–—①-⑳-]\n'
+        'body ::= ([^\\n\\r.?!•] | "." [0-9])*\n'
+    ),
+)
@@ -0,0 +1,76 @@
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Optional
+import json
+import os
+import platform
+
+DEFAULT_HARDWARE_PROFILE_PATH = "data/hardware_profile.json"
+
+# 튜닝 대상 ModelProfile 필드
+TUNED_FIELDS = ("threads", "threads_batch", "batch_size", "ubatch_size", "mlock", "mmap")
+
+
+def host_signature() -> Dict:
+    """프로필이 측정된 머신을 식별하는 정보"""
+    return {
+        "hostname": platform.node(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count() or 1,
+    }
+
+
+@dataclass
+class HardwareProfile:
+    """`main.py tune`이 현재 머신에서 측정한 llama.cpp 실행 설정"""
+    settings: Dict
+    host: Dict = field(default_factory=host_signature)
+    model: str = ""
+    measurements: Dict = field(default_factory=dict)
+    created_at: str = ""
+
+    def matches_host(self) -> bool:
+        current = host_signature()
+        return all(self.host.get(key) == value for key, value in current.items())
+
+    def matches_model(self, model_path: str) -> bool:
+        """측정에 쓴 모델 파일과 같은 모델인지 (모델 기록이 없는 예전 프로필은 모두 허용)"""
+        return not self.model or os.path.basename(model_path) == self.model
+
+    def apply(self, model_profile) -> None:
+        """ModelProfile에 튜닝된 설정을 덮어씁니다."""
+        for name in TUNED_FIELDS:
+            if name in self.settings:
+                setattr(model_profile, name, self.settings[name])
+
+    def describe(self) -> str:
+        parts = [f"{name}={self.settings[name]}" for name in TUNED_FIELDS if name in self.settings]
+        return ", ".join(parts)
+
+    def save(self, path: str = DEFAULT_HARDWARE_PROFILE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "HardwareProfile":
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(**data)
+
+
+def load_hardware_profile(path: Optional[str] = DEFAULT_HARDWARE_PROFILE_PATH) -> Optional[HardwareProfile]:
+    """현재 머신에서 측정된 프로필이 있으면 반환합니다 (다른 머신의 프로필은 무시)."""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        profile = HardwareProfile.load(path)
+    except Exception as e:
+        print(f"⚠️ 하드웨어 프로필 로드 실패: {e}")
+        return None
+    if not profile.matches_host():
+        print(f"⚠️ 다른 머신에서 측정된 하드웨어 프로필입니다 ({profile.host.get('hostname')}) - "
+              f"`python main.py tune`으로 다시 측정하세요")
+        return None
+    return profile
@@ -0,0 +1,457 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+import codecs
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from .grammars import OutputConstraint
+from .degeneration import DegenerationMonitor
+from .output_budget import OutputBudgetPolicy
+from .hardware_profile import load_hardware_profile, DEFAULT_HARDWARE_PROFILE_PATH
+from .telemetry import InferenceTelemetry
+from utils.resource_governor import ResourceGovernor
+
+DEFAULT_MODEL_PATH = 'C:/Users/User/Documents/EXAONE-4.0-32B-Q4_K_M.gguf'
+DEFAULT_LLAMA_CLI_PATH = "C:/Users/User/LLM-Debate/llama.cpp/build/bin/Release/llama-cli.exe"
+
+# 모델 티어: 유틸리티(소형 모델) / 메인(32B)
+TIER_UTILITY = "utility"
+TIER_MAIN = "main"
+
+# 호출 지점(task)별 티어 매핑 - 목록에 없는 task는 메인 티어로 처리
+TASK_TIERS = {
+    "statement_summary": TIER_UTILITY,    # 발언 핵심 논점 요약
+    "contradiction_check": TIER_UTILITY,  # 모순 여부 YES/NO
+    "topic_extraction": TIER_UTILITY,     # 핵심 주제 3개
+    "debate_speech": TIER_MAIN,           # 토론자 발언
+    "sentence_repair": TIER_MAIN,         # 근거 중복 문장 부분 재작성
+    "moderation": TIER_MAIN,              # 사회자 발언
+    "round_summary": TIER_UTILITY,        # 라운드별 부분 요약 (계층적 토론 요약의 중간 단계)
+    "debate_summary": TIER_MAIN,          # 토론 요약
+}
+
+
+@dataclass
+class ModelProfile:
+    """llama-cli 실행에 사용할 모델 설정"""
+    name: str
+    model_path: str
+    llama_cli_path: str = DEFAULT_LLAMA_CLI_PATH
+    ctx_size: int = 2048
+    threads: int = 4
+    # 하드웨어 튜닝 값 (None이면 llama.cpp 기본값, `main.py tune`이 측정해 채움)
+    threads_batch: Optional[int] = None
+    batch_size: Optional[int] = None
+    ubatch_size: Optional[int] = None
+    mlock: bool = False
+    mmap: bool = True
+    temperature: float = 0.7
+    top_p: float = 0.9
+    repeat_penalty: float = 1.1
+    seed: int = 42
+    # 추측 디코딩: 같은 토크나이저를 쓰는 소형 초안 모델 (지정 시 llama-speculative로 실행)
+    draft_model_path: Optional[str] = None
+    draft_max: int = 16
+    draft_min: int = 1
+    draft_p_min: float = 0.75
+
+    @property
+    def speculative_cli_path(self) -> str:
+        """llama-cli와 같은 빌드 폴더의 llama-speculative 실행 파일 경로"""
+        directory, filename = os.path.split(self.llama_cli_path)
+        return os.path.join(directory, filename.replace("llama-cli", "llama-speculative"))
+
+
+# llama.cpp가 stderr에 출력하는 성능 통계
+_EVAL_TIMING = re.compile(r'eval time\s*=\s*([\d.]+) ms /\s*(\d+) (?:runs|tokens).*?([\d.]+) tokens per second')
+_LOAD_TIMING = re.compile(r'load time\s*=\s*([\d.]+) ms')
+_SPEC_ENCODED = re.compile(r'encoded\s+(\d+) tokens in\s+([\d.]+) seconds, speed:\s+([\d.]+) t/s')
+_SPEC_DECODED = re.compile(r'decoded\s+(\d+) tokens in\s+([\d.]+) seconds, speed:\s+([\d.]+) t/s')
+_SPEC_DRAFTED = re.compile(r'n_drafted\s*=\s*(\d+)')
+_SPEC_ACCEPT = re.compile(r'n_accept\s*=\s*(\d+)')
+
+
+def parse_timings(stderr: str) -> Dict:
+    """llama-cli/llama-speculative 로그에서 모델 로드 시간, 프롬프트 처리(prefill)와 생성(decode)의
+    토큰 수·시간·초당 토큰, 초안 채택 수를 추출합니다."""
+    stderr = stderr or ""
+    timings = {}
+    load = _LOAD_TIMING.search(stderr)
+    if load:
+        timings["load_ms"] = float(load.group(1))
+    encoded = _SPEC_ENCODED.search(stderr)
+    decoded = _SPEC_DECODED.search(stderr)
+    if encoded:
+        timings["prompt_tokens"] = int(encoded.group(1))
+        timings["prompt_ms"] = float(encoded.group(2)) * 1000
+        timings["prompt_tokens_per_second"] = float(encoded.group(3))
+    if decoded:
+        timings["eval_tokens"] = int(decoded.group(1))
+        timings["eval_ms"] = float(decoded.group(2)) * 1000
+        timings["tokens_per_second"] = float(decoded.group(3))
+    if not (encoded or decoded):
+        # "prompt eval time" 줄은 prefill, 나머지 "eval time" 줄은 decode
+        for match in _EVAL_TIMING.finditer(stderr):
+            line_start = stderr.rfind("\n", 0, match.start()) + 1
+            prefix = "prompt_" if "prompt" in stderr[line_start:match.start()] else ""
+            timings[f"{prefix}tokens" if prefix else "eval_tokens"] = int(match.group(2))
+            timings[f"{prefix}ms" if prefix else "eval_ms"] = float(match.group(1))
+            timings[f"{prefix}tokens_per_second"] = float(match.group(3))
+
+    drafted = _SPEC_DRAFTED.search(stderr)
+    accepted = _SPEC_ACCEPT.search(stderr)
+    if drafted and accepted:
+        timings["n_drafted"] = int(drafted.group(1))
+        timings["n_accept"] = int(accepted.group(1))
+        timings["accept_rate"] = timings["n_accept"] / timings["n_drafted"] if timings["n_drafted"] else 0.0
+    return timings
+
+
+@dataclass
+class GenerationResult:
+    """백엔드 한 번 호출의 결과"""
+    text: str
+    ok: bool
+    elapsed: float = 0.0
+    error: str = ""
+    stop_reason: str = ""  # 퇴행 감지로 조기 중단된 경우 사유
+    timings: Dict = field(default_factory=dict)  # parse_timings() 결과
+    queue_ms: float = 0.0  # 호출부터 llama-cli 실행까지 걸린 시간
+    cached: bool = False  # 체크포인트에 저장된 응답을 재사용해 실제 생성을 하지 않은 경우
+
+
+class LlamaCliBackend:
+    """llama-cli 서브프로세스로 텍스트를 생성하는 백엔드
+
+    governor가 있으면 생성 구간을 알려 임베딩 배치와 겹치지 않게 하고,
+    llama-cli 프로세스를 생성기 코어에 고정한다.
+    """
+
+    requires_model_files = True
+
+    def __init__(self, governor: Optional[ResourceGovernor] = None):
+        self.governor = governor
+
+    def generate(self, profile: ModelProfile, input_text: str, max_tokens: int,
+                 constraint: Optional[OutputConstraint] = None,
+                 monitor: Optional[DegenerationMonitor] = None) -> GenerationResult:
+        start = time.perf_counter()
+
+        # 임시 파일에 입력 저장 (UTF-8 인코딩 명시)
+        temp_files = []
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
+            f.write(input_text)
+            input_file = f.name
+        temp_files.append(input_file)
+
+        try:
+            command = self._build_command(profile, input_file, max_tokens)
+
+            # 디코딩 제약: GBNF 문법은 파일로, JSON 스키마는 인자로 전달
+            if constraint is not None:
+                grammar_file = None
+                if constraint.grammar is not None:
+                    with tempfile.NamedTemporaryFile(mode='w', suffix='.gbnf', delete=False, encoding='utf-8') as g:
+                        g.write(constraint.grammar)
+                        grammar_file = g.name
+                    temp_files.append(grammar_file)
+                command += constraint.to_cli_args(grammar_file)
+
+            # 출력을 스트리밍으로 읽으며 퇴행을 감시 (타임아웃 없음)
+            # llama-speculative는 프롬프트를 먼저 출력하므로 그 뒤부터를 응답으로 취급
+            prompt_echo = input_text if profile.draft_model_path else None
+            queue_ms = (time.perf_counter() - start) * 1000
+            if self.governor is not None:
+                with self.governor.generation():
+                    returncode, stdout, stderr, stop_reason = self._run_streaming(command, monitor, prompt_echo)
+            else:
+                returncode, stdout, stderr, stop_reason = self._run_streaming(command, monitor, prompt_echo)
+
+            if returncode != 0 and not stop_reason:
+                error_msg = "실행 오류"
+                if stderr:
+                    try:
+                        error_msg = stderr[:100]  # 오류 메시지 길이 제한
+                    except:
+                        error_msg = "인코딩 오류로 읽을 수 없음"
+
+                print(f"llama-cli 실행 오류: {error_msg}")
+                return GenerationResult("응답을 생성할 수 없습니다.", False,
+                                        time.perf_counter() - start, error_msg)
+
+            # 응답 추출 (안전하게)
+            output = ""
+            if stdout:
+                try:
+                    # _cut_at은 원문 기준 위치이므로 strip 전에 잘라야 합니다
+                    output = monitor.truncate(stdout) if monitor is not None else stdout
+                    output = output.strip()
+                    print(f"✅ 응답 생성 완료: {len(output)}자 ({profile.name})")
+                except Exception as e:
+                    print(f"⚠️ 출력 읽기 오류: {e}")
+                    return GenerationResult("출력 읽기 실패", False,
+                                            time.perf_counter() - start, str(e))
+
+            if not output:
+                return GenerationResult("빈 응답이 반환되었습니다.", False,
+                                        time.perf_counter() - start, "empty output")
+            return GenerationResult(output, True, time.perf_counter() - start, stop_reason=stop_reason,
+                                    timings=parse_timings(stderr), queue_ms=queue_ms)
+
+        except Exception as e:
+            print(f"subprocess 오류: {e}")
+            return GenerationResult("실행 중 오류가 발생했습니다.", False,
+                                    time.perf_counter() - start, str(e))
+        finally:
+            # 임시 파일 삭제
+            for path in temp_files:
+                try:
+                    if os.path.exists(path):
+                        os.unlink(path)
+                except:
+                    pass  # 삭제 실패해도 계속
+
+    def _run_streaming(self, command: list, monitor: Optional[DegenerationMonitor], prompt_echo: Optional[str] = None):
+        """llama-cli를 실행해 stdout을 조각 단위로 읽고, 모니터가 퇴행을 알리면 프로세스를 중단합니다.
+
+        prompt_echo가 주어지면 stdout에서 그 프롬프트가 끝난 뒤의 텍스트만 응답으로 취급합니다.
+        """
+        # 리눅스에서는 exec 전에 생성기 코어로 옮겨 llama-cli의 모든 스레드가 처음부터 그 코어에서 돎
+        preexec = self.governor.generator_preexec() if self.governor is not None else None
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            preexec_fn=preexec,
+            # Windows에서 창 숨기기 및 인코딩 문제 방지
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+        if self.governor is not None and preexec is None:
+            self.governor.pin_generator(process.pid)
+
+        # stderr(로딩 로그, 성능 통계)는 파이프가 막히지 않도록 별도 스레드에서 수집
+        stderr_chunks = []
+        stderr_thread = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+        stderr_thread.start()
+
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        # 토큰 단위 재출력으로 공백이 달라질 수 있어 공백을 무시하고 프롬프트 끝부분을 찾음
+        echo_tail = None
+        if prompt_echo:
+            tail_chars = re.sub(r'\s+', '', prompt_echo)[-40:]
+            echo_tail = re.compile(r'\s*'.join(re.escape(c) for c in tail_chars))
+        echo_buffer = ""
+        stdout_parts = []
+        stop_reason = ""
+        try:
+            while True:
+                data = process.stdout.read1(4096)
+                if not data:
+                    break
+                text = decoder.decode(data)
+                if echo_tail:
+                    echo_buffer += text
+                    match = echo_tail.search(echo_buffer)
+                    if not match:
+                        continue
+                    text = echo_buffer[match.end():]
+                    echo_tail = None
+                stdout_parts.append(text)
+                if monitor is not None and text and monitor.feed(text):
+                    stop_reason = monitor.stop_reason
+                    process.kill()
+                    break
+        finally:
+            tail = decoder.decode(b"", final=True)
+            # 프롬프트 위치를 끝내 찾지 못하면 전체 출력을 그대로 사용
+            stdout_parts.append(echo_buffer + tail if echo_tail else tail)
+            process.wait()
+            stderr_thread.join()
+
+        stderr = b"".join(stderr_chunks).decode('utf-8', errors='ignore')
+        return process.returncode, "".join(stdout_parts), stderr, stop_reason
+
+    def _build_command(self, profile: ModelProfile, input_file: str, max_tokens: int) -> list:
+        if profile.draft_model_path:
+            # 추측 디코딩: 초안 모델이 토큰을 제안하고 32B 모델이 한 번에 검증
+            # (llama-speculative는 -no-cnv/--no-display-prompt를 지원하지 않음)
+            return [
+                profile.speculative_cli_path,
+                "-m", profile.model_path,
+                "-md", profile.draft_model_path,
+                "--draft-max", str(profile.draft_max),
+                "--draft-min", str(profile.draft_min),
+                "--draft-p-min", str(profile.draft_p_min),
+                "-f", input_file,
+                "-n", str(max_tokens),
+                "-c", str(profile.ctx_size),
+                "--temp", str(profile.temperature),
+                "--top-p", str(profile.top_p),
+                "--repeat-penalty", str(profile.repeat_penalty),
+                "--seed", str(profile.seed),
+            ] + self._perf_args(profile)
+        return [
+            profile.llama_cli_path,
+            "-m", profile.model_path,
+            "-f", input_file,
+            "-n", str(max_tokens),
+            "-c", str(profile.ctx_size),
+            "--temp", str(profile.temperature),
+            "--top-p", str(profile.top_p),
+            "--repeat-penalty", str(profile.repeat_penalty),
+            "-no-cnv",
+            "--no-display-prompt",  # 생성된 부분만 출력
+            "--seed", str(profile.seed),
+        ] + self._perf_args(profile)
+
+    def _perf_args(self, profile: ModelProfile) -> list:
+        """스레드·배치·메모리 매핑 인자 (하드웨어 프로필로 조정, 생성기 코어 수 이내로 제한)"""
+        limit = self.governor.generator_threads if self.governor is not None else (lambda n: n)
+        args = ["-t", str(limit(profile.threads))]
+        if profile.threads_batch:
+            args += ["-tb", str(limit(profile.threads_batch))]
+        if profile.batch_size:
+            args += ["-b", str(profile.batch_size)]
+        if profile.ubatch_size:
+            args += ["-ub", str(profile.ubatch_size)]
+        if profile.mlock:
+            args.append("--mlock")
+        if not profile.mmap:
+            args.append("--no-mmap")
+        return args
+
+
+class ModelRouter:
+    """호출 지점이 선언한 작업 유형(task)에 따라 모델 프로필을 골라 생성하는 라우터
+
+    유틸리티 작업(요약, 모순 판정, 주제 추출 등)은 소형 모델로, 토론 발언과
+    요약은 32B 모델로 보낸다. 유틸리티 프로필이 없으면 모두 메인 모델을 쓴다.
+    출력 길이 예산 정책(output_budget)과 텔레메트리도 라우터를 공유하는 에이전트들이 함께 쓴다.
+    """
+
+    def __init__(self, profiles: Dict[str, ModelProfile], backend: Optional[LlamaCliBackend] = None,
+                 task_tiers: Optional[Dict[str, str]] = None, output_budget: Optional[OutputBudgetPolicy] = None,
+                 telemetry: Optional[InferenceTelemetry] = None):
+        if TIER_MAIN not in profiles:
+            raise ValueError(f"'{TIER_MAIN}' 티어 프로필이 필요합니다.")
+
+        self.profiles = dict(profiles)
+        # 기본 백엔드는 프로세스 공유 자원 관리자와 함께 동작 (RAGSystem 임베딩과 조정)
+        self.backend = backend or LlamaCliBackend(ResourceGovernor.shared())
+        self.task_tiers = dict(TASK_TIERS)
+        if task_tiers:
+            self.task_tiers.update(task_tiers)
+        self.stats = {tier: self._empty_stats() for tier in self.profiles}
+        self.output_budget = output_budget or OutputBudgetPolicy()
+        # 호출별 지표 기록 (None이면 기록하지 않음)
+        self.telemetry = telemetry
+
+    @classmethod
+    def from_paths(cls, model_path: str = DEFAULT_MODEL_PATH, utility_model_path: Optional[str] = None,
+                   llama_cli_path: str = DEFAULT_LLAMA_CLI_PATH, draft_model_path: Optional[str] = None,
+                   hardware_profile_path: Optional[str] = DEFAULT_HARDWARE_PROFILE_PATH,
+                   **kwargs) -> "ModelRouter":
+        """메인 모델 경로와 (선택) 유틸리티·초안 모델 경로로 라우터를 구성합니다.
+
+        draft_model_path는 메인 티어에만 적용되어 32B 생성을 추측 디코딩으로 가속합니다.
+        hardware_profile_path에 현재 머신의 튜닝 결과가 있으면 측정한 모델과 같은 모델 파일을 쓰는 티어에 적용합니다.
+        """
+        profiles = {
+            TIER_MAIN: ModelProfile(name=os.path.basename(model_path), model_path=model_path,
+                                    llama_cli_path=llama_cli_path)
+        }
+
+        if draft_model_path:
+            if os.path.exists(draft_model_path):
+                profiles[TIER_MAIN].draft_model_path = draft_model_path
+            else:
+                print(f"⚠️ 초안 모델을 찾을 수 없습니다: {draft_model_path} - 추측 디코딩 비활성화")
+
+        if utility_model_path:
+            if os.path.exists(utility_model_path):
+                profiles[TIER_UTILITY] = ModelProfile(
+                    name=os.path.basename(utility_model_path),
+                    model_path=utility_model_path,
+                    llama_cli_path=llama_cli_path,
+                )
+            else:
+                print(f"⚠️ 유틸리티 모델을 찾을 수 없습니다: {utility_model_path} - 메인 모델 사용")
+
+        hardware = load_hardware_profile(hardware_profile_path)
+        if hardware:
+            # 스레드·배치 최적값은 모델 크기에 따라 달라 측정한 모델의 티어에만 적용
+            for tier, profile in profiles.items():
+                if hardware.matches_model(profile.model_path):
+                    hardware.apply(profile)
+                    print(f"🖥️ 하드웨어 프로필 적용 ({tier}): {hardware.describe()}")
+                else:
+                    print(f"⚠️ 하드웨어 프로필은 {hardware.model}로 측정되어 {tier} 티어({profile.name})에는 "
+                          f"적용하지 않습니다 (기본 실행 설정 사용)")
+
+        return cls(profiles, **kwargs)
+
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {"calls": 0, "cached": 0, "failures": 0, "total_time": 0.0, "max_time": 0.0,
+                "drafted": 0, "accepted": 0}
+
+    def resolve(self, task: str) -> Tuple[str, ModelProfile]:
+        """task에 해당하는 (티어, 프로필)을 반환합니다."""
+        tier = self.task_tiers.get(task, TIER_MAIN)
+        if tier not in self.profiles:
+            tier = TIER_MAIN
+        return tier, self.profiles[tier]
+
+    def generate(self, task: str, input_text: str, max_tokens: int,
+                 constraint: Optional[OutputConstraint] = None,
+                 monitor: Optional[DegenerationMonitor] = None) -> GenerationResult:
+        tier, profile = self.resolve(task)
+        print(f"🧭 모델 라우팅: {task} → {tier} ({profile.name})")
+
+        result = self.backend.generate(profile, input_text, max_tokens, constraint, monitor)
+
+        stats = self.stats.setdefault(tier, self._empty_stats())
+        if result.cached:
+            # 재사용한 응답은 지연 통계를 0초로 끌어내리지 않도록 따로 셈
+            stats["cached"] += 1
+            return result
+        stats["calls"] += 1
+        stats["total_time"] += result.elapsed
+        stats["max_time"] = max(stats["max_time"], result.elapsed)
+        if not result.ok:
+            stats["failures"] += 1
+        stats["drafted"] += result.timings.get("n_drafted", 0)
+        stats["accepted"] += result.timings.get("n_accept", 0)
+
+        return result
+
+    def get_stats(self) -> Dict:
+        """티어별 호출 수와 지연 시간 통계를 반환합니다."""
+        report = {}
+        for tier, stats in self.stats.items():
+            calls = stats["calls"]
+            report[tier] = {
+                "model": self.profiles[tier].name,
+                "calls": calls,
+                "cached": stats["cached"],
+                "failures": stats["failures"],
+                "total_time": round(stats["total_time"], 3),
+                "avg_time": round(stats["total_time"] / calls, 3) if calls else 0.0,
+                "max_time": round(stats["max_time"], 3),
+            }
+            if stats["drafted"]:
+                report[tier]["draft_accept_rate"] = round(stats["accepted"] / stats["drafted"], 3)
+        return report
+
+    def print_stats(self):
+        print(f"\n🧭 모델 티어별 호출 통계:")
+        for tier, stats in self.get_stats().items():
+            print(f"  {tier} ({stats['model']}): {stats['calls']}회, "
+                  f"평균 {stats['avg_time']:.1f}초, 최대 {stats['max_time']:.1f}초, "
+                  f"총 {stats['total_time']:.1f}초"
+                  + (f", 체크포인트 재사용 {stats['cached']}회" if stats['cached'] else ""))
+            if "draft_accept_rate" in stats:
+                print(f"    추측 디코딩 초안 채택률: {stats['draft_accept_rate']:.1%}")
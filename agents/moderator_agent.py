@@ -1,9 +1,11 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from .base_agent import BaseAgent
+from .llm_backend import ModelRouter, DEFAULT_MODEL_PATH
+from .grammars import SINGLE_PARAGRAPH
 
 class ModeratorAgent(BaseAgent):
-    def __init__(self, model_path: str = 'C:/Users/User/Documents/EXAONE-4.0-32B-Q4_K_M.gguf'):
-        super().__init__(model_path)
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, router: Optional[ModelRouter] = None):
+        super().__init__(model_path, router)
         self.system_prompt = """너는 중립적 토론 사회자다. 다음과 같은 특징을 가져라:
 
 사회자 말투:
@@ -48,9 +50,9 @@ class ModeratorAgent(BaseAgent):
 
 시청자 여러분께 정중한 인사를 드리고, 오늘 토론의 의미와 중요성을 자연스럽게 설명한 뒤, 주제를 소개하고 양측 토론자들에 대한 격려와 함께 공정한 진행을 약속하며 토론 시작을 선언하라. 
 
-형식 제한: 목록·숫자·괄호 시작·하이픈·불릿·이모지·제목을 절대 사용하지 말고, 자연스러운 하나의 단락으로 작성하라. 발화자의 발언만 출력하라."""
+형식 제한: 발화자의 발언만 출력하라."""
 
-        return self.generate_response(prompt)
+        return self.generate_response(prompt, task="moderation", constraint=SINGLE_PARAGRAPH)
 
     def _conclude_debate(self, statements: List[Dict]) -> str:
         # 양측 주장 요약
@@ -69,6 +71,6 @@ class ModeratorAgent(BaseAgent):
 
 양측 토론자들의 열띤 토론에 감사 인사를 전하고, 토론 과정에서 나타난 다양한 관점과 정책 대안들의 가치를 인정하며, 시청하신 국민 여러분께서 오늘 토론을 통해 얻은 정보를 바탕으로 현명한 판단을 내리시기를 당부한 뒤, 양측 토론자들과 시청자들에게 정중한 마무리 인사를 전하라.
 
-형식 제한: 목록·숫자·괄호 시작·하이픈·불릿·이모지·제목을 절대 사용하지 말고, 자연스럽고 따뜻한 하나의 단락으로 작성하라. 발화자의 발언만 출력하라."""
+형식 제한: 자연스럽고 따뜻한 어조로 발화자의 발언만 출력하라."""
 
-        return self.generate_response(prompt)
\ No newline at end of file
+        return self.generate_response(prompt, task="moderation", constraint=SINGLE_PARAGRAPH)
\ No newline at end of file
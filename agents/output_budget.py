@@ -0,0 +1,127 @@
+from typing import Dict, List, Optional
+import json
+import math
+import os
+
+DEFAULT_OUTPUT_STATS_PATH = "data/output_length_stats.json"
+
+# 출력 형식별 최대 생성 토큰 상한 (관측 데이터가 부족할 때 사용)
+OUTPUT_FORMS = {
+    "예/아니오": 4,       # YES/NO 한 단어
+    "주제 목록": 48,      # 20자 이하 문자열 3개 JSON 배열
+    "100자 요약": 120,    # 한 줄 요약 (문법상 최대 150자)
+    "한 문장": 128,       # 부분 수정용 한 문장
+    "2-3문장": 240,       # 라운드별 부분 요약
+    "3-4문장": 320,       # 간단한 토론 요약
+    "한 단락": 600,       # 사회자 발언
+    "토론 발언": 800,     # 진보/보수 발언 한 단락
+    "상세하게": 1000,     # 토론 평가 등 긴 분석
+}
+
+# 호출 지점(task)별 기본 출력 형식
+TASK_OUTPUT_FORMS = {
+    "contradiction_check": "예/아니오",
+    "topic_extraction": "주제 목록",
+    "statement_summary": "100자 요약",
+    "sentence_repair": "한 문장",
+    "moderation": "한 단락",
+    "debate_speech": "토론 발언",
+    "round_summary": "2-3문장",
+    "debate_summary": "상세하게",
+}
+
+
+class OutputBudgetPolicy:
+    """task·출력 형식별 최대 생성 토큰 수를 정하는 정책
+
+    형식별 상한에서 시작해, 관측된 출력 길이 분포(95번째 백분위수)에 여유분을 더한
+    값으로 예산을 줄인다. 한도에 걸려 잘린 출력이 많으면 다시 상한으로 되돌린다.
+    """
+
+    def __init__(self, stats_path: Optional[str] = None, min_samples: int = 5, headroom: float = 1.3,
+                 truncation_limit: float = 0.1, max_samples: int = 200):
+        self.stats_path = stats_path
+        self.min_samples = min_samples
+        self.headroom = headroom
+        self.truncation_limit = truncation_limit
+        self.max_samples = max_samples
+        # "task/형식" → {"lengths": [...], "truncated": 잘린 횟수}
+        self.stats: Dict[str, Dict] = {}
+        if stats_path and os.path.exists(stats_path):
+            self.load(stats_path)
+
+    @staticmethod
+    def _key(task: str, form: str) -> str:
+        return f"{task}/{form}"
+
+    def resolve_form(self, task: str, target_length: Optional[str] = None) -> str:
+        """target_length가 알려진 형식이면 그대로, 아니면 task의 기본 형식을 반환합니다."""
+        if target_length in OUTPUT_FORMS:
+            return target_length
+        return TASK_OUTPUT_FORMS.get(task, "상세하게")
+
+    def max_tokens(self, task: str, target_length: Optional[str] = None) -> int:
+        """task와 요청 형식에 맞는 최대 생성 토큰 수를 반환합니다."""
+        form = self.resolve_form(task, target_length)
+        ceiling = OUTPUT_FORMS[form]
+        entry = self.stats.get(self._key(task, form))
+        if not entry or len(entry["lengths"]) < self.min_samples:
+            return ceiling
+
+        lengths = entry["lengths"]
+        if entry["truncated"] / len(lengths) > self.truncation_limit:
+            return ceiling
+
+        p95 = sorted(lengths)[min(len(lengths) - 1, int(math.ceil(len(lengths) * 0.95)) - 1)]
+        return max(1, min(ceiling, int(p95 * self.headroom) + 4))
+
+    def record(self, task: str, target_length: Optional[str], output_tokens: int, truncated: bool = False):
+        """실제 출력 길이를 기록합니다 (truncated: 토큰 한도에 걸려 잘린 경우)."""
+        form = self.resolve_form(task, target_length)
+        entry = self.stats.setdefault(self._key(task, form), {"lengths": [], "truncated": 0})
+        entry["lengths"].append(int(output_tokens))
+        entry["truncated"] += int(truncated)
+        # 최근 관측치만 유지 (잘림 횟수는 비율에 맞춰 줄임)
+        if len(entry["lengths"]) > self.max_samples:
+            dropped = len(entry["lengths"]) - self.max_samples
+            entry["truncated"] = int(round(entry["truncated"] * self.max_samples / len(entry["lengths"])))
+            entry["lengths"] = entry["lengths"][dropped:]
+
+    def get_stats(self) -> Dict:
+        """task/형식별 관측 수, 평균·p95 길이, 잘림 수, 현재 예산을 반환합니다."""
+        summary = {}
+        for key, entry in self.stats.items():
+            task, form = key.split("/", 1)
+            lengths: List[int] = sorted(entry["lengths"])
+            if not lengths:
+                continue
+            summary[key] = {
+                "samples": len(lengths),
+                "avg_tokens": round(sum(lengths) / len(lengths), 1),
+                "p95_tokens": lengths[min(len(lengths) - 1, int(math.ceil(len(lengths) * 0.95)) - 1)],
+                "truncated": entry["truncated"],
+                "max_tokens": self.max_tokens(task, form),
+            }
+        return summary
+
+    def load(self, path: str):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.stats = json.load(f)
+            print(f"📏 출력 길이 통계 로드: {path} ({len(self.stats)}개 항목)")
+        except Exception as e:
+            print(f"⚠️ 출력 길이 통계 로드 실패: {e}")
+            self.stats = {}
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.stats_path
+        if not path:
+            return
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.stats, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"⚠️ 출력 길이 통계 저장 실패: {e}")
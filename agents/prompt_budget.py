@@ -0,0 +1,203 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+import re
+
+# 문장 경계: 마침표/물음표/느낌표(+닫는 따옴표) 뒤 공백 또는 줄바꿈
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.?!])["\'”’)]?\s+|\n+')
+# "- 본문 (출처: 언론사)" 형태 근거 줄의 출처 꼬리표
+_SOURCE_TAG = re.compile(r'\s*\(출처: [^()]*\)\s*$')
+
+TokenCounter = Callable[[str], int]
+
+
+def split_units(text: str) -> List[str]:
+    """문장/줄 단위로 나눕니다 (구분자는 각 조각 끝에 남김)."""
+    units = []
+    last = 0
+    for match in _SENTENCE_BOUNDARY.finditer(text):
+        units.append(text[last:match.end()])
+        last = match.end()
+    if last < len(text):
+        units.append(text[last:])
+    return [unit for unit in units if unit.strip()]
+
+
+def trim_to_budget(text: str, budget: int, count_tokens: TokenCounter) -> str:
+    """뒤쪽 문장부터 잘라 budget 토큰 이하로 줄입니다."""
+    if budget <= 0:
+        return ""
+    if count_tokens(text) <= budget:
+        return text
+
+    kept = ""
+    for unit in split_units(text):
+        if count_tokens(kept + unit) > budget:
+            break
+        kept += unit
+
+    if not kept:
+        # 첫 문장부터 예산을 넘으면 글자 단위로 자름
+        kept = text
+        while kept and count_tokens(kept) > budget:
+            kept = kept[:int(len(kept) * 0.8)]
+    return kept.rstrip()
+
+
+def trim_tagged_lines(text: str, budget: int, count_tokens: TokenCounter) -> str:
+    """'- 본문 (출처: ...)' 줄 목록을 앞 줄부터 채우고, 잘리는 줄에도 출처 꼬리표를 유지합니다."""
+    if budget <= 0:
+        return ""
+    if count_tokens(text) <= budget:
+        return text
+
+    lines = []
+    used = 0
+    for line in text.split("\n"):
+        line_tokens = count_tokens(line + "\n")
+        if used + line_tokens <= budget:
+            lines.append(line)
+            used += line_tokens
+            continue
+
+        # 남은 예산만큼 본문을 문장 단위로 자르고 꼬리표를 다시 붙임
+        tag_match = _SOURCE_TAG.search(line)
+        tag = tag_match.group(0).strip() if tag_match else ""
+        body = line[:tag_match.start()] if tag_match else line
+        remaining = budget - used - count_tokens(f" {tag}\n")
+        trimmed = trim_to_budget(body, remaining, count_tokens)
+        if trimmed.strip(" -"):
+            lines.append(f"{trimmed} {tag}".rstrip())
+        break
+
+    return "\n".join(lines)
+
+
+@dataclass
+class PromptSection:
+    """프롬프트를 이루는 한 구역
+
+    priority가 0이면 고정 구역으로 자르지 않는다. 숫자가 클수록 먼저 줄인다.
+    fallback_priority는 고정 구역을 최후의 수단으로 줄이는 순서다 (다른 구역과 생성 토큰을
+    모두 줄여도 넘칠 때만, 숫자가 클수록 먼저, 0이면 절대 줄이지 않음).
+    prefix/suffix는 본문이 남아 있을 때만 붙는 머리말/꼬리말이다.
+    """
+    name: str
+    body: str
+    priority: int = 0
+    fallback_priority: int = 0
+    prefix: str = ""
+    suffix: str = ""
+    min_tokens: int = 0
+    trimmer: Optional[Callable[[str, int, TokenCounter], str]] = None
+
+    def render(self, body: Optional[str] = None) -> str:
+        body = self.body if body is None else body
+        if not body:
+            return ""
+        return f"{self.prefix}{body}{self.suffix}"
+
+
+@dataclass
+class PromptBudget:
+    """예산 배분 결과"""
+    prompt: str
+    max_new_tokens: int
+    context_size: int
+    section_tokens: Dict[str, int] = field(default_factory=dict)
+    original_tokens: Dict[str, int] = field(default_factory=dict)
+    # 모든 구역과 생성 토큰을 최소로 줄여도 컨텍스트를 넘는 토큰 수 (0이면 들어맞음)
+    overflow: int = 0
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(self.section_tokens.values())
+
+    def describe(self) -> str:
+        parts = []
+        for name, tokens in self.section_tokens.items():
+            original = self.original_tokens.get(name, tokens)
+            if original != tokens:
+                parts.append(f"{name} {original}→{tokens}")
+            elif tokens:
+                parts.append(f"{name} {tokens}")
+        description = (f"ctx {self.context_size} = 프롬프트 {self.prompt_tokens} "
+                       f"[{', '.join(parts)}] + 생성 {self.max_new_tokens}")
+        if self.overflow > 0:
+            description += f" (⚠️ {self.overflow}토큰 초과)"
+        return description
+
+
+class PromptBudgetBuilder:
+    """컨텍스트 크기에 맞춰 구역별 토큰 예산을 배분하는 프롬프트 조립기
+
+    1) 생성 토큰(max_new_tokens)과 채팅 템플릿 여유분을 먼저 확보하고
+    2) 넘치면 priority가 큰 구역부터 min_tokens까지 줄이며
+    3) 그래도 넘치면 생성 토큰을 min_new_tokens까지 줄이고
+    4) 마지막으로 fallback_priority가 있는 고정 구역(지침 등)을 줄인다.
+    그래도 남는 초과분은 PromptBudget.overflow로 알린다.
+    """
+
+    def __init__(self, count_tokens: TokenCounter, context_size: int = 2048,
+                 max_new_tokens: int = 1000, min_new_tokens: int = 256, template_overhead: int = 32):
+        self.count_tokens = count_tokens
+        self.context_size = context_size
+        self.max_new_tokens = max_new_tokens
+        self.min_new_tokens = min(min_new_tokens, max_new_tokens)
+        self.template_overhead = template_overhead
+
+    def _section_tokens(self, section: PromptSection, body: str) -> int:
+        rendered = section.render(body)
+        return self.count_tokens(rendered) if rendered else 0
+
+    def fit(self, sections: List[PromptSection]) -> PromptBudget:
+        bodies = {s.name: s.body for s in sections}
+        tokens = {s.name: self._section_tokens(s, s.body) for s in sections}
+        original = dict(tokens)
+
+        prompt_limit = self.context_size - self.template_overhead - self.max_new_tokens
+        overflow = sum(tokens.values()) - prompt_limit
+
+        # 덜 중요한 구역부터 줄이기
+        trimmable = sorted((s for s in sections if s.priority > 0), key=lambda s: -s.priority)
+        overflow = self._trim(trimmable, bodies, tokens, overflow)
+
+        # 그래도 넘치면 생성 토큰을 줄임
+        max_new_tokens = self.max_new_tokens
+        if overflow > 0:
+            max_new_tokens = max(self.min_new_tokens, self.max_new_tokens - overflow)
+            overflow -= self.max_new_tokens - max_new_tokens
+
+        # 최후의 수단: 지침 같은 고정 구역을 줄임
+        if overflow > 0:
+            fallback = sorted((s for s in sections if s.priority == 0 and s.fallback_priority > 0),
+                              key=lambda s: -s.fallback_priority)
+            overflow = self._trim(fallback, bodies, tokens, overflow, use_min_tokens=False)
+
+        prompt = "".join(s.render(bodies[s.name]) for s in sections)
+        return PromptBudget(
+            prompt=prompt,
+            max_new_tokens=max_new_tokens,
+            context_size=self.context_size,
+            section_tokens=tokens,
+            original_tokens=original,
+            overflow=max(0, overflow),
+        )
+
+    def _trim(self, sections: List[PromptSection], bodies: Dict[str, str], tokens: Dict[str, int],
+              overflow: int, use_min_tokens: bool = True) -> int:
+        """sections를 순서대로 overflow만큼 줄이고 남은 초과 토큰 수를 반환합니다."""
+        for section in sections:
+            if overflow <= 0:
+                break
+            floor = section.min_tokens if use_min_tokens else 0
+            target = max(floor, tokens[section.name] - overflow)
+            if target >= tokens[section.name]:
+                continue
+            wrapper_tokens = self.count_tokens(section.prefix + section.suffix)
+            trimmer = section.trimmer or trim_to_budget
+            body = trimmer(bodies[section.name], max(0, target - wrapper_tokens), self.count_tokens)
+            bodies[section.name] = body
+            new_tokens = self._section_tokens(section, body)
+            overflow -= tokens[section.name] - new_tokens
+            tokens[section.name] = new_tokens
+        return overflow
@@ -0,0 +1,156 @@
+from typing import Dict, List, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .llm_backend import LlamaCliBackend, ModelProfile, GenerationResult
+from .grammars import OutputConstraint
+from .degeneration import DegenerationMonitor
+
+
+def request_key(profile: ModelProfile, input_text: str, max_tokens: int,
+                constraint: Optional[OutputConstraint] = None) -> str:
+    """(프롬프트, 생성 파라미터)를 식별하는 키 - 경로가 달라도 같은 모델 파일이면 같은 키"""
+    params = [
+        os.path.basename(profile.model_path),
+        str(max_tokens),
+        constraint.name if constraint else "",
+        str(profile.temperature), str(profile.top_p), str(profile.repeat_penalty), str(profile.seed),
+        input_text,
+    ]
+    return hashlib.sha1("\n".join(params).encode('utf-8')).hexdigest()
+
+
+class RecordingBackend:
+    """실제 백엔드를 감싸 (프롬프트, 파라미터) → 응답을 JSONL로 녹화하는 백엔드"""
+
+    def __init__(self, path: str, inner: Optional[LlamaCliBackend] = None):
+        self.path = path
+        self.inner = inner or LlamaCliBackend()
+        self.recorded = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def requires_model_files(self) -> bool:
+        return getattr(self.inner, "requires_model_files", True)
+
+    def generate(self, profile: ModelProfile, input_text: str, max_tokens: int,
+                 constraint: Optional[OutputConstraint] = None,
+                 monitor: Optional[DegenerationMonitor] = None) -> GenerationResult:
+        result = self.inner.generate(profile, input_text, max_tokens, constraint, monitor)
+        entry = {
+            "key": request_key(profile, input_text, max_tokens, constraint),
+            "model": os.path.basename(profile.model_path),
+            "constraint": constraint.name if constraint else "",
+            "max_tokens": max_tokens,
+            "input_text": input_text,
+            "text": result.text,
+            "ok": result.ok,
+            "error": result.error,
+            "stop_reason": result.stop_reason,
+            "elapsed": result.elapsed,
+            "timings": result.timings,
+        }
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.recorded += 1
+        return result
+
+    def get_stats(self) -> Dict:
+        return {"mode": "record", "path": self.path, "recorded": self.recorded}
+
+
+class ReplayBackend:
+    """녹화된 응답을 모델 없이 돌려주는 백엔드 (오프라인 벤치마크·회귀 확인용)
+
+    latency:
+      - "recorded": 녹화 당시 걸린 시간만큼 대기 (speed로 배속 조절)
+      - "none": 대기 없음
+      - "tps:<N>": 응답 길이를 초당 N토큰으로 생성한 것처럼 대기
+      - "<초>": 호출마다 고정 시간 대기
+
+    같은 키가 없으면 같은 제약(constraint)으로 녹화된 응답을 순서대로 대신 쓰고
+    (strict=True면 실패 결과 반환), misses에 세어 둔다.
+    """
+
+    requires_model_files = False
+
+    def __init__(self, path: str, latency: str = "none", speed: float = 1.0, strict: bool = False):
+        self.path = path
+        self.latency = latency
+        self.speed = speed if speed > 0 else 1.0
+        self.strict = strict
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._by_key: Dict[str, List[Dict]] = {}
+        self._by_constraint: Dict[str, List[Dict]] = {}
+        self._cursor: Dict[str, int] = {}
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._by_key.setdefault(entry["key"], []).append(entry)
+                self._by_constraint.setdefault(entry.get("constraint", ""), []).append(entry)
+        print(f"📼 LLM 재생 백엔드: {sum(len(v) for v in self._by_key.values())}개 응답 로드 ({path})")
+
+    def _next(self, pool: List[Dict], cursor_key: str) -> Dict:
+        # 같은 요청이 여러 번 녹화됐으면 녹화 순서대로 돌려주고, 끝나면 처음부터 반복
+        index = self._cursor.get(cursor_key, 0)
+        self._cursor[cursor_key] = index + 1
+        return pool[index % len(pool)]
+
+    def _simulated_delay(self, entry: Dict, text: str) -> float:
+        if self.latency == "none":
+            return 0.0
+        if self.latency == "recorded":
+            return entry.get("elapsed", 0.0) / self.speed
+        if self.latency.startswith("tps:"):
+            tokens = -(-len(text) * 2 // 3)  # 한국어 약 1.5자당 1토큰
+            return tokens / float(self.latency[4:])
+        return float(self.latency)
+
+    def generate(self, profile: ModelProfile, input_text: str, max_tokens: int,
+                 constraint: Optional[OutputConstraint] = None,
+                 monitor: Optional[DegenerationMonitor] = None) -> GenerationResult:
+        key = request_key(profile, input_text, max_tokens, constraint)
+        constraint_name = constraint.name if constraint else ""
+
+        with self._lock:
+            if key in self._by_key:
+                self.hits += 1
+                entry = self._next(self._by_key[key], key)
+            elif not self.strict and self._by_constraint.get(constraint_name):
+                self.misses += 1
+                entry = self._next(self._by_constraint[constraint_name], f"constraint:{constraint_name}")
+            else:
+                self.misses += 1
+                print(f"⚠️ 녹화된 응답 없음 ({constraint_name or '제약 없음'}, {max_tokens}토큰)")
+                return GenerationResult("응답을 생성할 수 없습니다.", False, 0.0, "replay miss")
+
+        text = entry["text"]
+        stop_reason = entry.get("stop_reason", "")
+        # 스트리밍 감시 경로도 그대로 거치도록 모니터에 응답을 흘려 보냄
+        if monitor is not None and entry.get("ok", True):
+            if monitor.feed(text):
+                stop_reason = monitor.stop_reason
+            text = monitor.truncate(text)
+
+        delay = self._simulated_delay(entry, text)
+        if delay > 0:
+            time.sleep(delay)
+
+        return GenerationResult(text, entry.get("ok", True), delay, entry.get("error", ""),
+                                stop_reason=stop_reason, timings=dict(entry.get("timings") or {}))
+
+    def get_stats(self) -> Dict:
+        """녹화와 일치한 요청(hits)과 대체 응답·실패로 처리한 요청(misses) 수"""
+        return {"mode": "replay", "path": self.path, "strict": self.strict, "hits": self.hits, "misses": self.misses}
@@ -1,9 +1,12 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+import hashlib
 from .base_agent import BaseAgent
+from .llm_backend import ModelRouter, DEFAULT_MODEL_PATH
+from .prompt_budget import PromptSection, trim_tagged_lines
 
 class SummaryAgent(BaseAgent):
-    def __init__(self, model_path: str = 'C:/Users/User/Documents/EXAONE-4.0-32B-Q4_K_M.gguf'):
-        super().__init__(model_path)
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, router: Optional[ModelRouter] = None):
+        super().__init__(model_path, router)
         
         # 실제 정치 전문지나 정책연구소의 토론 분석 스타일 반영
         self.system_prompt = """너는 정책 분석 전문가로서 정치토론을 객관적으로 분석하는 역할을 한다. 다음과 같은 특징을 가져라:
@@ -31,6 +34,12 @@ class SummaryAgent(BaseAgent):
 - 자연스러운 문체로 작성하되 구조화된 정보 제공
 - 과도한 기호나 이모지 사용 자제
 - 읽기 쉬운 단락 구성과 명확한 제목 활용"""
+        
+        # 라운드(또는 라운드 구간)별 부분 요약 캐시: "라운드 라벨" → {"digest": 입력 해시, "summary": 요약}
+        # 라운드가 끝날 때마다 한 번만 만들고, 최종 요약은 이 부분 요약들을 모아서 만든다.
+        self.partial_summaries: Dict[str, Dict[str, str]] = {}
+        # 부분 요약이 컨텍스트 예산을 넘으면 이 개수씩 묶어 한 단계 위 요약으로 줄임
+        self.reduce_group_size = 4
 
     def summarize_debate(self, topic: str, statements: List[Dict]) -> str:
         """토론을 간단히 요약합니다."""
@@ -51,32 +60,113 @@ class SummaryAgent(BaseAgent):
         return f"진보 측 {prog_count}회, 보수 측 {cons_count}회 발언"
 
     def generate_brief_summary(self, topic: str, statements: List[Dict]) -> str:
-        """간단한 토론 요약을 생성합니다."""
+        """간단한 토론 요약을 생성합니다.
+
+        라운드별 부분 요약(없으면 먼저 생성)을 모아 한 번에 요약하는 계층적 방식이라
+        토론이 길어져도 마지막 호출의 프롬프트는 컨텍스트 예산 안에 머문다.
+        """
         progressive_count = len([s for s in statements if s.get('stance') == '진보'])
         conservative_count = len([s for s in statements if s.get('stance') == '보수'])
+        rounds = self._group_by_round(statements)
+        max_new_tokens = self.max_new_tokens("debate_summary", "3-4문장")
         
-        prompt = f"""다음 정치토론을 3-4문장으로 간단히 요약하라:
+        header = PromptSection("header", f"""다음 정치토론을 3-4문장으로 간단히 요약하라:
 
 주제: {topic}
 진보 측 발언 수: {progressive_count}회
-보수 측 발언 수: {conservative_count}회
-
-최근 주요 발언들:
-{self._get_recent_statements(statements, 2)}
+보수 측 발언 수: {conservative_count}회""")
+        instructions = PromptSection("instructions", """
 
-토론의 핵심 쟁점과 양측의 기본 입장을 간결하게 정리하되, 어느 쪽으로도 치우치지 않는 중립적 톤으로 작성하라."""
+토론 전체의 흐름(쟁점이 어떻게 전개되었는지)과 양측의 기본 입장을 간결하게 정리하되, 어느 쪽으로도 치우치지 않는 중립적 톤으로 작성하라.""", fallback_priority=1)
+        last_exchange = self._format_statements(rounds[-1][1]) if rounds else ""
+        
+        # 부분 요약이 남는 예산을 넘으면 구간 단위로 한 번 더 요약 (마지막 라운드 발언 200토큰은 남겨 둠)
+        _, profile = self.router.resolve("debate_summary")
+        reserved = self.count_tokens(header.body + instructions.body) + min(200, self.count_tokens(last_exchange))
+        partials = self._reduce_partials(topic, [(number, number, self.summarize_round(topic, number, round_statements))
+                                                 for number, round_statements in rounds],
+                                         profile.ctx_size - max_new_tokens - 32 - reserved)
+        
+        sections = [
+            header,
+            PromptSection("round_summaries", self._format_partials(partials),
+                          priority=2, prefix="\n\n라운드별 요약:\n", trimmer=trim_tagged_lines),
+            PromptSection("last_exchange", last_exchange, priority=3,
+                          prefix="\n\n마지막 라운드 발언:\n"),
+            instructions,
+        ]
+        budget = self.fit_prompt(sections, task="debate_summary", max_new_tokens=max_new_tokens)
+        
+        return self.generate_response(budget.prompt, max_length=budget.max_new_tokens,
+                                      target_length="3-4문장", task="debate_summary")
+
+    def summarize_round(self, topic: str, round_number: int, statements: List[Dict]) -> str:
+        """한 라운드의 발언을 부분 요약합니다 (같은 발언이면 캐시된 요약 재사용)."""
+        round_statements = [s for s in statements if s.get('round', round_number) == round_number]
+        return self._partial_summary(topic, self._round_label(round_number, round_number),
+                                     self._format_statements(round_statements))
+
+    def _reduce_partials(self, topic: str, partials: List[Tuple[int, int, str]],
+                         token_budget: int) -> List[Tuple[int, int, str]]:
+        """부분 요약(시작 라운드, 끝 라운드, 요약)들이 token_budget 안에 들어올 때까지
+        reduce_group_size개씩 묶어 구간 요약으로 다시 요약합니다."""
+        while len(partials) > 1 and self.count_tokens(self._format_partials(partials)) > token_budget:
+            reduced = []
+            for index in range(0, len(partials), self.reduce_group_size):
+                group = partials[index:index + self.reduce_group_size]
+                if len(group) == 1:
+                    reduced.append(group[0])
+                    continue
+                start, end = group[0][0], group[-1][1]
+                summary = self._partial_summary(topic, self._round_label(start, end), self._format_partials(group))
+                reduced.append((start, end, summary))
+            print(f"🧮 부분 요약 축약: {len(partials)}개 → {len(reduced)}개")
+            partials = reduced
+        return partials
+
+    @staticmethod
+    def _round_label(start: int, end: int) -> str:
+        return f"라운드 {start}" if start == end else f"라운드 {start}-{end}"
+
+    @classmethod
+    def _format_partials(cls, partials: List[Tuple[int, int, str]]) -> str:
+        return "\n".join(f"- {cls._round_label(start, end)}: {summary}" for start, end, summary in partials)
+
+    def _partial_summary(self, topic: str, label: str, body: str) -> str:
+        """라운드(구간) 부분 요약을 생성하거나 캐시에서 꺼냅니다."""
+        digest = hashlib.sha1(f"{topic}\n{body}".encode('utf-8')).hexdigest()
+        cached = self.partial_summaries.get(label)
+        if cached and cached.get("digest") == digest:
+            return cached["summary"]
         
-        return self.generate_response(prompt)
-
-    def _get_recent_statements(self, statements: List[Dict], count: int) -> str:
-        """최근 발언들을 가져옵니다."""
-        recent = statements[-count*2:] if len(statements) >= count*2 else statements
-        result = ""
-        for stmt in recent:
-            stance = stmt.get('stance', '')
-            content = stmt.get('statement', '')[:100]
-            result += f"{stance}: {content}...\n"
-        return result
+        sections = [
+            PromptSection("header", f"""다음은 정치토론의 {label} 내용이다.
+
+주제: {topic}"""),
+            PromptSection("body", body, priority=1, min_tokens=200, prefix="\n\n", suffix="\n"),
+            PromptSection("instructions", """
+양측의 핵심 주장, 제시한 근거(수치·정책), 서로 반박한 지점을 2-3문장으로 중립적으로 요약하라.""", fallback_priority=1),
+        ]
+        budget = self.fit_prompt(sections, task="round_summary")
+        summary = self.generate_response(budget.prompt, max_length=budget.max_new_tokens, task="round_summary")
+        if not self.last_generation_ok or not summary.strip():
+            # 생성에 실패하면 캐시하지 않고 발언 앞부분으로 대신함 (다음 요약 때 다시 시도)
+            return body[:200]
+        summary = summary.strip()
+        self.partial_summaries[label] = {"digest": digest, "summary": summary}
+        return summary
+
+    @staticmethod
+    def _group_by_round(statements: List[Dict]) -> List[Tuple[int, List[Dict]]]:
+        """발언을 라운드 번호별로 묶습니다 (round가 없으면 진보·보수 두 발언을 한 라운드로 봄)."""
+        rounds: Dict[int, List[Dict]] = {}
+        for index, stmt in enumerate(statements):
+            rounds.setdefault(stmt.get('round') or index // 2 + 1, []).append(stmt)
+        return sorted(rounds.items())
+
+    @staticmethod
+    def _format_statements(statements: List[Dict]) -> str:
+        return "\n".join(f"{stmt.get('stance', '')}: {stmt.get('statement', '')}" for stmt in statements)
 
     def analyze_debate_quality(self, topic: str, statements: List[Dict]) -> str:
         """토론의 질적 수준을 평가합니다."""
@@ -94,7 +184,7 @@ class SummaryAgent(BaseAgent):
 
 각 기준별로 간단히 평가하고, 전반적인 토론의 수준과 아쉬운 점, 잘된 점을 객관적으로 분석하라."""
         
-        return self.generate_response(prompt)
+        return self.generate_response(prompt, task="debate_summary")
 
     def process_input(self, input_data: Dict) -> str:
         """간단 요약과 품질 평가를 처리하는 통합 메서드"""
@@ -0,0 +1,160 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+import hashlib
+import json
+import os
+import threading
+
+DEFAULT_TELEMETRY_PATH = "debate_results/telemetry.jsonl"
+
+
+class InferenceTelemetry:
+    """generate_response 호출마다 토큰 수·대기·프리필·디코드 지표를 JSONL로 남기는 기록기
+
+    레코드는 sink_path에 한 줄씩 바로 추가되고(토론 중 중단돼도 남음), 메모리에도 모아
+    토론 단위 보고서(어느 역할·작업에 시간이 쓰였는지)를 만든다.
+    """
+
+    def __init__(self, sink_path: Optional[str] = DEFAULT_TELEMETRY_PATH):
+        self.sink_path = sink_path
+        self.debate_id = ""
+        self.topic = ""
+        self.records: List[Dict] = []
+        self._seen_prompts = set()
+        self._lock = threading.Lock()
+
+    def start_debate(self, topic: str, debate_id: Optional[str] = None):
+        """새 토론의 레코드 묶음을 시작합니다 (이어서 진행할 때는 기존 debate_id를 넘김)."""
+        with self._lock:
+            self.topic = topic
+            self.debate_id = debate_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.records = []
+            self._seen_prompts = set()
+
+    def record(self, role: str, task: str, prompt: str, prompt_tokens: int, completion_tokens: int,
+               result, constraint: str = "", max_tokens: int = 0):
+        """호출 하나를 기록합니다 (result: GenerationResult)."""
+        timings = result.timings or {}
+        # 같은 작업에 같은 프롬프트가 다시 들어오면 재시도로 간주
+        prompt_hash = hashlib.sha1(f"{task}\n{prompt}".encode('utf-8')).hexdigest()[:16]
+
+        with self._lock:
+            retry = prompt_hash in self._seen_prompts
+            self._seen_prompts.add(prompt_hash)
+            entry = {
+                "debate_id": self.debate_id,
+                "timestamp": datetime.now().isoformat(),
+                "seq": len(self.records) + 1,
+                "role": role,
+                "task": task,
+                "constraint": constraint,
+                "max_tokens": max_tokens,
+                "prompt_hash": prompt_hash,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "ok": result.ok,
+                "error": result.error,
+                "stop_reason": result.stop_reason,
+                "retry": retry,
+                "cached": result.cached,
+                "wall_ms": round(result.elapsed * 1000, 1),
+                "queue_ms": round(result.queue_ms, 1),
+                "load_ms": timings.get("load_ms"),
+                "prefill_ms": timings.get("prompt_ms"),
+                "prefill_tps": timings.get("prompt_tokens_per_second"),
+                "decode_ms": timings.get("eval_ms"),
+                "decode_tps": timings.get("tokens_per_second"),
+                "draft_accept_rate": timings.get("accept_rate"),
+            }
+            self.records.append(entry)
+            self._append(entry)
+        return entry
+
+    def _append(self, entry: Dict):
+        if not self.sink_path:
+            return
+        try:
+            directory = os.path.dirname(self.sink_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.sink_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"⚠️ 텔레메트리 기록 실패: {e}")
+
+    def build_report(self) -> Dict:
+        """역할/작업별로 호출 수, 시간 비중, 토큰, 평균 프리필·디코드 지표를 집계합니다."""
+        with self._lock:
+            records = list(self.records)
+
+        total_ms = sum(r["wall_ms"] for r in records)
+        groups: Dict[str, Dict] = {}
+        for r in records:
+            key = f"{r['role']}/{r['task']}"
+            g = groups.setdefault(key, {
+                "role": r["role"], "task": r["task"], "calls": 0, "cached": 0, "failures": 0, "retries": 0,
+                "wall_ms": 0.0, "queue_ms": 0.0, "load_ms": 0.0, "prefill_ms": 0.0, "decode_ms": 0.0,
+                "prompt_tokens": 0, "completion_tokens": 0, "stop_reasons": {}, "_decode_tps": [],
+            })
+            # 체크포인트에서 재사용한 응답은 생성 시간이 없으므로 평균·비중 계산에서 뺌
+            if r.get("cached"):
+                g["cached"] += 1
+                continue
+            g["calls"] += 1
+            g["failures"] += int(not r["ok"])
+            g["retries"] += int(r["retry"])
+            g["wall_ms"] += r["wall_ms"]
+            g["queue_ms"] += r["queue_ms"]
+            g["load_ms"] += r["load_ms"] or 0.0
+            g["prefill_ms"] += r["prefill_ms"] or 0.0
+            g["decode_ms"] += r["decode_ms"] or 0.0
+            g["prompt_tokens"] += r["prompt_tokens"]
+            g["completion_tokens"] += r["completion_tokens"]
+            if r["stop_reason"]:
+                g["stop_reasons"][r["stop_reason"]] = g["stop_reasons"].get(r["stop_reason"], 0) + 1
+            if r["decode_tps"]:
+                g["_decode_tps"].append(r["decode_tps"])
+
+        by_call_site = []
+        for g in sorted(groups.values(), key=lambda g: -g["wall_ms"]):
+            tps = g.pop("_decode_tps")
+            g["avg_decode_tps"] = round(sum(tps) / len(tps), 2) if tps else None
+            g["avg_prefill_ms"] = round(g["prefill_ms"] / g["calls"], 1) if g["calls"] else 0.0
+            g["time_share"] = round(g["wall_ms"] / total_ms, 3) if total_ms else 0.0
+            for name in ("wall_ms", "queue_ms", "load_ms", "prefill_ms", "decode_ms"):
+                g[name] = round(g[name], 1)
+            by_call_site.append(g)
+
+        return {
+            "debate_id": self.debate_id,
+            "topic": self.topic,
+            "calls": sum(not r.get("cached") for r in records),
+            "cached": sum(bool(r.get("cached")) for r in records),
+            "total_seconds": round(total_ms / 1000, 1),
+            "prompt_tokens": sum(r["prompt_tokens"] for r in records if not r.get("cached")),
+            "completion_tokens": sum(r["completion_tokens"] for r in records if not r.get("cached")),
+            "failures": sum(int(not r["ok"]) for r in records),
+            "retries": sum(int(r["retry"]) for r in records if not r.get("cached")),
+            "by_call_site": by_call_site,
+        }
+
+    def print_report(self, report: Optional[Dict] = None):
+        report = report or self.build_report()
+        print(f"\n⏱️ 추론 시간 분석: 총 {report['calls']}회, {report['total_seconds'] / 60:.1f}분 "
+              f"(프롬프트 {report['prompt_tokens']}토큰, 생성 {report['completion_tokens']}토큰"
+              + (f", 체크포인트 재사용 {report['cached']}회" if report.get("cached") else "") + ")")
+        for g in report["by_call_site"]:
+            decode = f"{g['avg_decode_tps']:.1f} t/s" if g["avg_decode_tps"] else "-"
+            print(f"  {g['role']}/{g['task']}: {g['calls']}회, {g['wall_ms'] / 1000:.1f}초 "
+                  f"({g['time_share']:.0%}), 로드 {g['load_ms'] / 1000:.1f}초, "
+                  f"프리필 평균 {g['avg_prefill_ms']:.0f}ms, 디코드 {decode}, 재시도 {g['retries']}회"
+                  + (f", 재사용 {g['cached']}회" if g["cached"] else ""))
+
+    def save_report(self, path: str, report: Optional[Dict] = None):
+        report = report or self.build_report()
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"텔레메트리 보고서가 저장되었습니다: {path}")
+        except Exception as e:
+            print(f"⚠️ 텔레메트리 보고서 저장 실패: {e}")
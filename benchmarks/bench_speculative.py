@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+추측 디코딩 벤치마크
+실제 토론(generate_argument)에서 만들어진 토론자 프롬프트를 수집한 뒤,
+같은 프롬프트를 32B 단독 / 32B + 초안 모델로 생성해 초당 토큰 수와 초안 채택률을 비교합니다.
+
+사용 예:
+    python benchmarks/bench_speculative.py --draft-model C:/Users/User/Documents/EXAONE-4.0-1.2B-Q4_K_M.gguf
+"""
+
+import sys
+import os
+import argparse
+import json
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from debate_manager import DebateManager
+from agents.llm_backend import TIER_MAIN, DEFAULT_MODEL_PATH, DEFAULT_LLAMA_CLI_PATH
+
+
+def collect_debate_prompts(debate_manager: DebateManager, topic: str, rounds: int) -> List[Dict]:
+    """토론을 실제로 진행하면서 토론자 발언(debate_speech) 호출의 입력을 그대로 수집합니다."""
+    prompts = []
+    router = debate_manager.router
+    original_generate = router.generate
+
+    def recording_generate(task, input_text, max_tokens, constraint=None, monitor=None):
+        if task == "debate_speech":
+            prompts.append({"input_text": input_text, "max_tokens": max_tokens, "constraint": constraint})
+        return original_generate(task, input_text, max_tokens, constraint, monitor)
+
+    router.generate = recording_generate
+    try:
+        debate_manager.max_rounds = rounds
+        debate_manager.start_debate(topic)
+        while debate_manager.round_count < debate_manager.max_rounds:
+            debate_manager.proceed_round()
+    finally:
+        router.generate = original_generate
+    return prompts
+
+
+def run_benchmark(debate_manager: DebateManager, prompts: List[Dict], draft_model_path: str) -> List[Dict]:
+    """수집한 프롬프트마다 기준(32B 단독)과 추측 디코딩을 번갈아 실행합니다."""
+    backend = debate_manager.router.backend
+    baseline = replace(debate_manager.router.profiles[TIER_MAIN], draft_model_path=None)
+    speculative = replace(baseline, draft_model_path=draft_model_path)
+
+    rows = []
+    for i, prompt in enumerate(prompts, 1):
+        print(f"\n⏱️ 프롬프트 {i}/{len(prompts)} ({prompt['max_tokens']}토큰 한도)")
+        row = {"prompt": i, "max_tokens": prompt["max_tokens"]}
+        for label, profile in (("baseline", baseline), ("speculative", speculative)):
+            # 같은 조건에서 비교하도록 퇴행 감시 없이 동일한 토큰 한도로 생성
+            result = backend.generate(profile, prompt["input_text"], prompt["max_tokens"], prompt["constraint"])
+            row[label] = {
+                "ok": result.ok,
+                "elapsed": round(result.elapsed, 3),
+                "chars": len(result.text) if result.ok else 0,
+                **result.timings,
+            }
+        rows.append(row)
+    return rows
+
+
+def print_report(rows: List[Dict]):
+    print("\n" + "=" * 72)
+    print(f"{'#':>3} {'기준 t/s':>10} {'추측 t/s':>10} {'속도비':>8} {'채택률':>8} {'기준(초)':>10} {'추측(초)':>10}")
+    print("-" * 72)
+    speedups = []
+    drafted = accepted = 0
+    for row in rows:
+        base, spec = row["baseline"], row["speculative"]
+        base_tps = base.get("tokens_per_second", 0.0)
+        spec_tps = spec.get("tokens_per_second", 0.0)
+        speedup = spec_tps / base_tps if base_tps else 0.0
+        if speedup:
+            speedups.append(speedup)
+        drafted += spec.get("n_drafted", 0)
+        accepted += spec.get("n_accept", 0)
+        accept = f"{spec['accept_rate']:.1%}" if "accept_rate" in spec else "-"
+        print(f"{row['prompt']:>3} {base_tps:>10.2f} {spec_tps:>10.2f} {speedup:>7.2f}x {accept:>8} "
+              f"{base['elapsed']:>10.1f} {spec['elapsed']:>10.1f}")
+    print("-" * 72)
+    if speedups:
+        print(f"평균 속도비: {sum(speedups) / len(speedups):.2f}x")
+    if drafted:
+        print(f"전체 초안 채택률: {accepted / drafted:.1%} ({accepted}/{drafted})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='추측 디코딩 벤치마크 (토론자 프롬프트 기준)')
+    parser.add_argument('--draft-model', type=str, required=True,
+                        help='초안 GGUF 모델 경로 (메인 모델과 같은 토크나이저)')
+    parser.add_argument('--model', '-m', type=str, default=DEFAULT_MODEL_PATH,
+                        help='메인(타깃) GGUF 모델 경로')
+    parser.add_argument('--llama-cli', type=str, default=DEFAULT_LLAMA_CLI_PATH,
+                        help='llama-cli 실행 파일 경로 (같은 폴더의 llama-speculative 사용)')
+    parser.add_argument('--topic', '-t', type=str, default='민생경제 회복을 위한 정부 역할과 정책 방향',
+                        help='프롬프트 수집에 사용할 토론 주제')
+    parser.add_argument('--rounds', '-r', type=int, default=2,
+                        help='프롬프트 수집용 토론 라운드 수 (라운드당 프롬프트 2개)')
+    parser.add_argument('--output', '-o', type=str, default=None,
+                        help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    # 프롬프트 수집은 추측 디코딩 없이 진행 (출력 길이 통계·체크포인트·텔레메트리는 오염시키지 않음)
+    debate_manager = DebateManager(model_path=args.model, llama_cli_path=args.llama_cli,
+                                   output_stats_path=None, telemetry_path=None, checkpoint_dir=None,
+                                   evidence_ledger_path=None)
+    prompts = collect_debate_prompts(debate_manager, args.topic, args.rounds)
+    print(f"\n📋 수집한 토론자 프롬프트: {len(prompts)}개")
+
+    rows = run_benchmark(debate_manager, prompts, args.draft_model)
+    print_report(rows)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'timestamp': datetime.now().isoformat(),
+                'model': args.model,
+                'draft_model': args.draft_model,
+                'topic': args.topic,
+                'results': rows,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"결과가 저장되었습니다: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
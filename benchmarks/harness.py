@@ -0,0 +1,127 @@
+"""
+벤치마크 공통 도구: 구간별 지연 시간 수집, 백분위수 계산, 메모리 최고치 측정, 기준선 비교
+"""
+
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+import math
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+
+class BenchContext:
+    """벤치마크 함수가 구간 시간(timer)과 호출 수(count)를 기록하는 컨텍스트"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.counts: Dict[str, int] = {}
+        self.recording = True
+
+    @contextmanager
+    def timer(self, op: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.recording:
+                self.samples.setdefault(op, []).append((time.perf_counter() - start) * 1000)
+
+    def count(self, name: str, n: int = 1):
+        if self.recording:
+            self.counts[name] = self.counts.get(name, 0) + n
+
+
+def percentiles(samples: List[float]) -> Dict:
+    """ms 단위 표본의 p50/p90/p99/평균/최소/최대"""
+    ordered = sorted(samples)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, max(0, int(math.ceil(len(ordered) * p)) - 1))]
+
+    return {
+        "n": len(ordered),
+        "p50": round(pct(0.50), 3),
+        "p90": round(pct(0.90), 3),
+        "p99": round(pct(0.99), 3),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "min": round(ordered[0], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def max_rss_mb() -> Optional[float]:
+    if not RESOURCE_AVAILABLE:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, 리눅스는 KB 단위
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+def run_benchmark(name: str, func: Callable[[BenchContext], None], repeats: int = 3) -> Dict:
+    """첫 실행(워밍업)은 tracemalloc으로 메모리 최고치만 재고, 이후 repeats번의 시간을 집계합니다."""
+    print(f"\n🏁 {name}")
+    ctx = BenchContext()
+
+    # 워밍업 겸 메모리 측정 (tracemalloc 부하가 시간 측정에 섞이지 않도록 분리)
+    ctx.recording = False
+    tracemalloc.start()
+    func(ctx)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ctx.recording = True
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func(ctx)
+    wall = time.perf_counter() - start
+
+    result = {
+        "repeats": repeats,
+        "wall_s": round(wall, 3),
+        "peak_python_mb": round(peak / (1024 * 1024), 2),
+        "max_rss_mb": max_rss_mb(),
+        "ops": {op: percentiles(samples) for op, samples in ctx.samples.items()},
+        # 호출 수는 반복 1회 기준
+        "counts": {key: value // repeats for key, value in ctx.counts.items()},
+    }
+    for op, stats in result["ops"].items():
+        print(f"  {op}: p50 {stats['p50']:.2f}ms, p90 {stats['p90']:.2f}ms, p99 {stats['p99']:.2f}ms (n={stats['n']})")
+    if result["counts"]:
+        print(f"  호출 수: {result['counts']}")
+    print(f"  메모리: 파이썬 최고 {result['peak_python_mb']}MB, RSS 최고 {result['max_rss_mb']}MB")
+    return result
+
+
+def compare_to_baseline(results: Dict, baseline: Dict, tolerance: float = 0.25,
+                        min_delta_ms: float = 1.0) -> List[str]:
+    """기준선 대비 p50 지연이 tolerance 이상 늘었거나, 메모리가 늘었거나, 호출 수가 바뀐 항목을 반환합니다.
+
+    min_delta_ms보다 작은 차이는 측정 잡음으로 보고 무시합니다.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for op, stats in current["ops"].items():
+            base_stats = base.get("ops", {}).get(op)
+            if not base_stats:
+                continue
+            limit = base_stats["p50"] * (1 + tolerance)
+            if stats["p50"] > limit and stats["p50"] - base_stats["p50"] >= min_delta_ms:
+                regressions.append(f"{name}/{op}: p50 {base_stats['p50']:.2f}ms → {stats['p50']:.2f}ms")
+        base_peak = base.get("peak_python_mb")
+        if base_peak and current["peak_python_mb"] > base_peak * (1 + tolerance) + 1:
+            regressions.append(f"{name}: 파이썬 메모리 최고치 {base_peak}MB → {current['peak_python_mb']}MB")
+        for key, value in current["counts"].items():
+            base_value = base.get("counts", {}).get(key)
+            if base_value is not None and base_value != value:
+                regressions.append(f"{name}: 호출 수 {key} {base_value} → {value}")
+    return regressions
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+CLI 시작 시간(import 비용) 프로파일
+`python -X importtime main.py --help`를 새 프로세스로 실행해 모듈별 누적 import 시간을 집계하고,
+무거운 라이브러리가 인자 해석 전에 불러와지지 않는지, 시작 시간이 예산 안인지 확인합니다.
+
+사용 예:
+    python benchmarks/import_profile.py                    # 상위 15개 모듈과 시작 시간
+    python benchmarks/import_profile.py --budget-ms 500 --runs 5
+    python benchmarks/import_profile.py --args tune --help # 하위 명령 시작 비용
+"""
+
+import sys
+import os
+import argparse
+import statistics
+import subprocess
+import time
+from typing import Dict, List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# --help 경로에서 불러오면 안 되는 무거운 라이브러리 (기능을 실제로 쓸 때만 import)
+HEAVY_MODULES = ["torch", "transformers", "sklearn", "llama_index", "faiss", "sentence_transformers", "scipy"]
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """-X importtime 출력을 (모듈, 자체 us, 누적 us, 깊이) 목록으로 변환합니다."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return entries
+
+
+def measure_wall(cli_args: List[str], runs: int) -> List[float]:
+    """CLI를 runs번 새로 실행한 벽시계 시간 (ms)"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "main.py"] + cli_args, cwd=ROOT_DIR,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CLI 시작 시간(import 비용) 프로파일')
+    parser.add_argument('--args', nargs=argparse.REMAINDER, default=['--help'],
+                        help='main.py에 넘길 인자 (기본값: --help, 마지막 옵션으로 지정)')
+    parser.add_argument('--top', type=int, default=15,
+                        help='출력할 상위 모듈 수 (기본값: 15)')
+    parser.add_argument('--runs', type=int, default=3,
+                        help='시작 시간 측정 반복 횟수 (기본값: 3)')
+    parser.add_argument('--budget-ms', type=float, default=1000.0,
+                        help='시작 시간 예산 - 중앙값이 넘으면 종료 코드 1 (기본값: 1000)')
+    args = parser.parse_args()
+    cli_args = args.args or ['--help']
+
+    proc = subprocess.run([sys.executable, "-X", "importtime", "main.py"] + cli_args, cwd=ROOT_DIR,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    entries = parse_importtime(proc.stderr)
+    if not entries:
+        print("❌ import 기록을 읽지 못했습니다.")
+        print(proc.stderr[-2000:])
+        sys.exit(1)
+
+    # 최상위 패키지별 누적 시간 (깊이 0 항목이 자식 시간을 모두 포함)
+    totals: Dict[str, int] = {}
+    for name, _, cumulative, depth in entries:
+        if depth == 0:
+            top = name.split(".")[0]
+            totals[top] = totals.get(top, 0) + cumulative
+    total_us = sum(totals.values())
+
+    print(f"📦 main.py {' '.join(cli_args)}: 모듈 {len(entries)}개, import 합계 {total_us / 1000:.1f}ms")
+    for top, us in sorted(totals.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {top:<28} {us / 1000:8.1f}ms")
+
+    loaded = {name.split(".")[0] for name, _, _, _ in entries}
+    heavy = [module for module in HEAVY_MODULES if module in loaded]
+
+    wall = measure_wall(cli_args, args.runs)
+    median = statistics.median(wall)
+    print(f"⏱️ 시작 시간: 중앙값 {median:.0f}ms (최소 {min(wall):.0f}ms, {args.runs}회)")
+
+    failed = False
+    if heavy:
+        print(f"❌ 무거운 라이브러리가 미리 로드됨: {', '.join(heavy)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"❌ 시작 시간이 예산({args.budget_ms:.0f}ms)을 넘었습니다.")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("✅ 시작 시간 예산 이내")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+토론 파이프라인 벤치마크 모음 (모델 없이 스텁 LLM으로 실행)
+data/의 기사 코퍼스로 RAG 인덱싱·검색, 근거 추적, 전체 토론, 결과 저장을 측정하고
+지연 백분위수·메모리 최고치·호출 수를 JSON 기준선과 비교합니다.
+
+사용 예:
+    python benchmarks/run_benchmarks.py                        # 전체 실행 후 기준선과 비교
+    python benchmarks/run_benchmarks.py --only debate evidence_tracker --repeats 5
+    python benchmarks/run_benchmarks.py --save-baseline        # 현재 결과를 기준선으로 저장
+"""
+
+import sys
+import os
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+from datetime import datetime
+from typing import Dict
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.harness import BenchContext, run_benchmark, compare_to_baseline
+from benchmarks.stub_backend import StubBackend, load_corpus_sentences, DATA_DIR
+
+# 지연·메모리 기준선은 머신마다 달라 로컬에만 두고, 머신과 무관한 호출 수 기준선은 저장소에 커밋
+DEFAULT_BASELINE_PATH = os.path.join(ROOT_DIR, "benchmarks", "baselines", "baseline.json")
+DEFAULT_COUNTS_BASELINE_PATH = os.path.join(ROOT_DIR, "benchmarks", "baselines", "counts.json")
+TOPIC = "민생회복 소비쿠폰 도입에 대한 토론"
+QUERIES = ["소비쿠폰 경기 부양 효과", "국가채무와 재정건전성", "자영업자 매출 회복", "물가 상승 우려", "지역화폐"]
+
+# 여러 벤치마크가 공유하는 무거운 객체 (RAG 인덱스, 코퍼스 문장)
+_shared: Dict = {}
+
+
+def quiet():
+    """토론 코드의 진행 로그를 숨겨 출력 비용이 측정에 섞이지 않도록 합니다."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def corpus_sentences():
+    if "sentences" not in _shared:
+        _shared["sentences"] = load_corpus_sentences()
+    return _shared["sentences"]
+
+
+def shared_rag():
+    if "rag" not in _shared:
+        from utils.rag_system import RAGSystem
+        with quiet():
+            _shared["rag"] = RAGSystem(os.path.join(DATA_DIR, "merged_progressive.json"),
+                                       os.path.join(DATA_DIR, "merged_conservative.json"))
+    return _shared["rag"]
+
+
+def optional_rag():
+    """RAG 인덱스를 돌려주되 llama_index가 없는 환경에서는 None으로 대신합니다."""
+    if "rag_error" not in _shared:
+        try:
+            shared_rag()
+            _shared["rag_error"] = None
+        except ImportError as e:
+            _shared["rag_error"] = str(e)
+            print(f"⚠️ RAG 시스템을 불러올 수 없어 근거 검색 없이 토론합니다: {e}")
+    return _shared.get("rag")
+
+
+def bench_rag_index(ctx: BenchContext):
+    from utils.rag_system import RAGSystem
+    with quiet(), ctx.timer("build_index"):
+        rag = RAGSystem(os.path.join(DATA_DIR, "merged_progressive.json"),
+                        os.path.join(DATA_DIR, "merged_conservative.json"))
+    ctx.count("documents", len(rag.documents))
+    _shared.setdefault("rag", rag)
+
+
+def bench_rag_search(ctx: BenchContext):
+    rag = shared_rag()
+    with quiet():
+        for query in QUERIES:
+            for stance in ("진보", "보수"):
+                with ctx.timer("search"):
+                    docs = rag.search(query=query, stance_filter=stance)
+                ctx.count("search")
+                if docs:
+                    with ctx.timer("compress_evidence"):
+                        rag.compress_evidence(docs[:3], [TOPIC, query], 350)
+                    ctx.count("compress")
+
+
+def bench_evidence_tracker(ctx: BenchContext):
+    from agents.debate_agents import EnhancedEvidenceTracker
+    sentences = corpus_sentences()
+    statements = [" ".join(sentences[i:i + 5]) for i in range(0, min(len(sentences), 200), 5)]
+    tracker = EnhancedEvidenceTracker()
+    with quiet():
+        for i, statement in enumerate(statements):
+            stance = "진보" if i % 2 == 0 else "보수"
+            with ctx.timer("extract_evidence"):
+                tracker.extract_evidence(statement)
+            with ctx.timer("check_evidence_conflict"):
+                tracker.check_evidence_conflict(statement, stance)
+            with ctx.timer("record_used_evidence"):
+                tracker.record_used_evidence(statement, stance)
+            ctx.count("statements")
+        for a, b in zip(statements[:20], statements[1:21]):
+            with ctx.timer("calculate_similarity"):
+                tracker.calculate_similarity(a, b)
+
+
+def bench_evidence_conflict(ctx: BenchContext, statement_sentences: int = 20):
+    """수치가 많은 긴 발언의 충돌 검사: 근거를 한 번에 비교하는 경로와 근거마다 따로 비교하는 경로"""
+    from agents.debate_agents import EnhancedEvidenceTracker
+    numeric = [s for s in corpus_sentences() if any(ch.isdigit() for ch in s)]
+    statements = [" ".join(numeric[i:i + statement_sentences])
+                  for i in range(0, len(numeric) - statement_sentences + 1, statement_sentences // 2)]
+    tracker = EnhancedEvidenceTracker()
+    with quiet():
+        # 상대(보수) 근거 색인을 먼저 채움
+        for statement in statements[1::2]:
+            tracker.record_used_evidence(statement, "보수")
+        for statement in statements[::2]:
+            with ctx.timer("find_conflicts"):
+                tracker.find_conflicts(statement, "진보")
+            with ctx.timer("find_conflicting_sentences"):
+                tracker.find_conflicting_sentences(statement, "진보")
+            entries = [(category, tracker.normalize_evidence(item, category))
+                       for category, items in tracker.extract_evidence(statement).items() for item in items]
+            with ctx.timer("batched_match"):
+                tracker._match_opponent(entries, "보수")
+            with ctx.timer("per_item_match"):
+                for entry in entries:
+                    tracker._match_opponent([entry], "보수")
+            ctx.count("statements")
+            ctx.count("evidence_items", len(entries))
+
+
+def bench_debate(ctx: BenchContext, rounds: int = 3, rag_system="shared"):
+    from debate_manager import DebateManager
+    rag = optional_rag() if rag_system == "shared" else rag_system
+    backend = StubBackend(corpus_sentences())
+    with quiet():
+        with ctx.timer("init"):
+            manager = DebateManager(model_path="stub.gguf", output_stats_path=None, telemetry_path=None,
+                                    backend=backend, rag_system=rag, checkpoint_dir=None,
+                                    evidence_ledger_path=None)
+        manager.max_rounds = rounds
+        with ctx.timer("start_debate"):
+            manager.start_debate(TOPIC)
+        for _ in range(rounds):
+            with ctx.timer("proceed_round"):
+                manager.proceed_round()
+        with ctx.timer("summarize_debate"):
+            summary = manager.summarize_debate()
+    # RAG 없이 대체 실행한 결과의 호출 수는 RAG 기준선과 맞지 않으므로 debate_norag에만 기록
+    if rag is not None or rag_system is None:
+        for name, calls in backend.calls.items():
+            ctx.count(f"llm.{name}", calls)
+    _shared["debate_summary"] = summary
+
+
+def bench_debate_norag(ctx: BenchContext, rounds: int = 3):
+    """근거 검색 없이 토론합니다. llama_index 유무와 무관해 호출 수 기준선을 어디서나 비교할 수 있습니다."""
+    bench_debate(ctx, rounds, rag_system=None)
+
+
+def bench_save_results(ctx: BenchContext):
+    from main import save_debate_results
+    if "debate_summary" not in _shared:
+        bench_debate(BenchContext())
+    results = {
+        'summary_result': _shared["debate_summary"],
+        'metadata': {'timestamp': datetime.now().isoformat(), 'total_rounds': 3, 'topic': TOPIC},
+    }
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            with quiet(), ctx.timer("save_debate_results"):
+                save_debate_results(results, TOPIC)
+        finally:
+            os.chdir(cwd)
+    ctx.count("saves")
+
+
+BENCHMARKS = {
+    "rag_index": bench_rag_index,
+    "rag_search": bench_rag_search,
+    "evidence_tracker": bench_evidence_tracker,
+    "evidence_conflict": bench_evidence_conflict,
+    "debate": bench_debate,
+    "debate_norag": bench_debate_norag,
+    "save_results": bench_save_results,
+}
+# 한 번만 돌려도 충분히 긴 벤치마크
+SINGLE_RUN = {"rag_index"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='토론 파이프라인 벤치마크 (스텁 LLM)')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), default=None,
+                        help='실행할 벤치마크 (기본값: 전체)')
+    parser.add_argument('--repeats', '-n', type=int, default=3,
+                        help='벤치마크별 반복 횟수 (워밍업 1회 별도, 기본값: 3)')
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE_PATH,
+                        help='비교할 기준선 JSON 경로')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='이번 결과를 기준선으로 저장')
+    parser.add_argument('--counts-baseline', type=str, default=DEFAULT_COUNTS_BASELINE_PATH,
+                        help='비교할 호출 수 기준선 JSON 경로 (저장소에 커밋된 머신 무관 기준선)')
+    parser.add_argument('--save-counts-baseline', action='store_true',
+                        help='이번 결과의 호출 수만 호출 수 기준선으로 저장')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='p50 지연 허용 증가율 (기본값: 0.25 = 25%%)')
+    parser.add_argument('--output', '-o', type=str, default=None,
+                        help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.only or list(BENCHMARKS):
+        repeats = 1 if name in SINGLE_RUN else args.repeats
+        results[name] = run_benchmark(name, BENCHMARKS[name], repeats)
+
+    report = {"timestamp": datetime.now().isoformat(), "python": sys.version.split()[0], "results": results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과가 저장되었습니다: {args.output}")
+
+    if args.save_baseline or args.save_counts_baseline:
+        if args.save_baseline:
+            save_baseline(args.baseline, report, results)
+        if args.save_counts_baseline:
+            save_baseline(args.counts_baseline, report,
+                          {name: {"counts": result["counts"]} for name, result in results.items() if result["counts"]})
+        return
+
+    regressions = []
+    compared = False
+    for path in (args.counts_baseline, args.baseline):
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                regressions += compare_to_baseline(results, json.load(f).get("results", {}), args.tolerance)
+            compared = True
+    if regressions:
+        print(f"\n❌ 기준선 대비 회귀 {len(regressions)}건:")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    if compared:
+        print(f"\n✅ 기준선 대비 회귀 없음 (허용 {args.tolerance:.0%})")
+    if not os.path.exists(args.baseline):
+        print(f"\n💡 지연·메모리 기준선이 없습니다. --save-baseline으로 만드세요: {args.baseline}")
+
+
+def save_baseline(path: str, report: Dict, results: Dict):
+    """기존 기준선에 이번 벤치마크 결과를 덮어써 저장합니다 (실행하지 않은 벤치마크는 유지)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    baseline = {}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get("results", {})
+    baseline.update(results)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({**report, "results": baseline}, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"기준선이 저장되었습니다: {path}")
+
+
+if __name__ == "__main__":
+    main()
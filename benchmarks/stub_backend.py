@@ -0,0 +1,84 @@
+"""
+모델 없이 토론 파이프라인을 돌리기 위한 결정적 스텁 LLM 백엔드
+출력 제약(constraint)별로 형식에 맞는 응답을 만들고, 발언은 코퍼스 문장으로 조립해
+근거 추적(수치·정책 추출)과 수정 경로도 실제와 비슷하게 거치도록 한다.
+"""
+
+from typing import Dict, List, Optional
+import hashlib
+import json
+import os
+import re
+import time
+
+from agents.llm_backend import ModelProfile, GenerationResult
+from agents.grammars import OutputConstraint
+from agents.degeneration import DegenerationMonitor
+from utils.corpus_store import CorpusStore
+from utils.text_utils import split_sentences
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+_QUOTED = re.compile(r'"([^"]{10,})"')
+_TOPICS = ["재정정책", "일자리", "부동산", "복지", "물가", "세금", "소비쿠폰", "국가채무", "규제완화", "중소기업"]
+
+
+def load_corpus_sentences(data_dir: str = DATA_DIR, limit: int = 2000) -> List[str]:
+    """merged_*.json 근거 문단에서 문장부호로 끝나는 문장을 모읍니다 (수치 문장 우선)."""
+    sentences = []
+    store = CorpusStore(os.path.join(data_dir, "corpus.db"))
+    try:
+        for filename, stance in (("merged_progressive.json", "진보"), ("merged_conservative.json", "보수")):
+            store.import_file(os.path.join(data_dir, filename), "article", stance, origin=filename)
+            for passage in store.iter_passages("evidence", origin=filename):
+                sentences += [s for s in split_sentences(passage["text"], 20) if s[-1:] in ".?!"]
+    finally:
+        store.close()
+    sentences.sort(key=lambda s: not re.search(r'\d', s))
+    return sentences[:limit]
+
+
+class StubBackend:
+    """LlamaCliBackend와 같은 generate() 인터페이스의 결정적 응답 생성기"""
+
+    requires_model_files = False
+
+    def __init__(self, sentences: Optional[List[str]] = None, latency_ms: float = 0.0):
+        self.sentences = sentences or load_corpus_sentences()
+        self.latency_ms = latency_ms
+        self.calls: Dict[str, int] = {}
+
+    def _pick(self, input_text: str, count: int) -> List[str]:
+        seed = int(hashlib.md5(input_text.encode('utf-8')).hexdigest(), 16)
+        return [self.sentences[(seed + i * 7919) % len(self.sentences)] for i in range(count)]
+
+    def _respond(self, input_text: str, constraint_name: str) -> str:
+        seed = int(hashlib.md5(input_text.encode('utf-8')).hexdigest()[:8], 16)
+        if constraint_name == "yes_no":
+            return "YES" if seed % 5 == 0 else "NO"
+        if constraint_name == "key_topics":
+            return json.dumps([_TOPICS[(seed + i) % len(_TOPICS)] for i in range(3)], ensure_ascii=False)
+        if constraint_name == "short_summary":
+            quoted = _QUOTED.search(input_text)
+            return (quoted.group(1) if quoted else self._pick(input_text, 1)[0])[:100].replace("\n", " ")
+        if constraint_name == "single_sentence":
+            return self._pick(input_text, 1)[0]
+        if constraint_name == "single_paragraph":
+            return " ".join(self._pick(input_text, 5))
+        return " ".join(self._pick(input_text, 4))
+
+    def generate(self, profile: ModelProfile, input_text: str, max_tokens: int,
+                 constraint: Optional[OutputConstraint] = None,
+                 monitor: Optional[DegenerationMonitor] = None) -> GenerationResult:
+        start = time.perf_counter()
+        name = constraint.name if constraint else "free"
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+        text = self._respond(input_text, name)
+        stop_reason = ""
+        if monitor is not None:
+            if monitor.feed(text):
+                stop_reason = monitor.stop_reason
+            text = monitor.truncate(text)
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return GenerationResult(text, True, time.perf_counter() - start, stop_reason=stop_reason)
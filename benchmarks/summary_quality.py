@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+발언 요약 방식 비교: LLM 요약 vs 추출식 요약 (중심 문장 + 근거)
+저장된 토론 결과(결과 저장소와 아직 가져오지 않은 debate_results/*.json)의 발언을 두 방식으로 요약해 기준 요약 없이 잴 수 있는 지표로 비교합니다.
+
+지표:
+  - 내용 보존: 요약과 원문 발언의 임베딩 코사인 유사도
+  - 근거 보존: 원문에서 추적된 근거(수치·기관·정책) 중 요약에 남은 비율
+  - 길이(글자), 요약 1건당 시간(ms), 두 요약 사이 유사도
+
+사용 예:
+    python benchmarks/summary_quality.py --model <main.gguf> --utility-model <small.gguf> --llama-cli <llama-cli>
+    python benchmarks/summary_quality.py --record-llm summaries.jsonl ...   # LLM 요약 녹화
+    python benchmarks/summary_quality.py --replay-llm summaries.jsonl       # 녹화로 모델 없이 재비교
+    python benchmarks/summary_quality.py --stub --limit 20                   # 스텁 LLM으로 경로 확인
+"""
+
+import sys
+import os
+import argparse
+import contextlib
+import glob
+import io
+import json
+import statistics
+import time
+from typing import Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from agents.debate_agents import StatementMemoryManager, EnhancedEvidenceTracker
+from utils.results_store import DebateResultsStore, DEFAULT_RESULTS_DB, extract_statements
+from utils.topic_engine import HashingEmbedder
+
+MODES = ("llm", "extractive")
+
+
+def load_statements(results_dir: str, limit: int, results_db: Optional[str] = None) -> List[str]:
+    """결과 저장소와 결과 JSON 파일들에서 발언을 모읍니다 (중복 제외, 저장 순서대로).
+
+    JSON 파일은 저장소로 가져오지 않은 것만 읽습니다.
+    """
+    statements: Dict[str, None] = {}
+    imported = set()
+    if results_db and os.path.exists(results_db):
+        store = DebateResultsStore(results_db)
+        try:
+            for row in store.statement_texts():
+                if row['text'].strip():
+                    statements.setdefault(row['text'].strip())
+            imported = store.imported_sources()
+        finally:
+            store.close()
+
+    for path in sorted(glob.glob(os.path.join(results_dir, "*.json"))):
+        if path.endswith("_telemetry.json") or os.path.basename(path) in imported:
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                results = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        if not isinstance(results, dict):
+            continue
+        for entry in extract_statements(results):
+            text = entry.get('statement', '') if isinstance(entry, dict) else str(entry)
+            if text.strip():
+                statements.setdefault(text.strip())
+    return list(statements)[:limit] if limit else list(statements)
+
+
+def build_agent(args):
+    """요약 생성에 쓸 토론자 에이전트 (RAG 없이, 지정한 백엔드로)"""
+    from agents.debate_agents import ProgressiveAgent
+    from agents.llm_backend import ModelRouter, LlamaCliBackend
+    from agents.output_budget import OutputBudgetPolicy
+
+    backend = None
+    if args.stub:
+        from benchmarks.stub_backend import StubBackend
+        backend = StubBackend()
+    elif args.replay_llm:
+        from agents.replay_backend import ReplayBackend
+        backend = ReplayBackend(args.replay_llm)
+    elif args.record_llm:
+        from agents.replay_backend import RecordingBackend
+        backend = RecordingBackend(args.record_llm, LlamaCliBackend())
+    router = ModelRouter.from_paths(args.model, args.utility_model, args.llama_cli,
+                                    output_budget=OutputBudgetPolicy(None), backend=backend)
+    return ProgressiveAgent(args.model, router=router)
+
+
+def evidence_recall(tracker: EnhancedEvidenceTracker, statement: str, summary: str) -> float:
+    """원문 근거 중 요약에 (정규화 후) 남아 있는 비율 (원문에 근거가 없으면 1.0)"""
+    items = {tracker.normalize_evidence(text, category)
+             for category, text, _, _ in tracker.extract_evidence_spans(statement)}
+    if not items:
+        return 1.0
+    normalized_summary = tracker.normalize_evidence(summary)
+    return sum(1 for item in items if item in normalized_summary) / len(items)
+
+
+def main():
+    from agents.llm_backend import DEFAULT_MODEL_PATH, DEFAULT_LLAMA_CLI_PATH
+
+    parser = argparse.ArgumentParser(description='발언 요약 방식 비교 (LLM vs 추출식)')
+    parser.add_argument('--results-dir', type=str, default=os.path.join(ROOT_DIR, 'debate_results'),
+                        help='토론 결과 JSON 폴더 (기본값: debate_results)')
+    parser.add_argument('--results-db', type=str, default=os.path.join(ROOT_DIR, DEFAULT_RESULTS_DB),
+                        help=f'결과 저장소(SQLite) 경로 (기본값: {DEFAULT_RESULTS_DB})')
+    parser.add_argument('--limit', type=int, default=0, help='비교할 최대 발언 수 (기본값: 전체)')
+    parser.add_argument('--model', '-m', type=str, default=DEFAULT_MODEL_PATH, help='메인 GGUF 모델 경로')
+    parser.add_argument('--utility-model', type=str, default=None, help='요약용 소형 GGUF 모델 경로')
+    parser.add_argument('--llama-cli', type=str, default=DEFAULT_LLAMA_CLI_PATH, help='llama-cli 실행 파일 경로')
+    parser.add_argument('--record-llm', type=str, default=None, help='LLM 요약 요청·응답을 녹화할 JSONL 경로')
+    parser.add_argument('--replay-llm', type=str, default=None, help='녹화된 JSONL로 LLM 요약을 재생')
+    parser.add_argument('--stub', action='store_true', help='스텁 LLM 사용 (지표 계산 경로 확인용)')
+    parser.add_argument('--output', '-o', type=str, default=None, help='발언별 결과를 저장할 JSON 경로')
+    args = parser.parse_args()
+
+    statements = load_statements(args.results_dir, args.limit, args.results_db)
+    if not statements:
+        print(f"❌ 발언을 찾을 수 없습니다: {args.results_db}, {args.results_dir}")
+        sys.exit(1)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent = build_agent(args)
+    tracker = EnhancedEvidenceTracker()
+    embedder = HashingEmbedder()
+    managers = {mode: StatementMemoryManager(summary_mode=mode) for mode in MODES}
+    # 임베딩·정규식 준비 비용이 첫 발언 시간에 섞이지 않도록 미리 한 번 실행
+    managers["extractive"].extractive_summary(statements[0], tracker)
+
+    rows = []
+    failed = 0
+    for index, statement in enumerate(statements, 1):
+        row = {"statement": statement}
+        for mode in MODES:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                summary = managers[mode].summarize_statement(statement, agent)
+            row[mode] = {"summary": summary, "ms": (time.perf_counter() - start) * 1000}
+        if not agent.last_generation_ok:
+            # 생성 실패(녹화에 없는 요청 등)는 비교에서 제외
+            failed += 1
+            continue
+        vectors = embedder.embed([statement, row["llm"]["summary"], row["extractive"]["summary"]])
+        for offset, mode in enumerate(MODES, 1):
+            row[mode].update({
+                "coverage": float(vectors[0] @ vectors[offset]),
+                "evidence_recall": evidence_recall(tracker, statement, row[mode]["summary"]),
+                "chars": len(row[mode]["summary"]),
+            })
+        row["agreement"] = float(vectors[1] @ vectors[2])
+        rows.append(row)
+        print(f"\r📝 {index}/{len(statements)}", end="", flush=True)
+    print()
+
+    if not rows:
+        print(f"❌ 비교할 LLM 요약이 없습니다 (생성 실패 {failed}건)")
+        sys.exit(1)
+
+    print(f"📊 발언 {len(rows)}건 비교 (LLM 생성 실패로 제외 {failed}건)")
+    print(f"  {'방식':<12} {'내용 보존':>9} {'근거 보존':>9} {'길이':>7} {'시간(ms)':>10}")
+    summary = {}
+    for mode in MODES:
+        summary[mode] = {metric: statistics.mean(row[mode][metric] for row in rows)
+                         for metric in ("coverage", "evidence_recall", "chars", "ms")}
+        m = summary[mode]
+        print(f"  {mode:<12} {m['coverage']:9.3f} {m['evidence_recall']:9.1%} {m['chars']:7.0f} {m['ms']:10.1f}")
+    summary["agreement"] = statistics.mean(row["agreement"] for row in rows)
+    print(f"  두 요약 사이 유사도: {summary['agreement']:.3f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"summary": summary, "rows": rows}, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
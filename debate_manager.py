@@ -5,33 +5,112 @@ from agents import (
     ModeratorAgent, 
     SummaryAgent
 )
+from agents.llm_backend import ModelRouter, LlamaCliBackend, DEFAULT_MODEL_PATH, DEFAULT_LLAMA_CLI_PATH
+from agents.checkpoint import DebateCheckpoint, CheckpointBackend, DEFAULT_CHECKPOINT_DIR
+from agents.output_budget import OutputBudgetPolicy, DEFAULT_OUTPUT_STATS_PATH
+from agents.telemetry import InferenceTelemetry, DEFAULT_TELEMETRY_PATH
+from utils.evidence_ledger import EvidenceLedger, DEFAULT_EVIDENCE_LEDGER
+from utils.resource_governor import ResourceGovernor
+from utils.tracing import tracer, traced
 
 class DebateManager:
-    def __init__(self, model_path: str = 'C:/Users/User/Documents/EXAONE-4.0-32B-Q4_K_M.gguf'):
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, utility_model_path: Optional[str] = None,
+                 llama_cli_path: str = DEFAULT_LLAMA_CLI_PATH,
+                 output_stats_path: Optional[str] = DEFAULT_OUTPUT_STATS_PATH,
+                 draft_model_path: Optional[str] = None,
+                 embed_threads: Optional[int] = None,
+                 telemetry_path: Optional[str] = DEFAULT_TELEMETRY_PATH,
+                 trace_dir: Optional[str] = None, trace_format: str = "chrome",
+                 backend=None, rag_system=None,
+                 checkpoint_dir: Optional[str] = DEFAULT_CHECKPOINT_DIR,
+                 memory_summary_mode: str = "llm",
+                 evidence_ledger_path: Optional[str] = DEFAULT_EVIDENCE_LEDGER):
         print("토론 시스템 초기화 중...")
         
+        # 단계별 추적 (trace_dir이 있을 때만 기록)
+        self.trace_dir = trace_dir
+        self.trace_format = trace_format
+        if trace_dir:
+            tracer.enable()
+        
+        # 임베딩 모델과 llama.cpp가 코어를 나눠 쓰도록 공유 자원 관리자 설정
+        self.governor = ResourceGovernor.shared()
+        self.governor.configure(embed_threads)
+        
+        # 체크포인트: 완료된 단계와 모델 응답을 먼저 기록해 두고, 재개 시 이미 한 생성은 다시 하지 않음
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint: Optional[DebateCheckpoint] = None
+        self.checkpoint_backend: Optional[CheckpointBackend] = None
+        self._resume_checkpoint: Optional[DebateCheckpoint] = None
+        # 체크포인트로 감싸기 전의 백엔드 (녹화/재생 통계 조회용)
+        self.llm_backend = backend
+        if checkpoint_dir:
+            self.checkpoint_backend = CheckpointBackend(backend or LlamaCliBackend(self.governor))
+            backend = self.checkpoint_backend
+        
+        # 모든 에이전트가 공유하는 모델 라우터 (유틸리티 작업은 소형 모델로)
+        # backend: None이면 llama-cli, 녹화/재생 백엔드(agents.replay_backend)로 교체 가능
+        # 출력 길이 통계는 실행 간에 누적되어 호출 지점별 토큰 예산 조정에 쓰임
+        self.router = ModelRouter.from_paths(model_path, utility_model_path, llama_cli_path,
+                                             draft_model_path=draft_model_path,
+                                             output_budget=OutputBudgetPolicy(output_stats_path),
+                                             telemetry=InferenceTelemetry(telemetry_path),
+                                             backend=backend)
+        
         # 에이전트들 초기화 (진보 vs 보수만)
-        self.progressive_agent = ProgressiveAgent(model_path)
-        self.conservative_agent = ConservativeAgent(model_path)
-        self.moderator_agent = ModeratorAgent(model_path)
-        self.summary_agent = SummaryAgent(model_path)
+        # rag_system: 주어지면 양측 토론자가 근거 기사 검색에 사용
+        # memory_summary_mode: 과거 발언 요약 방식 ("llm" 또는 생성 없는 "extractive")
+        self.progressive_agent = ProgressiveAgent(model_path, rag_system=rag_system, router=self.router,
+                                                  memory_summary_mode=memory_summary_mode)
+        self.conservative_agent = ConservativeAgent(model_path, rag_system=rag_system, router=self.router,
+                                                    memory_summary_mode=memory_summary_mode)
+        self.moderator_agent = ModeratorAgent(model_path, router=self.router)
+        
+        # 토론 간 근거 장부: 같은 주제의 이전 토론에서 쓰인 근거를 불러오고 사용 기록을 누적
+        self.evidence_ledger = EvidenceLedger(evidence_ledger_path) if evidence_ledger_path else None
+        self.summary_agent = SummaryAgent(model_path, router=self.router)
         
         # 토론 상태 관리
         self.current_topic = ""
         self.statements = []
         self.round_count = 0
         self.max_rounds = 3
+        self.round_results = []
+        # 재개 시 진보 발언까지만 끝난 라운드의 발언 (다시 생성하지 않음)
+        self._pending_statement: Optional[Dict] = None
         
         print("토론 시스템 초기화 완료!")
     
+    @traced(category="debate")
     def start_debate(self, topic: str) -> Dict:
-        """토론을 시작합니다."""
+        """토론을 시작합니다 (resume()으로 체크포인트를 불러왔으면 그 지점부터 이어서 진행)."""
+        if self._resume_checkpoint:
+            return self._restore_checkpoint()
+        
         self.current_topic = topic
         self.statements = []
         self.round_count = 0
+        self.round_results = []
+        self._pending_statement = None
+        self.summary_agent.partial_summaries = {}
+        self.router.telemetry.start_debate(topic)
+        if self.trace_dir:
+            tracer.reset()
+        
+        if self.checkpoint_dir:
+            self.checkpoint = DebateCheckpoint.create(self.checkpoint_dir, self.router.telemetry.debate_id)
+            self.checkpoint.append("header", debate_id=self.checkpoint.debate_id, topic=topic,
+                                   max_rounds=self.max_rounds)
+            self.checkpoint_backend.attach(self.checkpoint)
+            print(f"💾 체크포인트: {self.checkpoint.path}")
+        
+        self._attach_evidence_ledger(topic, self.router.telemetry.debate_id)
         
         print(f"\n=== 토론 시작: {topic} ===")
         
+        return self._introduce(topic)
+    
+    def _introduce(self, topic: str) -> Dict:
         # 사회자 소개 (간결하게)
         moderator_intro = self.moderator_agent.process_input({
             'action': 'introduce',
@@ -40,12 +119,125 @@ class DebateManager:
         
         print(f"\n🎯 사회자: {moderator_intro}")
         
-        return {
+        start_result = {
             'topic': topic,
             'moderator_intro': moderator_intro,
             'status': 'started'
         }
+        if self.checkpoint:
+            self.checkpoint.append("intro", result=start_result)
+        return start_result
+    
+    def resume(self, debate_id: str) -> Dict:
+        """체크포인트를 불러옵니다. 이어서 start_debate()를 호출하면 완료된 단계를 건너뛰고 진행합니다."""
+        if not self.checkpoint_dir:
+            raise ValueError("체크포인트 디렉토리가 설정되지 않아 재개할 수 없습니다.")
+        checkpoint = DebateCheckpoint.open(self.checkpoint_dir, debate_id)
+        header = checkpoint.first("header")
+        if not header:
+            raise ValueError(f"체크포인트에 토론 정보가 없습니다: {checkpoint.path}")
+        
+        self._resume_checkpoint = checkpoint
+        self.current_topic = header["topic"]
+        self.max_rounds = header.get("max_rounds", self.max_rounds)
+        return {
+            'debate_id': checkpoint.debate_id,
+            'topic': self.current_topic,
+            'max_rounds': self.max_rounds,
+            'completed_statements': len(checkpoint.find("statement")),
+            'cached_responses': len(checkpoint.find("llm")),
+            'summarized': checkpoint.first("summary") is not None
+        }
+    
+    def _restore_checkpoint(self) -> Dict:
+        """체크포인트의 발언·메모리·근거 장부를 복원하고 시작 결과를 반환합니다."""
+        checkpoint = self._resume_checkpoint
+        self._resume_checkpoint = None
+        self.checkpoint = checkpoint
+        self.checkpoint_backend.attach(checkpoint, resume=True)
+        self.router.telemetry.start_debate(self.current_topic, checkpoint.debate_id)
+        if self.trace_dir:
+            tracer.reset()
+        
+        self.statements = []
+        self.round_results = []
+        self._pending_statement = None
+        self.summary_agent.partial_summaries = {}
+        agent_states = {}
+        for record in checkpoint.records:
+            if record.get('type') not in ("statement", "round_summary"):
+                continue
+            if record.get('output_budget') is not None:
+                self.router.output_budget.stats = record['output_budget']
+            if record['type'] == "round_summary":
+                self.summary_agent.partial_summaries = dict(record.get('partials', {}))
+                continue
+            entry = {'round': record['round'], 'stance': record['stance'], 'statement': record['statement']}
+            agent_states[record['stance']] = record.get('agent_state')
+            if record['stance'] == '진보':
+                self._pending_statement = entry
+            elif self._pending_statement and self._pending_statement['round'] == record['round']:
+                self.statements += [self._pending_statement, entry]
+                self.round_results.append({
+                    'round': record['round'],
+                    'progressive_statement': self._pending_statement['statement'],
+                    'conservative_statement': record['statement'],
+                    'status': 'completed'
+                })
+                self._pending_statement = None
+        self.round_count = len(self.round_results)
+        
+        # 장부를 먼저 연결해 두고 체크포인트의 근거 상태로 덮어씀 (이미 기록한 발언은 장부에서 다시 세지 않음)
+        self._attach_evidence_ledger(self.current_topic, checkpoint.debate_id)
+        for agent in (self.progressive_agent, self.conservative_agent):
+            if agent_states.get(agent.stance):
+                self._restore_agent_state(agent, agent_states[agent.stance])
+        
+        print(f"\n=== 토론 재개: {self.current_topic} ===")
+        print(f"💾 체크포인트 {checkpoint.debate_id}: 완료 라운드 {self.round_count}/{self.max_rounds}, "
+              f"저장된 모델 응답 {len(checkpoint.find('llm'))}개")
+        
+        intro = checkpoint.first("intro")
+        if intro:
+            print(f"\n🎯 사회자: {intro['result']['moderator_intro']}")
+            return intro['result']
+        return self._introduce(self.current_topic)
+    
+    def _attach_evidence_ledger(self, topic: str, debate_id: Optional[str]):
+        if not self.evidence_ledger:
+            return
+        for agent in (self.progressive_agent, self.conservative_agent):
+            agent.evidence_tracker.attach_ledger(self.evidence_ledger, topic, debate_id)
     
+    @staticmethod
+    def _agent_state(agent) -> Dict:
+        """발언 직후 토론자의 메모리 상태와 근거 장부"""
+        return {
+            'my_managed_statements': agent.my_managed_statements,
+            'opponent_managed_statements': agent.opponent_managed_statements,
+            'consistency_violations': agent.consistency_violations,
+            'repair_reports': agent.repair_reports,
+            'evidence_ledger': agent.evidence_tracker.export_ledger(),
+            'topics': agent.memory_manager.topic_engine.export_state()
+        }
+    
+    @staticmethod
+    def _restore_agent_state(agent, state: Dict):
+        agent.my_managed_statements = state.get('my_managed_statements', [])
+        agent.opponent_managed_statements = state.get('opponent_managed_statements', [])
+        agent.consistency_violations = state.get('consistency_violations', [])
+        agent.repair_reports = state.get('repair_reports', [])
+        agent.evidence_tracker.load_ledger(state.get('evidence_ledger', {}))
+        agent.memory_manager.topic_engine.load_state(state.get('topics', {}))
+    
+    def _record_statement(self, stance: str, statement: str, agent):
+        entry = {'round': self.round_count, 'stance': stance, 'statement': statement}
+        self.statements.append(entry)
+        if self.checkpoint:
+            self.checkpoint.append("statement", **entry, agent_state=self._agent_state(agent),
+                                   output_budget=self.router.output_budget.stats)
+    
+    @traced(category="debate")
     def proceed_round(self) -> Dict:
         """한 라운드를 진행합니다."""
         if self.round_count >= self.max_rounds:
@@ -61,18 +253,19 @@ class DebateManager:
         
         # print(f"\n--- 라운드 {self.round_count} ---")
         
-        # 진보 측 발언
-        progressive_statement = self.progressive_agent.generate_argument(
-            topic=self.current_topic,
-            round_number=self.round_count,
-            previous_statements=self.statements
-        )
-        
-        self.statements.append({
-            'round': self.round_count,
-            'stance': '진보',
-            'statement': progressive_statement
-        })
+        # 진보 측 발언 (재개한 라운드에서 이미 완료된 발언은 다시 생성하지 않음)
+        pending = self._pending_statement
+        self._pending_statement = None
+        if pending and pending['round'] == self.round_count:
+            progressive_statement = pending['statement']
+            self.statements.append(pending)
+        else:
+            progressive_statement = self.progressive_agent.generate_argument(
+                topic=self.current_topic,
+                round_number=self.round_count,
+                previous_statements=self.statements
+            )
+            self._record_statement('진보', progressive_statement, self.progressive_agent)
         round_results['progressive_statement'] = progressive_statement
         
         print(f"\n🔵 진보: {progressive_statement}")
@@ -84,17 +277,22 @@ class DebateManager:
             previous_statements=self.statements
         )
         
-        self.statements.append({
-            'round': self.round_count,
-            'stance': '보수',
-            'statement': conservative_statement
-        })
+        self._record_statement('보수', conservative_statement, self.conservative_agent)
         round_results['conservative_statement'] = conservative_statement
         
         print(f"\n🔴 보수: {conservative_statement}")
         
+        self.round_results.append(round_results)
+        
+        # 라운드가 끝날 때 부분 요약을 한 번 만들어 두고 최종 요약에서 모아 씀
+        self.summary_agent.summarize_round(self.current_topic, self.round_count, self.statements)
+        if self.checkpoint:
+            self.checkpoint.append("round_summary", round=self.round_count,
+                                   partials=self.summary_agent.partial_summaries,
+                                   output_budget=self.router.output_budget.stats)
         return round_results
     
+    @traced(category="debate")
     def summarize_debate(self) -> Dict:
         """토론을 요약합니다."""
         print(f"\n=== 토론 요약 ===")
@@ -124,7 +322,10 @@ class DebateManager:
         print(f"\n📊 상세 요약:")
         print(summary)
         
-        return {
+        # 이번 토론의 출력 길이 관측치를 저장
+        self.router.output_budget.save()
+        
+        summary_result = {
             'topic': self.current_topic,
             'total_rounds': self.round_count,
             'total_statements': len(self.statements),
@@ -134,6 +335,9 @@ class DebateManager:
             'moderator_conclusion': moderator_conclusion,
             'all_statements': self.statements
         }
+        if self.checkpoint:
+            self.checkpoint.append("summary", result=summary_result)
+        return summary_result
     
     def get_debate_status(self) -> Dict:
         """현재 토론 상태를 반환합니다."""
@@ -143,4 +347,33 @@ class DebateManager:
             'max_rounds': self.max_rounds,
             'total_statements': len(self.statements),
             'can_proceed': self.round_count < self.max_rounds
-        } 
\ No newline at end of file
+        }
+    
+    def get_routing_stats(self) -> Dict:
+        """모델 티어별 호출 수와 지연 시간 통계를 반환합니다."""
+        return self.router.get_stats()
+    
+    def get_output_budget_stats(self) -> Dict:
+        """호출 지점·출력 형식별 출력 길이 분포와 현재 토큰 예산을 반환합니다."""
+        return self.router.output_budget.get_stats()
+    
+    def get_llm_replay_stats(self) -> Optional[Dict]:
+        """녹화/재생 백엔드를 쓰면 녹화 수 또는 재생 일치(hits)·불일치(misses) 수를 반환합니다."""
+        if self.llm_backend is not None and hasattr(self.llm_backend, "get_stats"):
+            return self.llm_backend.get_stats()
+        return None
+    
+    def get_resource_stats(self) -> Dict:
+        """코어 분할과 임베딩 대기(생성과 겹친 횟수·시간) 통계를 반환합니다."""
+        return self.governor.get_stats()
+    
+    def get_telemetry_report(self) -> Dict:
+        """이번 토론의 호출 지점별 추론 시간·토큰 집계 보고서를 반환합니다."""
+        return self.router.telemetry.build_report()
+    
+    def export_trace(self) -> Optional[str]:
+        """이번 토론의 추적 구간을 trace_dir에 저장하고 파일 경로를 반환합니다."""
+        if not self.trace_dir:
+            return None
+        name = f"debate_{self.router.telemetry.debate_id or 'trace'}"
+        return tracer.export(self.trace_dir, name, self.trace_format)
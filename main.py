@@ -7,10 +7,18 @@
 import sys
 import os
 import argparse
-from typing import Dict, List
+from typing import Dict, List, Optional, TYPE_CHECKING
 from datetime import datetime
 import json
-from debate_manager import DebateManager
+from agents.hardware_profile import DEFAULT_HARDWARE_PROFILE_PATH
+from agents.checkpoint import DEFAULT_CHECKPOINT_DIR
+from utils.evidence_ledger import DEFAULT_EVIDENCE_LEDGER
+from utils.results_store import DEFAULT_RESULTS_DB
+
+# 토론 매니저와 백엔드는 인자 해석 뒤에 불러옴 (--help, 인자 오류는 무거운 라이브러리 없이 즉시 응답)
+# 시작 시간 확인: python benchmarks/import_profile.py
+if TYPE_CHECKING:
+    from debate_manager import DebateManager
 
 def ensure_results_dir():
     """결과 저장 디렉토리를 생성합니다."""
@@ -19,13 +27,39 @@ def ensure_results_dir():
         os.makedirs(results_dir)
     return results_dir
 
-def save_debate_results(results: Dict, topic: str):
-    """토론 결과를 debate_results 폴더에 JSON과 MD로 저장합니다."""
-    # 결과 저장 디렉토리 확인/생성
-    results_dir = ensure_results_dir()
+def save_debate_results(results: Dict, topic: str, telemetry_report: Optional[Dict] = None,
+                        save_files: bool = False, results_db: Optional[str] = DEFAULT_RESULTS_DB) -> Optional[int]:
+    """토론 결과를 결과 저장소(SQLite)에 저장하고 토론 ID를 반환합니다.
+
+    save_files면 기존처럼 debate_results 폴더에 JSON/MD(텔레메트리는 _telemetry.json)도 씁니다.
+    저장소의 토론은 `python main.py export <ID>`로 언제든 같은 형식의 파일로 내보낼 수 있습니다.
+    """
+    debate_id = None
+    if results_db:
+        from agents.debate_agents import EnhancedEvidenceTracker
+        from utils.results_store import DebateResultsStore
+        try:
+            store = DebateResultsStore(results_db)
+            debate_id = store.save_debate(results, topic, telemetry_report,
+                                          evidence_extractor=EnhancedEvidenceTracker().extract_evidence)
+            store.close()
+            print(f"🗄️ 결과가 저장소에 저장되었습니다: {results_db} (토론 ID {debate_id})")
+        except Exception as e:
+            print(f"결과 저장소 저장 중 오류 발생: {e}")
+            save_files = True  # 저장소에 못 넣었으면 파일로라도 남김
+    
+    if save_files:
+        write_debate_files(results, topic, telemetry_report, ensure_results_dir())
+    return debate_id
+
+def write_debate_files(results: Dict, topic: str, telemetry_report: Optional[Dict], results_dir: str,
+                       saved_at: Optional[datetime] = None):
+    """토론 결과를 results_dir에 JSON과 MD로 저장합니다 (텔레메트리 보고서는 _telemetry.json)."""
+    saved_at = saved_at or datetime.now()
+    os.makedirs(results_dir, exist_ok=True)
     
     # 파일명 생성 (주제_날짜시간)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = saved_at.strftime("%Y%m%d_%H%M%S")
     topic_slug = topic.replace(" ", "_")[:30]  # 주제를 파일명에 적합하게 변환
     base_filename = f"{topic_slug}_{timestamp}"
     
@@ -40,6 +74,16 @@ def save_debate_results(results: Dict, topic: str):
     except Exception as e:
         print(f"JSON 파일 저장 중 오류 발생: {e}")
     
+    # 추론 텔레메트리 보고서 저장 (결과 JSON 옆)
+    if telemetry_report:
+        telemetry_filepath = os.path.join(results_dir, f"{base_filename}_telemetry.json")
+        try:
+            with open(telemetry_filepath, 'w', encoding='utf-8') as f:
+                json.dump(telemetry_report, f, ensure_ascii=False, indent=2)
+            print(f"텔레메트리 보고서가 저장되었습니다: {telemetry_filepath}")
+        except Exception as e:
+            print(f"텔레메트리 보고서 저장 중 오류 발생: {e}")
+    
     # MD 파일 저장
     md_filename = f"{base_filename}.md"
     md_filepath = os.path.join(results_dir, md_filename)
@@ -48,7 +92,7 @@ def save_debate_results(results: Dict, topic: str):
         with open(md_filepath, 'w', encoding='utf-8') as f:
             f.write(f"=== AI 정치 토론 결과 ===\n")
             f.write(f"주제: {topic}\n")
-            f.write(f"날짜: {datetime.now().strftime('%Y년 %m월 %d일 %H:%M:%S')}\n")
+            f.write(f"날짜: {saved_at.strftime('%Y년 %m월 %d일 %H:%M:%S')}\n")
             f.write(f"총 라운드: {results.get('metadata', {}).get('total_rounds', 'N/A')}\n")
             f.write("=" * 50 + "\n\n")
             
@@ -102,33 +146,167 @@ def main():
     parser.add_argument('--model', '-m', type=str,
                        default='C:/Users/User/Documents/EXAONE-4.0-32B-Q4_K_M.gguf',
                        help='사용할 GGUF 모델 경로')
+    parser.add_argument('--utility-model', type=str, default=None,
+                       help='요약·모순 판정·주제 추출 등 유틸리티 작업용 소형 GGUF 모델 경로 (미지정 시 메인 모델 사용)')
+    parser.add_argument('--draft-model', type=str, default=None,
+                       help='추측 디코딩용 초안 GGUF 모델 경로 (메인 모델과 같은 토크나이저, 미지정 시 비활성화)')
     parser.add_argument('--llama-cli', type=str,
                        default='C:/Users/User/LLM-Debate/llama.cpp/build/bin/Release/llama-cli.exe',
                        help='llama-cli 실행 파일 경로')
+    parser.add_argument('--embed-threads', type=int, default=None,
+                       help='임베딩 모델에 배정할 CPU 코어 수 (기본값: 코어 8개 이상이면 1/8, 0이면 분할 안 함)')
+    parser.add_argument('--memory-summary', type=str, choices=['llm', 'extractive'], default='llm',
+                       help='과거 발언 요약 방식: llm(모델이 핵심 논점 요약) 또는 extractive(중심 문장 + 근거, 생성 없음)')
+    parser.add_argument('--evidence-ledger', type=str, default=DEFAULT_EVIDENCE_LEDGER,
+                       help=f'토론 간 근거 장부(SQLite) 경로 (기본값: {DEFAULT_EVIDENCE_LEDGER})')
+    parser.add_argument('--no-evidence-ledger', action='store_true',
+                       help='이전 토론의 근거를 불러오거나 기록하지 않음')
+    parser.add_argument('--trace-dir', type=str, default=None,
+                       help='단계별 추적 파일을 저장할 폴더 (지정 시 추적 활성화)')
+    parser.add_argument('--trace-format', type=str, choices=['chrome', 'otlp'], default='chrome',
+                       help='추적 파일 형식: chrome(trace-event, Perfetto/chrome://tracing) 또는 otlp(OpenTelemetry JSON)')
+    parser.add_argument('--record-llm', type=str, default=None,
+                       help='LLM 요청과 응답을 녹화할 JSONL 경로 (실제 모델로 실행)')
+    parser.add_argument('--replay-llm', type=str, default=None,
+                       help='녹화된 JSONL로 LLM 응답을 재생 (모델 없이 실행)')
+    parser.add_argument('--replay-strict', action='store_true',
+                       help='녹화에 없는 요청은 다른 응답으로 대신하지 않고 실패로 처리')
+    parser.add_argument('--replay-latency', type=str, default='none',
+                       help='재생 지연: none | recorded | tps:<초당 토큰> | <고정 초> (기본값: none)')
+    parser.add_argument('--resume', type=str, default=None,
+                       help='체크포인트 ID(또는 .jsonl 경로)로 중단된 토론을 이어서 진행')
+    parser.add_argument('--checkpoint-dir', type=str, default=DEFAULT_CHECKPOINT_DIR,
+                       help=f'체크포인트 저장 폴더 (기본값: {DEFAULT_CHECKPOINT_DIR})')
+    parser.add_argument('--no-checkpoint', action='store_true',
+                       help='체크포인트를 기록하지 않음')
+    parser.add_argument('--results-db', type=str, default=DEFAULT_RESULTS_DB,
+                       help=f'결과 저장소(SQLite) 경로 (기본값: {DEFAULT_RESULTS_DB})')
+    parser.add_argument('--save-files', action='store_true',
+                       help='저장소와 함께 debate_results 폴더에 JSON/MD 파일도 저장')
     parser.add_argument('--interactive', '-i', action='store_true',
                        help='대화형 모드로 실행')
     parser.add_argument('--auto', '-a', action='store_true',
                        help='자동 모드로 전체 토론 실행')
     
+    # 하위 명령: tune (현재 머신에 맞는 스레드·배치·메모리 설정 측정)
+    subparsers = parser.add_subparsers(dest='command')
+    tune_parser = subparsers.add_parser('tune', help='llama.cpp 스레드·배치·mmap 설정을 측정해 하드웨어 프로필 저장')
+    tune_parser.add_argument('--model', '-m', type=str, default=argparse.SUPPRESS,
+                             help='측정에 사용할 GGUF 모델 경로 (기본값: 메인 모델)')
+    tune_parser.add_argument('--llama-cli', type=str, default=argparse.SUPPRESS,
+                             help='llama-cli 실행 파일 경로')
+    tune_parser.add_argument('--threads', type=str, default=None,
+                             help='측정할 스레드 수 목록 (예: 8,16,32 / 기본값: 코어 수 기준 자동)')
+    tune_parser.add_argument('--max-tokens', type=int, default=64,
+                             help='측정 1회당 생성 토큰 수 (기본값: 64)')
+    tune_parser.add_argument('--repeats', type=int, default=1,
+                             help='설정별 반복 측정 횟수 (중앙값 사용, 기본값: 1)')
+    tune_parser.add_argument('--output', '-o', type=str, default=DEFAULT_HARDWARE_PROFILE_PATH,
+                             help=f'하드웨어 프로필 저장 경로 (기본값: {DEFAULT_HARDWARE_PROFILE_PATH})')
+    
+    # 하위 명령: query / export / import (결과 저장소 검색·내보내기·기존 파일 가져오기)
+    query_parser = subparsers.add_parser('query', help='저장된 토론의 발언·요약 검색')
+    query_parser.add_argument('text', nargs='?', default=None,
+                              help='전문 검색어 (발언, --debates면 주제·요약)')
+    query_parser.add_argument('--topic', type=str, default=None, help='주제 포함 문자열')
+    query_parser.add_argument('--stance', type=str, choices=['진보', '보수'], default=None, help='입장')
+    query_parser.add_argument('--round', type=int, default=None, help='라운드')
+    query_parser.add_argument('--evidence', type=str, default=None, help='발언에 쓰인 근거(수치·기관·정책) 포함 문자열')
+    query_parser.add_argument('--since', type=str, default=None, help='시작 날짜 (예: 2025-08-01)')
+    query_parser.add_argument('--until', type=str, default=None, help='끝 날짜 (예: 2025-08-31)')
+    query_parser.add_argument('--limit', type=int, default=20, help='최대 결과 수 (기본값: 20)')
+    query_parser.add_argument('--debates', action='store_true', help='발언 대신 토론 목록 검색')
+    export_parser = subparsers.add_parser('export', help='저장된 토론을 JSON/MD 파일로 내보내기')
+    export_parser.add_argument('debate_id', type=int, nargs='+', help='토론 ID')
+    export_parser.add_argument('--output-dir', '-o', type=str, default='debate_results',
+                               help='내보낼 폴더 (기본값: debate_results)')
+    import_parser = subparsers.add_parser('import', help='기존 debate_results/*.json 파일을 저장소로 가져오기')
+    import_parser.add_argument('directory', nargs='?', default='debate_results',
+                               help='결과 JSON 폴더 (기본값: debate_results)')
+    for sub in (tune_parser, query_parser, export_parser, import_parser):
+        sub.add_argument('--results-db', type=str, default=argparse.SUPPRESS,
+                         help='결과 저장소(SQLite) 경로')
+    
+    # 하위 명령: corpus (크롤링 JSON을 코퍼스 저장소로 동기화하고 현황 출력)
+    corpus_parser = subparsers.add_parser('corpus', help='data/ 크롤링 JSON을 코퍼스 저장소(SQLite)로 동기화')
+    corpus_parser.add_argument('--data-dir', type=str, default='data', help='크롤링 데이터 폴더 (기본값: data)')
+    corpus_parser.add_argument('--corpus-db', type=str, default=None,
+                               help='코퍼스 저장소 경로 (기본값: <data-dir>/corpus.db)')
+    
     args = parser.parse_args()
     
+    if args.command == 'tune':
+        run_tune(args)
+        return
+    if args.command in ('query', 'export', 'import'):
+        run_results_command(args)
+        return
+    if args.command == 'corpus':
+        run_corpus_command(args)
+        return
+    
+    save_options = {'save_files': args.save_files, 'results_db': args.results_db}
+    
+    from debate_manager import DebateManager
+    
+    # LLM 백엔드: 녹화 재생 / 녹화 / 기본(llama-cli)
+    backend = None
+    if args.replay_llm:
+        from agents.replay_backend import ReplayBackend
+        backend = ReplayBackend(args.replay_llm, latency=args.replay_latency, strict=args.replay_strict)
+    elif args.record_llm:
+        from agents.llm_backend import LlamaCliBackend
+        from agents.replay_backend import RecordingBackend
+        from utils.resource_governor import ResourceGovernor
+        backend = RecordingBackend(args.record_llm, LlamaCliBackend(ResourceGovernor.shared()))
+    
+    # 녹화·재생 중에는 실행 간에 누적되는 상태(출력 길이 통계, 근거 장부)를 쓰지 않음
+    # (이 상태가 바뀌면 max_tokens와 프롬프트가 달라져 재생 시 요청 키가 녹화와 맞지 않음)
+    llm_replay = bool(args.replay_llm or args.record_llm)
+    if llm_replay:
+        print("📼 녹화/재생: 출력 길이 통계와 근거 장부를 불러오거나 저장하지 않습니다")
+    
     # 토론 매니저 초기화
     try:
-        debate_manager = DebateManager(model_path=args.model)
+        debate_manager = DebateManager(model_path=args.model,
+                                       utility_model_path=args.utility_model,
+                                       llama_cli_path=args.llama_cli,
+                                       draft_model_path=args.draft_model,
+                                       embed_threads=args.embed_threads,
+                                       trace_dir=args.trace_dir,
+                                       trace_format=args.trace_format,
+                                       backend=backend,
+                                       checkpoint_dir=None if args.no_checkpoint else args.checkpoint_dir,
+                                       memory_summary_mode=args.memory_summary,
+                                       evidence_ledger_path=(None if args.no_evidence_ledger or llm_replay
+                                                             else args.evidence_ledger),
+                                       **({'output_stats_path': None} if llm_replay else {}))
         debate_manager.max_rounds = args.rounds
         
+        # 재개: 주제와 라운드 수는 체크포인트의 값을 따름
+        if args.resume:
+            resume_info = debate_manager.resume(args.resume)
+            args.topic = resume_info['topic']
+            args.rounds = resume_info['max_rounds']
+            print(f"💾 체크포인트 {resume_info['debate_id']}: 완료된 발언 {resume_info['completed_statements']}개, "
+                  f"저장된 모델 응답 {resume_info['cached_responses']}개")
+        
         print(f"🤖 진보 vs 보수 토론을 시작합니다...")
         print(f"📝 주제: {args.topic}")
         print(f"🔄 라운드: {args.rounds}")
         print(f"🧠 모델: {args.model}")
+        if args.utility_model:
+            print(f"🪶 유틸리티 모델: {args.utility_model}")
+        if args.draft_model:
+            print(f"🚀 초안 모델 (추측 디코딩): {args.draft_model}")
         print(f"🔧 llama-cli: {args.llama_cli}")
         
         if args.auto:
             # 자동 모드
-            run_auto_debate(debate_manager, args.topic)
+            run_auto_debate(debate_manager, args.topic, **save_options)
         else:
             # 대화형 모드 (기본값)
-            run_interactive_debate(debate_manager, args.topic)
+            run_interactive_debate(debate_manager, args.topic, **save_options)
             
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
@@ -139,14 +317,121 @@ def main():
         print("  4. 시스템 리소스 확인")
         sys.exit(1)
 
-def run_auto_debate(debate_manager: DebateManager, topic: str):
+def run_tune(args):
+    """현재 머신에서 llama.cpp 실행 설정을 측정하고 하드웨어 프로필로 저장합니다."""
+    from agents.llm_backend import ModelProfile
+    from agents.autotune import BackendTuner
+    
+    if not os.path.exists(args.model):
+        print(f"❌ 모델 파일을 찾을 수 없습니다: {args.model}")
+        sys.exit(1)
+    
+    thread_candidates = None
+    if args.threads:
+        thread_candidates = sorted({int(t) for t in args.threads.split(',') if t.strip()})
+    
+    base_profile = ModelProfile(name=os.path.basename(args.model), model_path=args.model,
+                                llama_cli_path=args.llama_cli)
+    tuner = BackendTuner(base_profile, max_tokens=args.max_tokens, repeats=args.repeats,
+                         thread_candidates=thread_candidates, results_db=args.results_db)
+    
+    print(f"🖥️ 하드웨어 튜닝 시작: CPU {os.cpu_count()}개, 스레드 후보 {tuner.thread_candidates}")
+    print(f"🧠 모델: {args.model}")
+    
+    profile = tuner.tune()
+    profile.save(args.output)
+    print(f"하드웨어 프로필이 저장되었습니다: {args.output}")
+    print(f"  {profile.describe()}")
+
+def run_results_command(args):
+    """결과 저장소 하위 명령 (query / export / import)을 실행합니다."""
+    import glob
+    import time
+    from utils.results_store import DebateResultsStore
+    
+    store = DebateResultsStore(args.results_db)
+    
+    if args.command == 'query':
+        start = time.perf_counter()
+        if args.debates:
+            rows = store.list_debates(args.text, args.topic, args.since, args.until, args.limit)
+        else:
+            rows = store.search_statements(args.text, args.topic, args.stance, args.round,
+                                           args.since, args.until, args.evidence, args.limit)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        for row in rows:
+            if args.debates:
+                print(f"[{row['id']}] {row['created_at'][:16]} {row['topic']} "
+                      f"({row['total_rounds'] or '-'}라운드, 발언 {row['statements']}건, {row['status']})")
+            else:
+                icon = "🔵" if row['stance'] == '진보' else "🔴"
+                print(f"[{row['debate_id']}] {row['created_at'][:16]} 라운드 {row['round']} {icon} {row['stance']}: "
+                      f"{row['snippet']}")
+        print(f"\n🔎 {len(rows)}건 ({elapsed_ms:.1f}ms, 저장된 토론 {store.count()['debates']}개)")
+    
+    elif args.command == 'export':
+        for debate_id in args.debate_id:
+            stored = store.get_results(debate_id)
+            if not stored:
+                print(f"❌ 토론 ID {debate_id}를 찾을 수 없습니다.")
+                continue
+            timestamp = stored['results'].get('metadata', {}).get('timestamp')
+            saved_at = datetime.fromisoformat(timestamp) if timestamp else None
+            write_debate_files(stored['results'], stored['topic'], stored['telemetry_report'],
+                               args.output_dir, saved_at)
+    
+    elif args.command == 'import':
+        from agents.debate_agents import EnhancedEvidenceTracker
+        extractor = EnhancedEvidenceTracker().extract_evidence
+        imported = 0
+        for path in sorted(glob.glob(os.path.join(args.directory, '*.json'))):
+            if path.endswith('_telemetry.json'):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    results = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️ 건너뜀: {path} ({e})")
+                continue
+            if not isinstance(results, dict) or 'metadata' not in results:
+                continue
+            telemetry_report = None
+            telemetry_path = path[:-len('.json')] + '_telemetry.json'
+            if os.path.exists(telemetry_path):
+                with open(telemetry_path, 'r', encoding='utf-8') as f:
+                    telemetry_report = json.load(f)
+            before = store.count()['debates']
+            topic = results['metadata'].get('topic') or (results.get('summary_result') or {}).get('topic', '')
+            store.save_debate(results, topic, telemetry_report, evidence_extractor=extractor,
+                              source=os.path.basename(path))
+            imported += store.count()['debates'] - before
+        print(f"🗄️ {imported}개 토론을 가져왔습니다: {args.results_db} (전체 {store.count()})")
+    
+    store.close()
+
+def run_corpus_command(args):
+    """크롤링 JSON을 코퍼스 저장소로 동기화(바뀐 파일만)하고 종류·입장별 문서 수를 출력합니다."""
+    from utils.corpus_store import CorpusStore
+    
+    store = CorpusStore(args.corpus_db or os.path.join(args.data_dir, 'corpus.db'))
+    imported = store.sync(args.data_dir)
+    stats = store.get_stats()
+    print(f"📚 코퍼스 저장소: {store.db_path} (파일 {stats['sources']}개, 이번에 가져온 문서 {imported}건)")
+    for kind, by_stance in stats['documents'].items():
+        counts = ", ".join(f"{stance} {count}" for stance, count in by_stance.items())
+        print(f"  {kind}: {counts}")
+    print(f"  본문 조각: {stats['passages']}")
+    store.close()
+
+def run_auto_debate(debate_manager: 'DebateManager', topic: str, **save_options):
     """자동으로 전체 토론을 실행합니다."""
     try:
         # 토론 시작
         start_result = debate_manager.start_debate(topic)
         
-        # 모든 라운드 진행
-        round_results = []
+        # 모든 라운드 진행 (재개한 경우 체크포인트에서 복원된 라운드부터)
+        round_results = list(debate_manager.round_results)
         while debate_manager.round_count < debate_manager.max_rounds:
             round_result = debate_manager.proceed_round()
             round_results.append(round_result)
@@ -165,18 +450,46 @@ def run_auto_debate(debate_manager: DebateManager, topic: str):
             'metadata': {
                 'timestamp': datetime.now().isoformat(),
                 'total_rounds': debate_manager.round_count,
-                'topic': topic
+                'topic': topic,
+                'model_routing': debate_manager.get_routing_stats(),
+                'output_budgets': debate_manager.get_output_budget_stats(),
+                'resources': debate_manager.get_resource_stats()
             }
         }
+        replay_stats = debate_manager.get_llm_replay_stats()
+        if replay_stats:
+            full_results['metadata']['llm_replay'] = replay_stats
         
-        save_debate_results(full_results, topic)
+        telemetry_report = debate_manager.get_telemetry_report()
+        save_debate_results(full_results, topic, telemetry_report, **save_options)
+        debate_manager.router.print_stats()
+        debate_manager.router.telemetry.print_report(telemetry_report)
+        print_replay_stats(replay_stats)
+        debate_manager.export_trace()
         
     except KeyboardInterrupt:
         print("\n\n토론이 중단되었습니다.")
+        print_resume_hint(debate_manager)
     except Exception as e:
         print(f"❌ 토론 중 오류 발생: {e}")
+        print_resume_hint(debate_manager)
+
+def print_replay_stats(replay_stats: Optional[Dict]):
+    """재생 일치율을 출력합니다 (녹화와 맞지 않은 요청이 있으면 경고)."""
+    if not replay_stats or replay_stats.get('mode') != 'replay':
+        return
+    hits, misses = replay_stats['hits'], replay_stats['misses']
+    print(f"📼 LLM 재생: 녹화 일치 {hits}건, 불일치 {misses}건")
+    if misses:
+        handled = "실패로 처리" if replay_stats['strict'] else "같은 제약의 다른 응답으로 대체"
+        print(f"⚠️ 녹화와 맞지 않은 요청 {misses}건을 {handled}했습니다 - 녹화 당시와 설정이 다를 수 있습니다")
+
+def print_resume_hint(debate_manager: 'DebateManager'):
+    """체크포인트가 있으면 이어서 진행하는 명령을 안내합니다."""
+    if debate_manager.checkpoint:
+        print(f"💾 이어서 진행: python main.py --auto --resume {debate_manager.checkpoint.debate_id}")
 
-def run_interactive_debate(debate_manager: DebateManager, topic: str):
+def run_interactive_debate(debate_manager: 'DebateManager', topic: str, **save_options):
     """대화형 모드로 토론을 진행합니다."""
     try:
         # 토론 시작
@@ -226,7 +539,12 @@ def run_interactive_debate(debate_manager: DebateManager, topic: str):
                         'topic': topic
                     }
                 }
-                save_debate_results(full_results, topic)
+                replay_stats = debate_manager.get_llm_replay_stats()
+                if replay_stats:
+                    full_results['metadata']['llm_replay'] = replay_stats
+                save_debate_results(full_results, topic, debate_manager.get_telemetry_report(), **save_options)
+                print_replay_stats(replay_stats)
+                debate_manager.export_trace()
                 break
                 
             elif command == 'save':
@@ -239,7 +557,7 @@ def run_interactive_debate(debate_manager: DebateManager, topic: str):
                         'status': 'in_progress'
                     }
                 }
-                save_debate_results(current_results, topic)
+                save_debate_results(current_results, topic, debate_manager.get_telemetry_report(), **save_options)
                 
             elif command == 'quit':
                 print("토론을 종료합니다.")
@@ -250,8 +568,10 @@ def run_interactive_debate(debate_manager: DebateManager, topic: str):
                 
     except KeyboardInterrupt:
         print("\n\n토론이 중단되었습니다.")
+        print_resume_hint(debate_manager)
     except Exception as e:
         print(f"❌ 토론 중 오류 발생: {e}")
+        print_resume_hint(debate_manager)
 
 def print_detailed_status(status: Dict):
     """상세한 토론 상태를 출력합니다."""
@@ -1,3 +1,9 @@
-from .rag_system import RAGSystem
+# RAGSystem은 llama_index를 끌어오므로 처음 접근할 때 불러옴 (utils.text_utils 등은 가볍게 import)
+__all__ = ['RAGSystem']
 
-__all__ = ['RAGSystem'] 
\ No newline at end of file
+
+def __getattr__(name):
+    if name == 'RAGSystem':
+        from .rag_system import RAGSystem
+        return RAGSystem
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,251 @@
+from itertools import groupby
+from typing import Dict, Iterator, List, Optional, Tuple
+import glob
+import json
+import os
+import re
+import sqlite3
+
+# ijson이 있으면 큰 JSON 배열도 항목 단위로 읽어 메모리 사용을 일정하게 유지
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+DEFAULT_CORPUS_DB = "data/corpus.db"
+
+# data/ 아래 크롤링 결과 파일과 문서 종류 (stance가 None이면 항목의 stance 필드 사용)
+DEFAULT_CORPUS_SOURCES: List[Tuple[str, str, Optional[str]]] = [
+    ("merged_progressive.json", "article", "진보"),
+    ("merged_conservative.json", "article", "보수"),
+    ("sentence_forfactcheck.json", "factcheck", None),
+    ("articles/*.json", "opinion", None),
+    ("comments/*.json", "comment", None),
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    documents INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    origin TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    source TEXT,
+    stance TEXT,
+    date TEXT,
+    url TEXT,
+    title TEXT,
+    doc_type TEXT,
+    likes INTEGER
+);
+CREATE TABLE IF NOT EXISTS passages (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_origin ON documents(origin);
+CREATE INDEX IF NOT EXISTS idx_documents_kind_stance ON documents(kind, stance);
+CREATE INDEX IF NOT EXISTS idx_documents_date ON documents(date);
+CREATE INDEX IF NOT EXISTS idx_documents_source ON documents(source);
+CREATE INDEX IF NOT EXISTS idx_passages_document ON passages(document_id, kind, seq);
+"""
+
+_DATE = re.compile(r'(\d{4})[-./](\d{1,2})[-./](\d{1,2})')
+
+_DOCUMENT_COLUMNS = ("id", "origin", "kind", "source", "stance", "date", "url", "title", "doc_type", "likes")
+
+
+def iter_json_array(path: str) -> Iterator[Dict]:
+    """JSON 배열 파일의 항목을 하나씩 돌려줍니다 (ijson이 없으면 파일 전체를 읽음)."""
+    with open(path, 'rb' if IJSON_AVAILABLE else 'r', **({} if IJSON_AVAILABLE else {'encoding': 'utf-8'})) as f:
+        if IJSON_AVAILABLE:
+            yield from ijson.items(f, 'item')
+        else:
+            yield from json.load(f)
+
+
+class CorpusStore:
+    """크롤링한 기사·팩트체크 문장·댓글을 SQLite에 타입이 있는 필드로 보관하는 코퍼스 저장소
+
+    - 문서(documents): 종류, 출처, 입장, 날짜, URL, 제목 (날짜·출처·입장 인덱스)
+    - 본문 조각(passages): 근거 문단(evidence), 근거 문장(sentence), 댓글(comment)
+    원본 JSON은 파일 크기·수정 시각이 바뀐 경우에만 다시 가져오고(sync), 조회는 커서를
+    조금씩 읽는 제너레이터로 제공해 코퍼스가 커져도 메모리에 전부 올리지 않는다.
+    본문은 SQLite 메모리 맵 I/O(mmap_size)로 읽어 페이지 캐시를 프로세스 간에 공유한다.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_CORPUS_DB, mmap_size: int = 256 * 1024 * 1024):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # ---------- 가져오기 ----------
+
+    @staticmethod
+    def _date(value) -> Optional[str]:
+        """크롤러마다 다른 날짜 표기(2025.07.15, 2025-07-15)를 YYYY-MM-DD로 맞춤"""
+        match = _DATE.search(str(value or ""))
+        if not match:
+            return value or None
+        year, month, day = match.groups()
+        return f"{year}-{int(month):02d}-{int(day):02d}"
+
+    @staticmethod
+    def _likes(value) -> Optional[int]:
+        try:
+            return int(str(value).replace(",", ""))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _passages(kind: str, item: Dict) -> List[Tuple[str, int, str]]:
+        if kind == "comment":
+            comment = item.get("comment", "")
+            # 크롤러가 문장 목록으로 저장한 댓글도 있음
+            comments = comment if isinstance(comment, list) else [comment]
+            return [("comment", i, text) for i, text in enumerate(comments) if text]
+        passages = [("evidence", i, text) for i, text in enumerate(item.get("evidence", [])) if text]
+        passages += [("sentence", i, text) for i, text in enumerate(item.get("evidence_sentences", [])) if text]
+        return passages
+
+    def import_file(self, path: str, kind: str, stance: Optional[str] = None, origin: Optional[str] = None,
+                    force: bool = False) -> int:
+        """JSON 배열 파일 하나를 가져오고 가져온 문서 수를 반환합니다.
+
+        파일이 마지막으로 가져온 뒤 바뀌지 않았으면 건너뛰고(0 반환), 바뀌었으면 그 파일에서
+        가져온 문서를 지우고 다시 가져온다 (force=True면 항상 다시 가져옴).
+        """
+        origin = origin or path
+        stat = os.stat(path)
+        row = self.conn.execute("SELECT mtime, size FROM sources WHERE path = ?", (origin,)).fetchone()
+        if row and not force and row['mtime'] == stat.st_mtime and row['size'] == stat.st_size:
+            return 0
+
+        count = 0
+        with self.conn:
+            self.conn.execute("DELETE FROM documents WHERE origin = ?", (origin,))
+            for item in iter_json_array(path):
+                if not isinstance(item, dict):
+                    continue
+                cursor = self.conn.execute(
+                    "INSERT INTO documents (origin, kind, source, stance, date, url, title, doc_type, likes) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (origin, kind, item.get("source"), stance or item.get("stance"), self._date(item.get("date")),
+                     item.get("url") or item.get("video_url"), item.get("title") or item.get("video_title"),
+                     item.get("type"), self._likes(item.get("like_count"))))
+                self.conn.executemany(
+                    "INSERT INTO passages (document_id, kind, seq, text) VALUES (?, ?, ?, ?)",
+                    [(cursor.lastrowid, passage_kind, seq, text)
+                     for passage_kind, seq, text in self._passages(kind, item)])
+                count += 1
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sources (path, kind, mtime, size, documents) VALUES (?, ?, ?, ?, ?)",
+                (origin, kind, stat.st_mtime, stat.st_size, count))
+        return count
+
+    def sync(self, data_dir: str = "data",
+             sources: List[Tuple[str, str, Optional[str]]] = DEFAULT_CORPUS_SOURCES) -> int:
+        """data_dir 아래 크롤링 결과 파일을 모두 가져옵니다 (바뀐 파일만). 가져온 문서 수를 반환합니다."""
+        imported = 0
+        for pattern, kind, stance in sources:
+            for path in sorted(glob.glob(os.path.join(data_dir, pattern))):
+                count = self.import_file(path, kind, stance, origin=os.path.relpath(path, data_dir))
+                if count:
+                    print(f"📚 코퍼스 가져오기: {path} ({count}건)")
+                imported += count
+        return imported
+
+    # ---------- 조회 ----------
+
+    @staticmethod
+    def _filters(kind=None, stance=None, source=None, origin=None, since=None, until=None):
+        clauses, params = [], []
+        for column, value in (("kind", kind), ("stance", stance), ("source", source), ("origin", origin)):
+            if value is not None:
+                clauses.append(f"d.{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("d.date >= ?")
+            params.append(since)
+        if until:
+            clauses.append("d.date <= ?")
+            params.append(until + "~" if len(until) == 10 else until)  # 날짜만 주면 그날 전체 포함
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def _stream(self, query: str, params: List, batch_size: int) -> Iterator[sqlite3.Row]:
+        cursor = self.conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+
+    def iter_documents(self, kind: Optional[str] = None, stance: Optional[str] = None,
+                       source: Optional[str] = None, origin: Optional[str] = None,
+                       since: Optional[str] = None, until: Optional[str] = None,
+                       batch_size: int = 500) -> Iterator[Dict]:
+        """조건에 맞는 문서를 본문 조각과 함께 하나씩 돌려줍니다.
+
+        반환 항목은 원본 JSON과 같은 키(evidence, evidence_sentences, comment)를 가진다.
+        """
+        where, params = self._filters(kind, stance, source, origin, since, until)
+        columns = ", ".join(f"d.{c}" for c in _DOCUMENT_COLUMNS)
+        query = (f"SELECT {columns}, p.kind AS passage_kind, p.text FROM documents d "
+                 f"LEFT JOIN passages p ON p.document_id = d.id {where} ORDER BY d.id, p.kind, p.seq")
+        for _, rows in groupby(self._stream(query, params, batch_size), key=lambda row: row['id']):
+            rows = list(rows)
+            document = {c: rows[0][c] for c in _DOCUMENT_COLUMNS}
+            document.update({"evidence": [], "evidence_sentences": [], "comment": []})
+            for row in rows:
+                if row['passage_kind'] == "evidence":
+                    document["evidence"].append(row['text'])
+                elif row['passage_kind'] == "sentence":
+                    document["evidence_sentences"].append(row['text'])
+                elif row['passage_kind'] == "comment":
+                    document["comment"].append(row['text'])
+            yield document
+
+    def iter_passages(self, passage_kind: str = "evidence", kind: Optional[str] = None,
+                      stance: Optional[str] = None, source: Optional[str] = None,
+                      origin: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+                      batch_size: int = 1000) -> Iterator[Dict]:
+        """본문 조각(근거 문단·문장·댓글)을 문서 메타데이터와 함께 하나씩 돌려줍니다."""
+        where, params = self._filters(kind, stance, source, origin, since, until)
+        where = f"{where} AND p.kind = ?" if where else "WHERE p.kind = ?"
+        query = (f"SELECT p.id, p.text, d.id AS document_id, d.kind, d.source, d.stance, d.date, d.url, d.title "
+                 f"FROM passages p JOIN documents d ON d.id = p.document_id {where} ORDER BY p.id")
+        for row in self._stream(query, params + [passage_kind], batch_size):
+            yield dict(row)
+
+    def get_passage(self, passage_id: int) -> Optional[str]:
+        row = self.conn.execute("SELECT text FROM passages WHERE id = ?", (passage_id,)).fetchone()
+        return row['text'] if row else None
+
+    def get_stats(self) -> Dict:
+        """종류·입장별 문서 수와 본문 조각 수"""
+        documents = {}
+        for row in self.conn.execute("SELECT kind, stance, COUNT(*) AS n FROM documents GROUP BY kind, stance"):
+            documents.setdefault(row['kind'], {})[row['stance'] or "-"] = row['n']
+        passages = {row['kind']: row['n'] for row in
+                    self.conn.execute("SELECT kind, COUNT(*) AS n FROM passages GROUP BY kind")}
+        return {"documents": documents, "passages": passages,
+                "sources": self.conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]}
@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from typing import List
+import numpy as np
+
+
+class EmbeddingCache:
+    """임베딩 모델 호출 결과를 텍스트 단위로 캐시하는 래퍼
+
+    RAGSystem이 이미 로드한 ko-sroberta(HuggingFaceEmbedding)를 재사용하며,
+    반환 벡터는 코사인 유사도를 내적으로 계산할 수 있도록 L2 정규화한다.
+    """
+
+    def __init__(self, embed_model, max_size: int = 20000, batch_size: int = 32, governor=None):
+        self.embed_model = embed_model
+        self.max_size = max_size
+        self.batch_size = batch_size
+        # ResourceGovernor: 배치마다 생성기와 겹치지 않는 시점을 기다림
+        self.governor = governor
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """texts의 정규화된 임베딩 행렬 (len(texts) x dim)을 반환합니다."""
+        missing = [t for t in dict.fromkeys(texts) if t not in self._cache]
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            if self.governor is not None:
+                with self.governor.embedding():
+                    vectors = self.embed_model.get_text_embedding_batch(batch)
+            else:
+                vectors = self.embed_model.get_text_embedding_batch(batch)
+            vectors = np.asarray(vectors, dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.maximum(norms, 1e-12)
+            for text, vector in zip(batch, vectors):
+                self._cache[text] = vector
+
+        rows = []
+        for text in texts:
+            self._cache.move_to_end(text)
+            rows.append(self._cache[text])
+
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+        if not rows:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(rows)
@@ -0,0 +1,78 @@
+from typing import Callable, Dict, List, Optional
+import re
+import numpy as np
+
+from .embeddings import EmbeddingCache
+from .text_utils import split_sentences, estimate_tokens
+
+_HAS_NUMBER = re.compile(r'\d')
+
+
+class EvidenceCompressor:
+    """검색된 기사에서 질의(주제, 상대 발언)와 관련된 문장만 골라내는 추출식 압축기
+
+    기사 전문 대신 상위 문장만 토큰 예산 안에서 남기고, 기사별 출처 꼬리표를 붙인다.
+    수치가 들어간 문장에는 가산점을 주어 통계 근거가 빠지지 않도록 한다.
+    """
+
+    def __init__(self, embedder: EmbeddingCache, min_sentence_chars: int = 15,
+                 number_bonus: float = 0.05, redundancy_threshold: float = 0.92):
+        self.embedder = embedder
+        self.min_sentence_chars = min_sentence_chars
+        self.number_bonus = number_bonus
+        self.redundancy_threshold = redundancy_threshold
+
+    def compress(self, docs: List[Dict], queries: List[str], token_budget: int,
+                 count_tokens: Optional[Callable[[str], int]] = None) -> str:
+        """docs(RAGSystem.search 결과)를 '- 문장들 (출처: ...)' 줄 목록으로 압축합니다."""
+        count_tokens = count_tokens or estimate_tokens
+        queries = [q for q in queries if q and q.strip()]
+
+        # (문서 번호, 문장 번호, 문장) 후보 수집
+        candidates = []
+        seen = set()
+        for doc_idx, doc in enumerate(docs):
+            for sent_idx, sentence in enumerate(split_sentences(doc.get('text', ''), self.min_sentence_chars)):
+                if sentence in seen:
+                    continue
+                seen.add(sentence)
+                candidates.append((doc_idx, sent_idx, sentence))
+
+        if not candidates or not queries or token_budget <= 0:
+            return ""
+
+        sentence_vecs = self.embedder.embed([c[2] for c in candidates])
+        query_vecs = self.embedder.embed(queries)
+        # 질의별 유사도의 평균 + 수치 문장 가산점
+        scores = (sentence_vecs @ query_vecs.T).mean(axis=1)
+        scores += np.array([self.number_bonus if _HAS_NUMBER.search(c[2]) else 0.0 for c in candidates])
+
+        # 출처 꼬리표가 차지할 토큰을 먼저 떼어 둠
+        tag_tokens = sum(count_tokens(f"- (출처: {doc.get('source', '')})\n") for doc in docs)
+
+        selected = []
+        used_tokens = tag_tokens
+        for idx in np.argsort(-scores):
+            doc_idx, _, sentence = candidates[idx]
+            # 이미 고른 문장과 거의 같은 내용이면 건너뜀
+            if selected and float(np.max(sentence_vecs[selected] @ sentence_vecs[idx])) >= self.redundancy_threshold:
+                continue
+            cost = count_tokens(sentence + " ")
+            if used_tokens + cost > token_budget:
+                continue
+            selected.append(int(idx))
+            used_tokens += cost
+
+        # 기사 순서, 기사 내 문장 순서대로 복원하고 출처 꼬리표를 붙임
+        by_doc = {}
+        for idx in sorted(selected, key=lambda i: (candidates[i][0], candidates[i][1])):
+            by_doc.setdefault(candidates[idx][0], []).append(candidates[idx][2])
+
+        lines = [f"- {' '.join(sentences)} (출처: {docs[doc_idx].get('source', '')})"
+                 for doc_idx, sentences in by_doc.items()]
+        compressed = "\n".join(lines)
+
+        original_tokens = sum(count_tokens(doc.get('text', '')) for doc in docs)
+        print(f"🗜️ 근거 압축: {original_tokens}토큰 → {count_tokens(compressed)}토큰 "
+              f"({len(selected)}/{len(candidates)}문장)")
+        return compressed
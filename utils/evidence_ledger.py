@@ -0,0 +1,154 @@
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import hashlib
+import os
+import sqlite3
+
+DEFAULT_EVIDENCE_LEDGER = "debate_results/evidence_ledger.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evidence (
+    id INTEGER PRIMARY KEY,
+    topic TEXT NOT NULL,
+    stance TEXT NOT NULL,
+    category TEXT NOT NULL,
+    normalized TEXT NOT NULL,
+    text TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    uses INTEGER NOT NULL DEFAULT 0,
+    gram_count INTEGER NOT NULL,
+    UNIQUE (topic, stance, category, normalized)
+);
+CREATE TABLE IF NOT EXISTS evidence_uses (
+    evidence_id INTEGER NOT NULL REFERENCES evidence(id) ON DELETE CASCADE,
+    statement_hash TEXT NOT NULL,
+    debate_id TEXT,
+    used_at TEXT NOT NULL,
+    PRIMARY KEY (evidence_id, statement_hash)
+);
+CREATE TABLE IF NOT EXISTS evidence_grams (
+    gram TEXT NOT NULL,
+    evidence_id INTEGER NOT NULL REFERENCES evidence(id) ON DELETE CASCADE,
+    PRIMARY KEY (gram, evidence_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_evidence_lookup ON evidence(topic, stance, uses DESC, last_seen DESC);
+CREATE INDEX IF NOT EXISTS idx_evidence_grams_evidence ON evidence_grams(evidence_id);
+"""
+
+
+def char_ngrams(text: str, n: int = 3) -> List[str]:
+    """공백을 뺀 글자 n-gram 집합 (n보다 짧으면 문자열 전체)"""
+    compact = "".join(text.split())
+    if len(compact) <= n:
+        return [compact] if compact else []
+    return sorted({compact[i:i + n] for i in range(len(compact) - n + 1)})
+
+
+def statement_hash(statement: str) -> str:
+    return hashlib.sha1(statement.encode('utf-8')).hexdigest()
+
+
+class EvidenceLedger:
+    """토론 간에 유지되는 근거 사용 장부 (주제·입장별, SQLite)
+
+    같은 근거가 여러 토론에서 반복되지 않도록, 토론 시작 때 이 주제에서 자주 쓰인 근거를 불러오고
+    발언마다 사용 기록을 더한다. 사용 횟수는 근거가 쓰인 서로 다른 발언 수라서
+    같은 발언을 여러 번 기록해도(라운드마다 이전 발언 재처리, 양측 추적기 모두 기록) 한 번만 센다.
+    정규화 키 조회는 고유 인덱스로, 유사 근거 후보 조회는 글자 3-gram 역색인으로 디스크에서 처리한다.
+    후보의 유사도는 호출한 쪽의 similarity 함수로 매겨, 메모리의 근거 비교와 같은 기준을 쓴다.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_EVIDENCE_LEDGER, ngram_size: int = 3):
+        self.db_path = db_path
+        self.ngram_size = ngram_size
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, topic: str, stance: str, items: List[Tuple[str, str, str]], statement: str,
+               debate_id: Optional[str] = None, timestamp: Optional[datetime] = None) -> int:
+        """한 발언에서 쓰인 근거 (카테고리, 정규화 키, 원문) 목록을 기록하고 새로 센 사용 수를 반환합니다."""
+        used_at = (timestamp or datetime.now()).isoformat()
+        digest = statement_hash(statement)
+        counted = 0
+        with self.conn:
+            for category, normalized, text in items:
+                grams = char_ngrams(normalized, self.ngram_size)
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO evidence (topic, stance, category, normalized, text, first_seen, last_seen, "
+                    "gram_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (topic, stance, category, normalized, text, used_at, used_at, len(grams)))
+                if cursor.rowcount:
+                    evidence_id = cursor.lastrowid
+                    self.conn.executemany("INSERT OR IGNORE INTO evidence_grams (gram, evidence_id) VALUES (?, ?)",
+                                          [(gram, evidence_id) for gram in grams])
+                else:
+                    evidence_id = self.conn.execute(
+                        "SELECT id FROM evidence WHERE topic = ? AND stance = ? AND category = ? AND normalized = ?",
+                        (topic, stance, category, normalized)).fetchone()[0]
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO evidence_uses (evidence_id, statement_hash, debate_id, used_at) "
+                    "VALUES (?, ?, ?, ?)", (evidence_id, digest, debate_id, used_at))
+                if cursor.rowcount:
+                    self.conn.execute("UPDATE evidence SET uses = uses + 1, last_seen = ? WHERE id = ?",
+                                      (used_at, evidence_id))
+                    counted += 1
+        return counted
+
+    def load(self, topic: str, stance: str, limit: int = 200) -> List[Dict]:
+        """주제·입장별로 많이 쓰인(같으면 최근) 근거를 limit개까지 반환합니다."""
+        rows = self.conn.execute(
+            "SELECT category, normalized, text, first_seen, last_seen, uses FROM evidence "
+            "WHERE topic = ? AND stance = ? ORDER BY uses DESC, last_seen DESC LIMIT ?",
+            (topic, stance, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def find(self, topic: str, stance: str, category: str, normalized: str,
+             similarity: Optional[Callable[[str, List[str]], Sequence[float]]] = None,
+             threshold: float = 0.86, max_candidates: int = 20) -> Optional[Dict]:
+        """정규화 키가 같은 근거를 찾고, 없으면 유사도가 threshold 이상인 가장 가까운 근거를 찾습니다.
+
+        유사 근거는 3-gram 역색인에서 겹치는 gram이 많은 후보 max_candidates개를 가져와
+        similarity(질의, 후보 키 목록)로 점수를 매긴다. similarity가 없으면 정규화 키 일치만 본다.
+        """
+        row = self.conn.execute(
+            "SELECT category, normalized, text, first_seen, last_seen, uses FROM evidence "
+            "WHERE topic = ? AND stance = ? AND category = ? AND normalized = ?",
+            (topic, stance, category, normalized)).fetchone()
+        if row:
+            return dict(row, similarity=1.0)
+
+        grams = char_ngrams(normalized, self.ngram_size)
+        if similarity is None or not grams:
+            return None
+        placeholders = ", ".join("?" * len(grams))
+        rows = self.conn.execute(
+            f"SELECT e.category, e.normalized, e.text, e.first_seen, e.last_seen, e.uses "
+            f"FROM evidence_grams g JOIN evidence e ON e.id = g.evidence_id "
+            f"WHERE g.gram IN ({placeholders}) AND e.topic = ? AND e.stance = ? AND e.category = ? "
+            f"GROUP BY e.id ORDER BY COUNT(*) DESC, e.uses DESC LIMIT ?",
+            grams + [topic, stance, category, max_candidates]).fetchall()
+        if not rows:
+            return None
+        scores = similarity(normalized, [row['normalized'] for row in rows])
+        best = max(range(len(rows)), key=lambda i: scores[i])
+        if scores[best] >= threshold:
+            return dict(rows[best], similarity=float(scores[best]))
+        return None
+
+    def get_stats(self, topic: Optional[str] = None) -> Dict:
+        where, params = ("WHERE topic = ?", [topic]) if topic else ("", [])
+        rows = self.conn.execute(
+            f"SELECT stance, COUNT(*) AS items, COALESCE(SUM(uses), 0) AS uses FROM evidence {where} GROUP BY stance",
+            params).fetchall()
+        return {row['stance']: {"items": row['items'], "uses": row['uses']} for row in rows}
@@ -1,14 +1,27 @@
-from llama_index.core import VectorStoreIndex, Document, StorageContext
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
-from llama_index.vector_stores.faiss import FaissVectorStore
-from typing import List, Dict, Optional
-import json
-import faiss
+from typing import Callable, List, Dict, Optional
+import os
+
+from .corpus_store import CorpusStore
+from .embeddings import EmbeddingCache
+from .evidence_compressor import EvidenceCompressor
+from .resource_governor import ResourceGovernor
+from .tracing import traced
 
 class RAGSystem:
-    def __init__(self, progressive_path: str, conservative_path: str):
+    def __init__(self, progressive_path: str, conservative_path: str,
+                 governor: Optional[ResourceGovernor] = None, corpus_db: Optional[str] = None):
         self.progressive_path = progressive_path
         self.conservative_path = conservative_path
+        # 코퍼스 JSON을 매번 통째로 파싱하지 않도록 같은 폴더의 SQLite 코퍼스 저장소를 거쳐 읽음
+        self.corpus_db = corpus_db or os.path.join(os.path.dirname(progressive_path), "corpus.db")
+        # 임베딩(질의·문장)을 llama.cpp 생성 사이 빈틈에 실행하도록 조정
+        self.governor = governor or ResourceGovernor.shared()
+
+        # llama_index·faiss·HuggingFace는 import만으로 수 초가 걸려 RAG를 실제로 쓸 때만 불러옴
+        from llama_index.core import StorageContext
+        from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+        from llama_index.vector_stores.faiss import FaissVectorStore
+        import faiss
 
         # 1. 임베딩 모델 불러오기
         self.embed_model = HuggingFaceEmbedding(model_name="jhgan/ko-sroberta-multitask")
@@ -21,32 +34,41 @@ class RAGSystem:
         self.index = None
         self.documents = []
 
+        # 검색 결과 압축용 (임베딩 모델 재사용, 문장 임베딩 캐시)
+        self.embedding_cache = EmbeddingCache(self.embed_model, governor=self.governor)
+        self.compressor = EvidenceCompressor(self.embedding_cache)
+
         self._load_documents()
 
     def _load_documents(self):
-        """진보 및 보수 문서 JSON을 로드하여 벡터 인덱스 생성"""
-        all_docs = []
+        """진보 및 보수 문서를 코퍼스 저장소에서 읽어 벡터 인덱스 생성 (JSON이 바뀌었으면 먼저 동기화)"""
+        from llama_index.core import VectorStoreIndex, Document
 
-        for path, stance in [
-            (self.progressive_path, "진보"),
-            (self.conservative_path, "보수")
-        ]:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                for article in data:
+        all_docs = []
+        store = CorpusStore(self.corpus_db)
+        try:
+            for path, stance in [
+                (self.progressive_path, "진보"),
+                (self.conservative_path, "보수")
+            ]:
+                origin = os.path.basename(path)
+                store.import_file(path, "article", stance, origin=origin)
+                for article in store.iter_documents(origin=origin):
                     # 🔁 evidence 리스트를 하나의 텍스트로 병합
-                    full_text = "\n".join(article.get("evidence", []))
+                    full_text = "\n".join(article["evidence"])
 
                     metadata = {
-                        "title": article.get("title", ""),
-                        "source": article.get("source", ""),
-                        "url": article.get("url", ""),
-                        "date": article.get("date", ""),
+                        "title": article["title"] or "",
+                        "source": article["source"] or "",
+                        "url": article["url"] or "",
+                        "date": article["date"] or "",
                         "stance": stance,
                     }
 
                     doc = Document(text=full_text, metadata=metadata)
                     all_docs.append(doc)
+        finally:
+            store.close()
 
         self.documents = all_docs
 
@@ -56,10 +78,12 @@ class RAGSystem:
             storage_context=self.storage_context
         )
 
+    @traced(category="rag")
     def search(self, query: str, stance_filter: Optional[str] = None, top_k: int = 5) -> List[Dict]:
         """질의어(query)를 바탕으로 관련 문단을 벡터 검색"""
         retriever = self.index.as_retriever(similarity_top_k=top_k)
-        retrieved_nodes = retriever.retrieve(query)
+        with self.governor.embedding():
+            retrieved_nodes = retriever.retrieve(query)
 
         results = []
         for node in retrieved_nodes:
@@ -76,8 +100,26 @@ class RAGSystem:
                 "stance": meta.get("stance")
             })
         return results
+
+    @traced(category="rag")
+    def compress_evidence(self, docs: List[Dict], focus_texts: List[str], token_budget: int = 350,
+                          count_tokens: Optional[Callable[[str], int]] = None) -> str:
+        """검색 결과를 주제·상대 발언과 관련된 문장만 남겨 토큰 예산 안으로 압축합니다."""
+        return self.compressor.compress(docs, focus_texts, token_budget, count_tokens)
     
-rag_system = RAGSystem(
-    progressive_path="C:/Users/User/LLM-Debate/data/merged_progressive.json",
-    conservative_path="C:/Users/User/LLM-Debate/data/merged_conservative.json"
-)
\ No newline at end of file
+DEFAULT_PROGRESSIVE_PATH = "C:/Users/User/LLM-Debate/data/merged_progressive.json"
+DEFAULT_CONSERVATIVE_PATH = "C:/Users/User/LLM-Debate/data/merged_conservative.json"
+
+_default_rag_system: Optional[RAGSystem] = None
+
+
+def get_rag_system(progressive_path: str = DEFAULT_PROGRESSIVE_PATH,
+                   conservative_path: str = DEFAULT_CONSERVATIVE_PATH) -> RAGSystem:
+    """기본 코퍼스로 만든 RAGSystem을 처음 요청될 때 한 번만 생성해 반환합니다.
+
+    (import 시점에 인덱스를 만들지 않으므로 코퍼스 경로가 다른 환경에서도 import가 가능)
+    """
+    global _default_rag_system
+    if _default_rag_system is None:
+        _default_rag_system = RAGSystem(progressive_path, conservative_path)
+    return _default_rag_system
@@ -0,0 +1,166 @@
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+import os
+import threading
+import time
+
+# psutil은 선택적으로 사용 (Windows에서 코어 고정)
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+def available_cores() -> List[int]:
+    """현재 프로세스가 쓸 수 있는 CPU 코어 번호 목록"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    if PSUTIL_AVAILABLE:
+        try:
+            return sorted(psutil.Process().cpu_affinity())
+        except Exception:
+            pass
+    return list(range(os.cpu_count() or 1))
+
+
+def _set_affinity(pid: int, cores: List[int], all_threads: bool = False) -> bool:
+    """pid(리눅스에서는 all_threads=True면 모든 스레드)를 cores에 고정합니다."""
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            # 리눅스의 sched_setaffinity는 스레드 단위이므로 이미 떠 있는 스레드까지 모두 고정
+            tids = [pid]
+            task_dir = f"/proc/{pid}/task"
+            if all_threads and os.path.isdir(task_dir):
+                tids = [int(tid) for tid in os.listdir(task_dir)]
+            for tid in tids:
+                os.sched_setaffinity(tid, cores)
+            return True
+        if PSUTIL_AVAILABLE:
+            psutil.Process(pid).cpu_affinity(cores)
+            return True
+    except Exception as e:
+        print(f"⚠️ CPU 코어 고정 실패 (pid {pid}): {e}")
+    return False
+
+
+class ResourceGovernor:
+    """임베딩 모델(torch)과 llama.cpp 생성기가 같은 CPU를 두고 경쟁하지 않도록 조정하는 관리자
+
+    - 코어 분할: 임베딩용 소수 코어와 생성기용 나머지 코어로 나누고, torch 스레드 수와
+      llama-cli 프로세스의 코어 고정(affinity), -t/-tb 스레드 수를 각각 그 안으로 제한한다.
+    - 스케줄링: 생성(프리필·디코드) 중에는 임베딩 배치를 잠시 미뤘다가 생성 사이 빈틈에
+      실행한다. 무한정 굶지 않도록 max_embed_wait초가 지나면 그대로 진행한다.
+
+    한 프로세스에서 여러 토론을 돌릴 때 모든 에이전트와 RAGSystem이 shared() 인스턴스를 공유한다.
+    """
+
+    _shared: Optional["ResourceGovernor"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_embed_wait: float = 2.0):
+        self.max_embed_wait = max_embed_wait
+        self.embed_cores: List[int] = []
+        self.generator_cores: List[int] = []
+        self.partitioned = False
+
+        self._cond = threading.Condition()
+        self._active_generations = 0
+        self.stats = {"generations": 0, "embed_batches": 0, "embed_waits": 0, "embed_wait_time": 0.0,
+                      "embed_wait_timeouts": 0}
+
+    @classmethod
+    def shared(cls) -> "ResourceGovernor":
+        """프로세스 전체에서 공유하는 인스턴스"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def configure(self, embed_threads: Optional[int] = None) -> None:
+        """코어를 임베딩/생성기용으로 나눕니다.
+
+        embed_threads가 None이면 코어 8개 이상일 때 1/8(최소 2개)을 임베딩에 배정하고,
+        0이면 분할하지 않습니다 (스케줄링만 사용).
+        """
+        cores = available_cores()
+        if embed_threads is None:
+            embed_threads = max(2, len(cores) // 8) if len(cores) >= 8 else 0
+        if embed_threads <= 0 or embed_threads >= len(cores):
+            self.partitioned = False
+            self.embed_cores, self.generator_cores = [], []
+            print(f"🎛️ 자원 관리: 코어 분할 없음 (CPU {len(cores)}개), 생성 중 임베딩 지연만 적용")
+            return
+
+        self.embed_cores = cores[:embed_threads]
+        self.generator_cores = cores[embed_threads:]
+        self.partitioned = True
+        self._configure_embedder()
+        print(f"🎛️ 자원 관리: 임베딩 코어 {len(self.embed_cores)}개, 생성기 코어 {len(self.generator_cores)}개")
+
+    def _configure_embedder(self) -> None:
+        # 임베딩은 이 파이썬 프로세스에서 돌므로 torch 스레드 수와 프로세스 코어를 임베딩 몫으로 제한
+        try:
+            import torch
+            torch.set_num_threads(len(self.embed_cores))
+        except Exception:
+            pass
+        _set_affinity(os.getpid(), self.embed_cores, all_threads=True)
+
+    def generator_threads(self, requested: int) -> int:
+        """생성기 스레드 수를 배정된 코어 수 이하로 제한합니다."""
+        if self.partitioned:
+            return max(1, min(requested, len(self.generator_cores)))
+        return requested
+
+    def generator_preexec(self) -> Optional[Callable[[], None]]:
+        """llama-cli가 exec 전에 생성기 코어로 옮겨 가도록 하는 Popen preexec_fn (리눅스)
+
+        부모 프로세스는 임베딩 코어에 고정돼 있어, 시작 후에 고정하면 그 사이 만들어진
+        llama-cli 작업 스레드가 임베딩 코어에 남는다. exec 전에 고정하면 모든 스레드가 물려받는다.
+        """
+        if self.partitioned and hasattr(os, "sched_setaffinity"):
+            cores = list(self.generator_cores)
+            return lambda: os.sched_setaffinity(0, cores)
+        return None
+
+    def pin_generator(self, pid: int) -> None:
+        """exec 전에 고정할 수 없는 플랫폼에서 시작한 llama-cli의 모든 스레드를 생성기 코어에 고정합니다."""
+        if self.partitioned:
+            _set_affinity(pid, self.generator_cores, all_threads=True)
+
+    @contextmanager
+    def generation(self):
+        """생성 구간 표시 (이 구간에는 임베딩 배치가 대기)"""
+        with self._cond:
+            self._active_generations += 1
+            self.stats["generations"] += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active_generations -= 1
+                self._cond.notify_all()
+
+    @contextmanager
+    def embedding(self):
+        """임베딩 배치 하나를 생성 사이 빈틈에 실행 (최대 max_embed_wait초 대기)"""
+        with self._cond:
+            self.stats["embed_batches"] += 1
+            if self._active_generations:
+                start = time.perf_counter()
+                idle = self._cond.wait_for(lambda: self._active_generations == 0, timeout=self.max_embed_wait)
+                self.stats["embed_waits"] += 1
+                self.stats["embed_wait_time"] += time.perf_counter() - start
+                if not idle:
+                    self.stats["embed_wait_timeouts"] += 1
+        yield
+
+    def get_stats(self) -> Dict:
+        return {
+            "partitioned": self.partitioned,
+            "embed_cores": len(self.embed_cores),
+            "generator_cores": len(self.generator_cores),
+            **self.stats,
+            "embed_wait_time": round(self.stats["embed_wait_time"], 3),
+        }
@@ -0,0 +1,285 @@
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import json
+import os
+import sqlite3
+
+DEFAULT_RESULTS_DB = "debate_results/debates.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS debates (
+    id INTEGER PRIMARY KEY,
+    topic TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'completed',
+    total_rounds INTEGER,
+    moderator_intro TEXT,
+    moderator_conclusion TEXT,
+    summary TEXT,
+    source TEXT,
+    results_json TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS statements (
+    id INTEGER PRIMARY KEY,
+    debate_id INTEGER NOT NULL REFERENCES debates(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    round INTEGER,
+    stance TEXT,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS evidence (
+    id INTEGER PRIMARY KEY,
+    debate_id INTEGER NOT NULL REFERENCES debates(id) ON DELETE CASCADE,
+    statement_id INTEGER NOT NULL REFERENCES statements(id) ON DELETE CASCADE,
+    stance TEXT,
+    category TEXT NOT NULL,
+    item TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS telemetry (
+    debate_id INTEGER PRIMARY KEY REFERENCES debates(id) ON DELETE CASCADE,
+    report_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_debates_topic ON debates(topic);
+CREATE INDEX IF NOT EXISTS idx_debates_created ON debates(created_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_debates_source ON debates(source) WHERE source IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_statements_debate ON statements(debate_id, seq);
+CREATE INDEX IF NOT EXISTS idx_statements_stance_round ON statements(stance, round);
+CREATE INDEX IF NOT EXISTS idx_evidence_debate ON evidence(debate_id);
+CREATE INDEX IF NOT EXISTS idx_evidence_statement ON evidence(statement_id);
+CREATE INDEX IF NOT EXISTS idx_evidence_item ON evidence(category, item);
+"""
+
+
+def extract_statements(results: Dict) -> List[Dict]:
+    """결과 JSON에서 발언 목록(round, stance, statement)을 꺼냅니다 (자동·대화형·중간 저장 형식 모두)."""
+    summary = results.get('summary_result') or {}
+    if summary.get('all_statements'):
+        return summary['all_statements']
+    if results.get('current_statements'):
+        return results['current_statements']
+    statements = []
+    for i, round_result in enumerate(results.get('round_results', []), 1):
+        round_number = round_result.get('round', i)
+        for stance, key in (('진보', 'progressive_statement'), ('보수', 'conservative_statement')):
+            if round_result.get(key):
+                statements.append({'round': round_number, 'stance': stance, 'statement': round_result[key]})
+    return statements
+
+
+class DebateResultsStore:
+    """토론 결과(발언·요약·근거·텔레메트리)를 SQLite에 저장하고 검색하는 저장소
+
+    발언과 요약은 FTS5 전문 검색 인덱스로, 주제·날짜·입장·라운드는 일반 인덱스로 찾는다.
+    한국어는 조사가 붙어 단어 단위 토큰화로는 검색이 잘 안 되므로 trigram 토크나이저를 쓰고
+    (SQLite 3.34+), FTS5가 없거나 검색어가 3자 미만이면 LIKE 검색으로 대신한다.
+    원본 결과 JSON도 그대로 보관해 기존 JSON/MD 형식으로 내보낼 수 있다.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_RESULTS_DB):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_SCHEMA)
+        self.fts_available = self._create_fts()
+        self.conn.commit()
+
+    def _create_fts(self) -> bool:
+        for tokenizer in ("trigram", "unicode61"):
+            try:
+                self.conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS statements_fts USING fts5("
+                    f"text, content='statements', content_rowid='id', tokenize='{tokenizer}')")
+                self.conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS debates_fts USING fts5("
+                    f"topic, summary, moderator_conclusion, content='debates', content_rowid='id', tokenize='{tokenizer}')")
+                self.fts_tokenizer = tokenizer
+                return True
+            except sqlite3.OperationalError:
+                continue
+        self.fts_tokenizer = ""
+        print("⚠️ SQLite FTS5를 사용할 수 없습니다 - LIKE 검색 사용")
+        return False
+
+    def close(self):
+        self.conn.close()
+
+    def save_debate(self, results: Dict, topic: str, telemetry_report: Optional[Dict] = None,
+                    evidence_extractor: Optional[Callable[[str], Dict[str, List[str]]]] = None,
+                    source: Optional[str] = None) -> int:
+        """결과 JSON 하나를 저장하고 토론 ID를 반환합니다.
+
+        evidence_extractor(발언) → {분류: [근거, ...]}가 주어지면 발언별 근거도 색인합니다.
+        source(원본 파일명)가 이미 저장돼 있으면 다시 넣지 않고 기존 ID를 반환합니다.
+        """
+        if source:
+            row = self.conn.execute("SELECT id FROM debates WHERE source = ?", (source,)).fetchone()
+            if row:
+                return row['id']
+
+        metadata = results.get('metadata', {})
+        summary = results.get('summary_result') or {}
+        start = results.get('start_result') or {}
+        statements = extract_statements(results)
+
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO debates (topic, created_at, status, total_rounds, moderator_intro, "
+                "moderator_conclusion, summary, source, results_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (topic, metadata.get('timestamp') or datetime.now().isoformat(),
+                 metadata.get('status', 'completed'), metadata.get('total_rounds'),
+                 start.get('moderator_intro'), summary.get('moderator_conclusion'), summary.get('summary'),
+                 source, json.dumps(results, ensure_ascii=False)))
+            debate_id = cursor.lastrowid
+            if self.fts_available:
+                self.conn.execute(
+                    "INSERT INTO debates_fts (rowid, topic, summary, moderator_conclusion) VALUES (?, ?, ?, ?)",
+                    (debate_id, topic, summary.get('summary') or "", summary.get('moderator_conclusion') or ""))
+
+            for seq, statement in enumerate(statements):
+                text = statement.get('statement', '')
+                stance = statement.get('stance')
+                cursor = self.conn.execute(
+                    "INSERT INTO statements (debate_id, seq, round, stance, text) VALUES (?, ?, ?, ?, ?)",
+                    (debate_id, seq, statement.get('round'), stance, text))
+                statement_id = cursor.lastrowid
+                if self.fts_available:
+                    self.conn.execute("INSERT INTO statements_fts (rowid, text) VALUES (?, ?)", (statement_id, text))
+                if evidence_extractor and text:
+                    rows = [(debate_id, statement_id, stance, category, item)
+                            for category, items in evidence_extractor(text).items() for item in items]
+                    self.conn.executemany(
+                        "INSERT INTO evidence (debate_id, statement_id, stance, category, item) VALUES (?, ?, ?, ?, ?)",
+                        rows)
+
+            if telemetry_report:
+                self.conn.execute("INSERT INTO telemetry (debate_id, report_json) VALUES (?, ?)",
+                                  (debate_id, json.dumps(telemetry_report, ensure_ascii=False)))
+        return debate_id
+
+    def delete_debate(self, debate_id: int):
+        with self.conn:
+            if self.fts_available:
+                for row in self.conn.execute("SELECT id, text FROM statements WHERE debate_id = ?", (debate_id,)):
+                    self.conn.execute("INSERT INTO statements_fts (statements_fts, rowid, text) VALUES ('delete', ?, ?)",
+                                      (row['id'], row['text']))
+                row = self.conn.execute("SELECT topic, summary, moderator_conclusion FROM debates WHERE id = ?",
+                                        (debate_id,)).fetchone()
+                if row:
+                    self.conn.execute(
+                        "INSERT INTO debates_fts (debates_fts, rowid, topic, summary, moderator_conclusion) "
+                        "VALUES ('delete', ?, ?, ?, ?)",
+                        (debate_id, row['topic'], row['summary'] or "", row['moderator_conclusion'] or ""))
+            self.conn.execute("DELETE FROM debates WHERE id = ?", (debate_id,))
+
+    @staticmethod
+    def _date_filters(since: Optional[str], until: Optional[str], column: str = "d.created_at"):
+        clauses, params = [], []
+        if since:
+            clauses.append(f"{column} >= ?")
+            params.append(since)
+        if until:
+            # 날짜만 주면 그날 전체 포함
+            clauses.append(f"{column} <= ?")
+            params.append(until + "T99" if len(until) == 10 else until)
+        return clauses, params
+
+    def _use_fts(self, text: str) -> bool:
+        return self.fts_available and (self.fts_tokenizer != "trigram" or len(text) >= 3)
+
+    @staticmethod
+    def _fts_phrase(text: str) -> str:
+        return '"' + text.replace('"', '""') + '"'
+
+    def search_statements(self, text: Optional[str] = None, topic: Optional[str] = None,
+                          stance: Optional[str] = None, round_number: Optional[int] = None,
+                          since: Optional[str] = None, until: Optional[str] = None,
+                          evidence: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """발언을 전문 검색어·주제·입장·라운드·날짜·근거로 찾습니다 (최신 토론 우선)."""
+        clauses, params = self._date_filters(since, until)
+        joins = ""
+        snippet = "substr(s.text, 1, 120)"
+        if text and self._use_fts(text):
+            joins = "JOIN statements_fts f ON f.rowid = s.id"
+            clauses.append("statements_fts MATCH ?")
+            params.append(self._fts_phrase(text))
+            snippet = "snippet(statements_fts, 0, '[', ']', '…', 48)"
+        elif text:
+            clauses.append("s.text LIKE ?")
+            params.append(f"%{text}%")
+        if topic:
+            clauses.append("d.topic LIKE ?")
+            params.append(f"%{topic}%")
+        if stance:
+            clauses.append("s.stance = ?")
+            params.append(stance)
+        if round_number is not None:
+            clauses.append("s.round = ?")
+            params.append(round_number)
+        if evidence:
+            clauses.append("s.id IN (SELECT e.statement_id FROM evidence e WHERE e.item LIKE ?)")
+            params.append(f"%{evidence}%")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = (f"SELECT s.debate_id, d.topic, d.created_at, s.round, s.stance, {snippet} AS snippet "
+                 f"FROM statements s JOIN debates d ON d.id = s.debate_id {joins} {where} "
+                 f"ORDER BY d.created_at DESC, s.seq LIMIT ?")
+        return [dict(row) for row in self.conn.execute(query, params + [limit])]
+
+    def list_debates(self, text: Optional[str] = None, topic: Optional[str] = None,
+                     since: Optional[str] = None, until: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """토론 목록 (text는 주제·요약·사회자 마무리 전문 검색)"""
+        clauses, params = self._date_filters(since, until)
+        joins = ""
+        if text and self._use_fts(text):
+            joins = "JOIN debates_fts f ON f.rowid = d.id"
+            clauses.append("debates_fts MATCH ?")
+            params.append(self._fts_phrase(text))
+        elif text:
+            clauses.append("(d.topic LIKE ? OR d.summary LIKE ? OR d.moderator_conclusion LIKE ?)")
+            params += [f"%{text}%"] * 3
+        if topic:
+            clauses.append("d.topic LIKE ?")
+            params.append(f"%{topic}%")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = (f"SELECT d.id, d.topic, d.created_at, d.status, d.total_rounds, "
+                 f"(SELECT COUNT(*) FROM statements s WHERE s.debate_id = d.id) AS statements "
+                 f"FROM debates d {joins} {where} ORDER BY d.created_at DESC LIMIT ?")
+        return [dict(row) for row in self.conn.execute(query, params + [limit])]
+
+    def get_results(self, debate_id: int) -> Optional[Dict]:
+        """저장된 원본 결과 JSON과 텔레메트리 보고서를 반환합니다."""
+        row = self.conn.execute("SELECT topic, results_json FROM debates WHERE id = ?", (debate_id,)).fetchone()
+        if not row:
+            return None
+        telemetry = self.conn.execute("SELECT report_json FROM telemetry WHERE debate_id = ?",
+                                      (debate_id,)).fetchone()
+        return {
+            'topic': row['topic'],
+            'results': json.loads(row['results_json']),
+            'telemetry_report': json.loads(telemetry['report_json']) if telemetry else None
+        }
+
+    def statement_texts(self) -> List[Dict]:
+        """저장된 모든 발언의 전문 (저장 순서대로, search_statements와 달리 잘라 내지 않음)"""
+        query = ("SELECT s.debate_id, s.round, s.stance, s.text FROM statements s "
+                 "JOIN debates d ON d.id = s.debate_id ORDER BY d.created_at, d.id, s.seq")
+        return [dict(row) for row in self.conn.execute(query)]
+
+    def imported_sources(self) -> set:
+        """import로 가져온 원본 결과 파일명들"""
+        return {row['source'] for row in self.conn.execute("SELECT source FROM debates WHERE source IS NOT NULL")}
+
+    def get_evidence(self, debate_id: int) -> List[Dict]:
+        query = ("SELECT s.round, e.stance, e.category, e.item FROM evidence e "
+                 "JOIN statements s ON s.id = e.statement_id WHERE e.debate_id = ? ORDER BY s.seq, e.id")
+        return [dict(row) for row in self.conn.execute(query, (debate_id,))]
+
+    def count(self) -> Dict:
+        return {table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("debates", "statements", "evidence")}
@@ -0,0 +1,41 @@
+from typing import List, Tuple
+import re
+
+# 한국어 문장 경계: 마침표/물음표/느낌표(+닫는 따옴표) 뒤 공백, 또는 줄바꿈
+_SENTENCE_SPLIT = re.compile(r'(?<=[.?!])["\'”’)]?\s+|\n+')
+
+
+def split_sentences(text: str, min_chars: int = 1) -> List[str]:
+    """텍스트를 문장 단위로 나눕니다 (앞뒤 공백 제거, min_chars 미만 제외)."""
+    if not text:
+        return []
+    sentences = []
+    last = 0
+    for match in _SENTENCE_SPLIT.finditer(text):
+        sentences.append(text[last:match.end()].strip())
+        last = match.end()
+    sentences.append(text[last:].strip())
+    return [s for s in sentences if len(s) >= min_chars]
+
+
+def split_sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """문장별 (시작, 끝) 글자 위치를 반환합니다 (앞뒤 공백 제외)."""
+    if not text:
+        return []
+    spans = []
+    last = 0
+    boundaries = [m.end() for m in _SENTENCE_SPLIT.finditer(text)] + [len(text)]
+    for boundary in boundaries:
+        # 닫는 따옴표 등 경계 정규식이 삼킨 문자는 문장에 포함
+        segment = text[last:boundary]
+        start = last + (len(segment) - len(segment.lstrip()))
+        end = last + len(segment.rstrip())
+        if end > start:
+            spans.append((start, end))
+        last = boundary
+    return spans
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 토큰 수를 추정합니다 (한국어 약 1.5자당 1토큰)."""
+    return -(-len(text) * 2 // 3) if text else 0
@@ -0,0 +1,189 @@
+from typing import Dict, List, Optional, Tuple, Union
+import base64
+import hashlib
+import re
+import numpy as np
+
+from .embeddings import EmbeddingCache
+
+_WORD = re.compile(r'[가-힣A-Za-z0-9]+')
+# 명사 뒤에 붙는 조사 (긴 것부터 제거)
+_PARTICLES = sorted([
+    "에서는", "에서도", "으로는", "으로도", "에게서", "이라는", "까지", "부터", "에서", "으로", "에게", "한테",
+    "처럼", "보다", "라는", "이며", "이고", "은", "는", "이", "가", "을", "를", "의", "에", "로", "와", "과", "도", "만",
+], key=len, reverse=True)
+# 용언·어미로 끝나는 어절은 명사구 후보에서 제외
+_PREDICATE_ENDINGS = (
+    "다", "니다", "하는", "하여", "해야", "했던", "하고", "하며", "하면", "하게", "되는", "되어", "되고", "있는", "없는",
+    "같은", "위한", "통한", "대한", "지만", "는데", "으며", "으면", "니까", "어서", "아서", "려면",
+    "되", "돼", "게", "하지", "못한", "않은", "않는",
+)
+# 관형형·연결형 어미 (두 글자 명사와 겹치는 경우가 많아 세 글자 이상 어절에만 적용)
+_MODIFIER_ENDINGS = ("한", "된", "될", "할", "던", "진", "는", "면", "고", "며", "하", "라고")
+_STOPWORDS = {
+    "그리고", "하지만", "그러나", "또한", "따라서", "우리", "저희", "여러분", "이것", "그것", "이런", "그런", "이번", "지금",
+    "오늘", "정말", "매우", "바로", "모든", "가장", "말씀", "생각", "부분", "경우", "때문", "정도", "이상", "이하", "측면",
+    "진보", "보수", "상대", "상대방", "주장", "토론", "국민", "우리나라", "지난", "실제", "특히", "이미", "다시",
+    "또는", "혹은", "아울러", "이를", "이는", "이라", "있을", "없을", "오는", "높은", "낮은", "많은", "혹여", "대비", "겨우", "다소", "나눠", "넘는",
+    "그는", "그가", "그의", "데는",
+}
+
+
+class HashingEmbedder:
+    """임베딩 모델이 없을 때 쓰는 글자 n-gram 해싱 임베딩 (결정적, 학습·모델 로딩 없음)"""
+
+    def __init__(self, n_features: int = 4096):
+        self.n_features = n_features
+        self._vectorizer = None
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.n_features), dtype=np.float32)
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            self._vectorizer = HashingVectorizer(analyzer="char_wb", ngram_range=(2, 4),
+                                                 n_features=self.n_features, alternate_sign=False, norm="l2")
+        return self._vectorizer.transform(texts).toarray().astype(np.float32)
+
+
+def pack_vector(vector: np.ndarray) -> Dict:
+    """중심 벡터를 체크포인트용으로 압축합니다.
+
+    해싱 임베딩처럼 0이 대부분이면 0이 아닌 위치와 값만, 아니면 전체를 float16 base64로 담습니다.
+    """
+    vector = np.asarray(vector, dtype=np.float32)
+    nonzero = np.flatnonzero(vector)
+    if len(nonzero) * 3 < len(vector):
+        return {"dim": len(vector),
+                "idx": base64.b64encode(nonzero.astype(np.int32).tobytes()).decode('ascii'),
+                "val": base64.b64encode(vector[nonzero].astype(np.float16).tobytes()).decode('ascii')}
+    return {"dim": len(vector), "f16": base64.b64encode(vector.astype(np.float16).tobytes()).decode('ascii')}
+
+
+def unpack_vector(packed: Union[Dict, List[float]]) -> np.ndarray:
+    """pack_vector()의 결과(또는 예전 체크포인트의 float 목록)를 float32 벡터로 되돌립니다."""
+    if not isinstance(packed, dict):
+        return np.asarray(packed, dtype=np.float32)
+    if "f16" in packed:
+        return np.frombuffer(base64.b64decode(packed["f16"]), dtype=np.float16).astype(np.float32)
+    vector = np.zeros(packed["dim"], dtype=np.float32)
+    indices = np.frombuffer(base64.b64decode(packed["idx"]), dtype=np.int32)
+    vector[indices] = np.frombuffer(base64.b64decode(packed["val"]), dtype=np.float16)
+    return vector
+
+
+def extract_candidates(text: str, max_candidates: int = 40) -> List[str]:
+    """조사를 떼어 낸 명사 어절과, 조사 없이 이어진 두 어절(복합 명사구)을 후보로 뽑습니다."""
+    candidates: Dict[str, None] = {}
+    previous = None
+    for word in _WORD.findall(text or ""):
+        stem = word
+        # 조사가 겹친 경우(예: "순간에는")까지 두 번 떼어 냄
+        for _ in range(2):
+            particle = next((p for p in _PARTICLES if stem.endswith(p) and len(stem) - len(p) >= 2), None)
+            if not particle:
+                break
+            stem = stem[:-len(particle)]
+        # 수치는 근거로 따로 추적하므로 주제 후보에서 뺌
+        is_noun = (len(stem) >= 2 and not any(ch.isdigit() for ch in stem) and stem not in _STOPWORDS
+                   and not stem.endswith(_PREDICATE_ENDINGS)
+                   and not (len(stem) >= 3 and stem.endswith(_MODIFIER_ENDINGS)))
+        if not is_noun:
+            previous = None
+            continue
+        candidates.setdefault(stem)
+        if previous:
+            candidates.setdefault(f"{previous} {stem}")
+        # 조사가 붙은 어절 뒤에서는 명사구가 끊김
+        previous = stem if stem == word else None
+        if len(candidates) >= max_candidates:
+            break
+    return list(candidates)
+
+
+class TopicEngine:
+    """문장 임베딩과 명사구 후보로 핵심 주제를 뽑고, 토론 전체에서 주제를 점진적으로 묶는 엔진
+
+    - 후보 명사구 중 발언 임베딩과 가까운 것을 MMR(관련도·다양성 균형)로 고른다.
+    - 고른 구는 기존 주제 중심과 similarity_threshold 이상 가까우면 그 주제에 합치고, 아니면 새 주제를 만든다.
+      주제 ID는 처음 만든 구의 해시라 같은 토론을 다시 돌려도 같다.
+    - 과거 발언은 주제 중심과의 임베딩 유사도로 순위를 매긴다.
+    embedder가 없으면(RAG 미사용) 글자 n-gram 해싱 임베딩으로 대신한다.
+    """
+
+    def __init__(self, embedder: Optional[EmbeddingCache] = None, similarity_threshold: Optional[float] = None,
+                 diversity: float = 0.3):
+        self.embedder = embedder or HashingEmbedder()
+        # 해싱 임베딩은 같은 주제라도 유사도가 낮게 나와 기준을 낮춤
+        if similarity_threshold is None:
+            similarity_threshold = 0.5 if isinstance(self.embedder, HashingEmbedder) else 0.75
+        self.similarity_threshold = similarity_threshold
+        self.diversity = diversity
+        # 주제 ID → {"label": 대표 구, "centroid": 정규화된 중심 벡터, "count": 합쳐진 구 수}
+        self.topics: Dict[str, Dict] = {}
+
+    def extract(self, text: str, top_k: int = 3) -> List[Dict]:
+        """text의 핵심 주제 top_k개를 [{id, label, phrase, score}]로 반환합니다."""
+        candidates = extract_candidates(text)
+        if not candidates:
+            return []
+        vectors = self.embedder.embed([text] + candidates)
+        doc_vec, cand_vecs = vectors[0], vectors[1:]
+        relevance = cand_vecs @ doc_vec
+
+        # MMR: 관련도가 높으면서 이미 고른 구와 겹치지 않는 후보 (동점이면 먼저 나온 후보)
+        selected: List[int] = []
+        remaining = list(range(len(candidates)))
+        while remaining and len(selected) < top_k:
+            if selected:
+                redundancy = (cand_vecs[remaining] @ cand_vecs[selected].T).max(axis=1)
+            else:
+                redundancy = np.zeros(len(remaining), dtype=np.float32)
+            scores = (1 - self.diversity) * relevance[remaining] - self.diversity * redundancy
+            best = remaining[int(np.argmax(scores))]
+            selected.append(best)
+            remaining.remove(best)
+
+        results = []
+        for idx in selected:
+            topic_id = self._assign(candidates[idx], cand_vecs[idx])
+            results.append({"id": topic_id, "label": self.topics[topic_id]["label"],
+                            "phrase": candidates[idx], "score": float(relevance[idx])})
+        return results
+
+    def _assign(self, phrase: str, vector: np.ndarray) -> str:
+        """구를 가장 가까운 주제에 합치거나 새 주제를 만들고 주제 ID를 반환합니다."""
+        if self.topics:
+            topic_ids = list(self.topics)
+            centroids = np.vstack([self.topics[t]["centroid"] for t in topic_ids])
+            similarities = centroids @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.similarity_threshold:
+                topic = self.topics[topic_ids[best]]
+                merged = topic["centroid"] * topic["count"] + vector
+                topic["centroid"] = merged / max(float(np.linalg.norm(merged)), 1e-12)
+                topic["count"] += 1
+                return topic_ids[best]
+
+        topic_id = "topic-" + hashlib.sha1(phrase.encode('utf-8')).hexdigest()[:8]
+        self.topics[topic_id] = {"label": phrase, "centroid": np.asarray(vector, dtype=np.float32), "count": 1}
+        return topic_id
+
+    def rank(self, texts: List[str], topic_ids: List[str]) -> List[Tuple[int, float]]:
+        """texts를 주어진 주제들과의 최대 유사도 순으로 (인덱스, 유사도) 목록으로 반환합니다."""
+        topic_ids = [t for t in topic_ids if t in self.topics]
+        if not texts or not topic_ids:
+            return []
+        centroids = np.vstack([self.topics[t]["centroid"] for t in topic_ids])
+        scores = (self.embedder.embed(texts) @ centroids.T).max(axis=1)
+        # 유사도가 같으면 원래 순서 유지
+        order = sorted(range(len(texts)), key=lambda i: (-scores[i], i))
+        return [(i, float(scores[i])) for i in order]
+
+    def export_state(self) -> Dict:
+        return {topic_id: {"label": t["label"], "centroid": pack_vector(t["centroid"]), "count": t["count"]}
+                for topic_id, t in self.topics.items()}
+
+    def load_state(self, state: Dict):
+        self.topics = {topic_id: {"label": t["label"], "centroid": unpack_vector(t["centroid"]), "count": t["count"]}
+                       for topic_id, t in (state or {}).items()}
@@ -0,0 +1,189 @@
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional
+import json
+import os
+import random
+import threading
+import time
+
+
+class Tracer:
+    """중첩 구간(span)을 기록해 Chrome trace-event 또는 OTLP JSON으로 내보내는 경량 추적기
+
+    비활성 상태에서는 span()이 아무것도 기록하지 않으므로 계측 코드를 그대로 둬도 된다.
+    Chrome 형식은 chrome://tracing 또는 https://ui.perfetto.dev 에서 플레임 차트로 열린다.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.spans: List[Dict] = []
+        self.trace_id = ""
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._epoch_ns = time.time_ns() - time.perf_counter_ns()
+
+    def enable(self):
+        self.enabled = True
+        if not self.trace_id:
+            self.reset()
+
+    def reset(self):
+        """새 추적을 시작합니다 (기록된 구간 삭제)."""
+        with self._lock:
+            self.spans = []
+            self.trace_id = f"{random.getrandbits(128):032x}"
+
+    def _stack(self) -> List[Dict]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _now_ns(self) -> int:
+        return self._epoch_ns + time.perf_counter_ns()
+
+    @contextmanager
+    def span(self, name: str, category: str = "", **attributes):
+        """구간 하나를 기록합니다. 안에서 set_attribute()로 결과 값을 덧붙일 수 있습니다."""
+        if not self.enabled:
+            yield None
+            return
+
+        stack = self._stack()
+        record = {
+            "name": name,
+            "category": category,
+            "span_id": f"{random.getrandbits(64):016x}",
+            "parent_id": stack[-1]["span_id"] if stack else "",
+            "start_ns": self._now_ns(),
+            "end_ns": 0,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "attributes": dict(attributes),
+        }
+        stack.append(record)
+        try:
+            yield record
+        except Exception as e:
+            record["attributes"]["error"] = str(e)[:200]
+            raise
+        finally:
+            stack.pop()
+            record["end_ns"] = self._now_ns()
+            with self._lock:
+                self.spans.append(record)
+
+    def set_attribute(self, key: str, value):
+        """현재 열린 구간에 속성을 추가합니다."""
+        stack = self._stack() if self.enabled else []
+        if stack:
+            stack[-1]["attributes"][key] = value
+
+    def add_span(self, name: str, start_ns: int, end_ns: int, category: str = "", **attributes):
+        """이미 끝난 구간(예: llama.cpp가 보고한 프리필/디코드 시간)을 현재 구간의 자식으로 추가합니다."""
+        if not self.enabled:
+            return
+        stack = self._stack()
+        with self._lock:
+            self.spans.append({
+                "name": name,
+                "category": category,
+                "span_id": f"{random.getrandbits(64):016x}",
+                "parent_id": stack[-1]["span_id"] if stack else "",
+                "start_ns": start_ns,
+                "end_ns": end_ns,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "attributes": dict(attributes),
+            })
+
+    def now_ns(self) -> int:
+        return self._now_ns()
+
+    def to_chrome(self) -> Dict:
+        """Chrome trace-event 형식 (ph: X 완료 이벤트, 마이크로초 단위)"""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start_ns"])
+        events = [{
+            "name": s["name"],
+            "cat": s["category"] or "debate",
+            "ph": "X",
+            "ts": s["start_ns"] / 1000,
+            "dur": max(0, s["end_ns"] - s["start_ns"]) / 1000,
+            "pid": s["pid"],
+            "tid": s["tid"],
+            "args": s["attributes"],
+        } for s in spans]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_otlp(self, service_name: str = "llm-debate") -> Dict:
+        """OpenTelemetry OTLP/JSON 형식 (resourceSpans)"""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start_ns"])
+
+        def attribute(key, value):
+            if isinstance(value, bool):
+                return {"key": key, "value": {"boolValue": value}}
+            if isinstance(value, int):
+                return {"key": key, "value": {"intValue": str(value)}}
+            if isinstance(value, float):
+                return {"key": key, "value": {"doubleValue": value}}
+            return {"key": key, "value": {"stringValue": str(value)}}
+
+        otlp_spans = [{
+            "traceId": self.trace_id,
+            "spanId": s["span_id"],
+            "parentSpanId": s["parent_id"],
+            "name": s["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(s["start_ns"]),
+            "endTimeUnixNano": str(s["end_ns"]),
+            "attributes": [attribute(k, v) for k, v in s["attributes"].items()]
+                          + ([attribute("category", s["category"])] if s["category"] else []),
+        } for s in spans]
+        return {"resourceSpans": [{
+            "resource": {"attributes": [attribute("service.name", service_name)]},
+            "scopeSpans": [{"scope": {"name": "utils.tracing"}, "spans": otlp_spans}],
+        }]}
+
+    def export(self, directory: str, name: str, fmt: str = "chrome") -> Optional[str]:
+        """directory에 추적 파일을 저장하고 경로를 반환합니다 (fmt: chrome | otlp)."""
+        if not self.spans:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        if fmt == "otlp":
+            path = os.path.join(directory, f"{name}.otlp.json")
+            data = self.to_otlp()
+        else:
+            path = os.path.join(directory, f"{name}.trace.json")
+            data = self.to_chrome()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        print(f"🧵 추적 파일이 저장되었습니다: {path} ({len(self.spans)}개 구간)")
+        return path
+
+
+# 프로세스 전역 추적기 (DebateManager가 trace_dir을 받으면 활성화)
+tracer = Tracer()
+
+
+def span(name: str, category: str = "", **attributes):
+    return tracer.span(name, category, **attributes)
+
+
+def traced(name: Optional[str] = None, category: str = ""):
+    """함수/메서드 전체를 구간으로 기록하는 데코레이터 (기본 이름: 클래스.메서드)"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            span_name = name
+            if span_name is None:
+                # 상속된 메서드도 실제 인스턴스 클래스 이름으로 표시
+                owner = type(args[0]).__name__ if args and hasattr(args[0], func.__name__) else ""
+                span_name = f"{owner}.{func.__name__}" if owner else func.__qualname__
+            with tracer.span(span_name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator